@@ -0,0 +1,126 @@
+"""
+Adaptive question selection.
+
+Every bank is split once into (difficulty, topic) buckets of question ids
+(BucketIndex, cached on the bank snapshot). An adaptive session asks the
+learning engine for a target difficulty and topics after each answer and
+draws its next question from the closest matching bucket, skipping the
+questions it has already served. A draw is a few random probes into one
+bucket, so adaptivity costs no database round trip and does not grow with
+the size of the bank.
+
+Stored questions have a difficulty (questions.difficulty) but no topic;
+generated questions (nursing_generator.py) have both.
+"""
+
+import os
+import random
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Collection, Dict, Iterable, List, Optional, Sequence, Tuple
+
+ADAPTIVE_SESSION_SIZE = int(os.environ.get("ADAPTIVE_SESSION_SIZE", "20"))
+# questions.difficulty is nullable; the model's default is 1
+DEFAULT_DIFFICULTY = 1
+# Random draws before a bucket is scanned for a question the session has not seen
+_PROBES = 8
+
+
+class IdBucket:
+    """A bucket of explicit question ids."""
+
+    def __init__(self, ids: Sequence[int]):
+        self.ids = ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def draw(self, seen: Collection[int], rng=random) -> Optional[int]:
+        n = len(self.ids)
+        if not n:
+            return None
+        for _ in range(_PROBES):
+            qid = self.ids[rng.randrange(n)]
+            if qid not in seen:
+                return qid
+        # Mostly seen: walk the bucket once from a random start
+        start = rng.randrange(n)
+        for i in range(n):
+            qid = self.ids[(start + i) % n]
+            if qid not in seen:
+                return qid
+        return None
+
+
+class RangeBucket:
+    """A bucket of id ranges [base, base + size), e.g. every variant of a template.
+
+    Ranges are drawn with the given weights (O(log ranges) by bisection) and
+    a uniform offset inside the range. The ranges are far larger than any
+    session, so random probing alone finds an unseen id.
+    """
+
+    def __init__(self, ranges: Iterable[Tuple[int, int]], weights: Optional[Iterable[float]] = None):
+        self.ranges = [(base, size) for base, size in ranges if size > 0]
+        weights = list(weights) if weights is not None else [size for _, size in self.ranges]
+        self._cumulative = list(accumulate(weights))
+
+    def __len__(self) -> int:
+        return sum(size for _, size in self.ranges)
+
+    def draw(self, seen: Collection[int], rng=random) -> Optional[int]:
+        if not self.ranges:
+            return None
+        for _ in range(_PROBES):
+            base, size = self.ranges[bisect_right(self._cumulative, rng.random() * self._cumulative[-1])]
+            qid = base + rng.randrange(size)
+            if qid not in seen:
+                return qid
+        return None
+
+
+class BucketIndex:
+    """(difficulty, topic) -> bucket for one bank."""
+
+    def __init__(self, buckets: Dict[Tuple[int, Optional[str]], object]):
+        self.buckets = {key: bucket for key, bucket in buckets.items() if len(bucket)}
+        self._by_level: Dict[int, List[Tuple[Optional[str], object]]] = {}
+        for (level, topic), bucket in sorted(self.buckets.items(), key=lambda kv: (kv[0][0], kv[0][1] or "")):
+            self._by_level.setdefault(level, []).append((topic, bucket))
+        self.topics = frozenset(topic for _, topic in self.buckets if topic is not None)
+
+    @classmethod
+    def from_questions(cls, questions: Iterable[Dict]) -> "BucketIndex":
+        grouped: Dict[Tuple[int, Optional[str]], List[int]] = {}
+        for q in questions:
+            key = (q.get("difficulty") or DEFAULT_DIFFICULTY, q.get("topic"))
+            grouped.setdefault(key, []).append(q["id"])
+        return cls({key: IdBucket(tuple(ids)) for key, ids in grouped.items()})
+
+    def levels(self) -> List[int]:
+        return sorted(self._by_level)
+
+    def _draw_level(self, level: int, topics, seen, rng) -> Optional[int]:
+        candidates = [b for topic, b in self._by_level[level] if topics is None or topic in topics]
+        # Pick a bucket in proportion to its size; drop it if it has nothing left
+        while candidates:
+            sizes = [len(b) for b in candidates]
+            i = bisect_right(list(accumulate(sizes)), rng.random() * sum(sizes))
+            qid = candidates[i].draw(seen, rng)
+            if qid is not None:
+                return qid
+            del candidates[i]
+        return None
+
+    def pick(self, difficulty: Optional[int], topics: Iterable[str] = (), seen: Collection[int] = (),
+             rng=random) -> Optional[int]:
+        """An unseen id as close to `difficulty` as possible, preferring `topics`; None when all are seen."""
+        target = difficulty or DEFAULT_DIFFICULTY
+        levels = sorted(self._by_level, key=lambda level: (abs(level - target), level))
+        wanted = self.topics.intersection(topics)
+        for topic_filter in ((wanted, None) if wanted else (None,)):
+            for level in levels:
+                qid = self._draw_level(level, topic_filter, seen, rng)
+                if qid is not None:
+                    return qid
+        return None
@@ -247,10 +247,10 @@ def add_pspo1_questions():
         for question_data in all_questions:
             # Insert question
             cursor.execute("""
-                INSERT INTO questions (text, explanation, difficulty) 
-                VALUES (%s, %s, 'medium') 
+                INSERT INTO questions (text, explanation, category, difficulty) 
+                VALUES (%s, %s, %s, 'medium') 
                 RETURNING id
-            """, (question_data["text"], question_data["explanation"]))
+            """, (question_data["text"], question_data["explanation"], question_data["explanation"]))
             
             question_id = cursor.fetchone()[0]
             
@@ -45,9 +45,9 @@ def add_nursing_questions():
         for i, q in enumerate(questions):
             # Voeg vraag toe aan questions tabel
             cursor.execute("""
-                INSERT INTO questions (text, explanation, difficulty) 
-                VALUES (%s, %s, %s) RETURNING id
-            """, (q['text'], q['explanation'], q['difficulty']))
+                INSERT INTO questions (text, explanation, category, difficulty) 
+                VALUES (%s, %s, %s, %s) RETURNING id
+            """, (q['text'], q['explanation'], q['explanation'], q['difficulty']))
             
             question_id = cursor.fetchone()['id']
             
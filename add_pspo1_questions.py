@@ -148,9 +148,9 @@ def add_pspo1_questions_to_db():
         try:
             # Insert question with category/explanation marking it as PSPO1
             cursor.execute("""
-                INSERT INTO questions (text, explanation, difficulty) 
-                VALUES (%s, %s, %s) RETURNING id
-            """, (q["question"], "PSPO1", 2))  # Use explanation field for category
+                INSERT INTO questions (text, explanation, category, difficulty) 
+                VALUES (%s, %s, %s, %s) RETURNING id
+            """, (q["question"], "PSPO1", "PSPO1", 2))
             
             question_id = cursor.fetchone()[0]
             
@@ -158,9 +158,9 @@ def add_questions_to_database(questions):
         try:
             # Insert question into questions table
             cursor.execute("""
-                INSERT INTO questions (text, difficulty) 
-                VALUES (%s, %s) RETURNING id
-            """, (q["question"], 1))
+                INSERT INTO questions (text, category, difficulty) 
+                VALUES (%s, %s, %s) RETURNING id
+            """, (q["question"], "general", 1))
             
             question_id = cursor.fetchone()[0]
             
@@ -0,0 +1,157 @@
+"""
+Write-behind log of graded answers.
+
+Every answer becomes a row in the ``answers`` table (session, user,
+question, choice, correct, latency, timestamp). The answer endpoints only
+append the event to an in-process queue; a background thread writes the
+queue in batches, each as one multi-row INSERT in one transaction, as soon
+as ANSWER_LOG_BATCH events are waiting or every ANSWER_LOG_INTERVAL
+seconds, whichever comes first. Answering never waits for a commit.
+
+Listeners (e.g. review_scheduler.apply_answers) are called with each
+batch inside the same transaction, so derived tables commit or roll back
+together with the answers.
+
+Events still queued when the process dies are lost; the queue is flushed
+on shutdown. If the database is unreachable, batches are retried and the
+queue is capped at ANSWER_LOG_MAX_PENDING events (oldest dropped first).
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from models import Answer
+
+ANSWER_LOG_BATCH = int(os.environ.get("ANSWER_LOG_BATCH", "500"))
+ANSWER_LOG_INTERVAL = float(os.environ.get("ANSWER_LOG_INTERVAL", "1"))
+ANSWER_LOG_MAX_PENDING = int(os.environ.get("ANSWER_LOG_MAX_PENDING", "100000"))
+# Client-reported latencies above this are clamped (an abandoned tab is not "slow")
+MAX_LATENCY_MS = 3_600_000
+
+answers = Answer.__table__
+
+
+def latency_from(payload: Dict) -> Optional[int]:
+    """Milliseconds the user took, as reported by the client in `latency_ms`, or None."""
+    try:
+        latency = int(payload.get("latency_ms"))
+    except (TypeError, ValueError):
+        return None
+    return min(max(latency, 0), MAX_LATENCY_MS)
+
+
+class AnswerLog:
+    """Queue of answer events, flushed to the answers table by a background thread."""
+
+    def __init__(self, engine, batch_size: int = ANSWER_LOG_BATCH, interval: float = ANSWER_LOG_INTERVAL,
+                 max_pending: int = ANSWER_LOG_MAX_PENDING):
+        self.engine = engine
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        # deque.append / popleft are atomic, so record() never takes a lock
+        self._queue: deque = deque(maxlen=max_pending)
+        self._wake = threading.Event()
+        self._stopping = False
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        # (conn, rows) callbacks run in each batch's transaction
+        self.listeners: List[Callable] = []
+        self.recorded = 0
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+
+    def record(self, session_id: str, question_id: int, category: str, choice: int, correct: bool,
+               user_id: Optional[str] = None, latency_ms: Optional[int] = None,
+               answered_at: Optional[datetime] = None) -> None:
+        """Queue one answer; returns immediately."""
+        self._queue.append({
+            "session_id": session_id, "user_id": user_id, "question_id": question_id,
+            "category": category, "choice": choice, "correct": correct, "latency_ms": latency_ms,
+            "answered_at": answered_at or datetime.now(timezone.utc),
+        })
+        self.recorded += 1
+        if len(self._queue) >= self.batch_size:
+            self._wake.set()
+
+    def _take(self) -> List[Dict]:
+        rows = []
+        try:
+            while len(rows) < self.batch_size:
+                rows.append(self._queue.popleft())
+        except IndexError:
+            pass
+        return rows
+
+    def flush(self) -> int:
+        """Write every queued event now; returns how many rows were inserted."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                rows = self._take()
+                if not rows:
+                    return written
+                try:
+                    with self.engine.begin() as conn:
+                        # executemany: one multi-row INSERT per batch on Postgres
+                        # (insertmanyvalues), one prepared statement on SQLite;
+                        # unlike insert().values(rows) nothing is recompiled per batch
+                        conn.execute(answers.insert(), rows)
+                        for listener in self.listeners:
+                            listener(conn, rows)
+                except Exception:
+                    self.failures += 1
+                    # Put the batch back in front, in order, for the next attempt.
+                    # A full deque would drop from the other end (the newest
+                    # events), so only the newest rows that still fit go back.
+                    room = self._queue.maxlen - len(self._queue)
+                    self._queue.extendleft(reversed(rows[max(0, len(rows) - room):]))
+                    raise
+                written += len(rows)
+                self.written += len(rows)
+                self.batches += 1
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️  Could not write answer log ({len(self._queue)} pending): {e}")
+                time.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="answer-log", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer thread and write what is still queued."""
+        if self._thread is not None:
+            self._stopping = True
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"⚠️  Lost {len(self._queue)} queued answers on shutdown: {e}")
+
+    def stats(self) -> Dict:
+        """Gauges for /api/admin/stats."""
+        return {
+            "pending": len(self._queue),
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": max(0, self.recorded - self.written - len(self._queue)),
+            "batches": self.batches,
+            "failures": self.failures,
+            "batch_size": self.batch_size,
+            "interval_seconds": self.interval,
+        }
@@ -0,0 +1,345 @@
+"""
+In-process question bank cache.
+
+Keeps an immutable, per-category snapshot of the question bank so starting a
+quiz no longer pulls every question and its choices through the database.
+Sessions shuffle the snapshot in Python; admin writes invalidate it.
+
+Admin writes also bump the category's row in ``bank_generations`` inside
+their transaction. Every process polls that table every BANK_SYNC_INTERVAL
+seconds (BankCache.start_sync) and drops the snapshots whose generation
+moved, so replicas that did not handle the write serve (and version) the
+new bank within one interval.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
+
+from db import SessionLocal, async_session
+from adaptive import BucketIndex
+from json_response import RawJSON, dumps
+from models import CATEGORIES, GENERAL, BankGeneration, Question
+
+BANK_SYNC_INTERVAL = float(os.environ.get("BANK_SYNC_INTERVAL", "1"))
+bank_generations = BankGeneration.__table__
+
+# Sentinel for "every category" in BankCache.invalidate()
+ALL_CATEGORIES = object()
+
+
+def category_key(category: Optional[str]) -> Optional[str]:
+    """Map a requested category onto the bank that serves it (None = general quiz)."""
+    return category if category in CATEGORIES else None
+
+
+def _questions_query(category: Optional[str]):
+    # Index scans on ix_questions_category_difficulty / ix_choices_question_id
+    return (
+        select(Question)
+        .options(selectinload(Question.choices))
+        .where(Question.category == (category_key(category) or GENERAL))
+        .order_by(Question.id)
+    )
+
+
+def _to_dict(q: Question) -> Dict:
+    correct_indices = tuple(i for i, c in enumerate(q.choices) if c.is_correct)
+    return {
+        "id": q.id,
+        "text": q.text,
+        "choices": tuple(c.text for c in q.choices),
+        # For backward compatibility, use first correct answer as "answer"
+        "answer": correct_indices[0] if correct_indices else None,
+        "correct_answers": correct_indices,
+        "difficulty": q.difficulty,
+    }
+
+
+def fetch_questions(category: Optional[str] = None) -> List[Dict]:
+    """Load one category of the bank from the database in a stable order."""
+    db = SessionLocal()
+    try:
+        return [_to_dict(q) for q in db.execute(_questions_query(category)).scalars()]
+    finally:
+        db.close()
+
+
+def bump_generation(category: Optional[str]):
+    """Statement marking one category as changed for every replica; run it in the write's transaction."""
+    c = bank_generations.c
+    return (update(bank_generations)
+            .where(c.category == (category_key(category) or GENERAL))
+            .values(generation=c.generation + 1))
+
+
+async def fetch_questions_async(category: Optional[str] = None) -> List[Dict]:
+    """fetch_questions() over the async engine (or a worker thread without one)."""
+    db = async_session()
+    try:
+        result = await db.execute(_questions_query(category))
+        return [_to_dict(q) for q in result.scalars()]
+    finally:
+        await db.close()
+
+
+def _json_questions() -> List[Dict]:
+    from quiz_app import load_questions as _json_loader
+    out = []
+    for i, q in enumerate(_json_loader(), 1):
+        answer = q.get("answer")
+        out.append({
+            "id": i,
+            "text": q.get("text") or q.get("question"),
+            "choices": tuple(q.get("choices", [])),
+            "answer": answer,
+            "correct_answers": (answer,) if answer is not None else (),
+            "difficulty": q.get("difficulty"),
+        })
+    return out
+
+
+def load_category(category: Optional[str] = None) -> List[Dict]:
+    """Loader for BANK_CACHE: DB rows, or the bundled JSON questions if the category is empty."""
+    return fetch_questions(category) or _json_questions()
+
+
+async def load_category_async(category: Optional[str] = None) -> List[Dict]:
+    """Async loader for BANK_CACHE.aget()."""
+    return await fetch_questions_async(category) or _json_questions()
+
+
+def question_payload(q: Dict) -> Dict:
+    """Everything the client may see; the legacy "answer" key stays server-side."""
+    return {"id": q["id"], "text": q["text"], "choices": list(q["choices"]), "correct_answers": list(q["correct_answers"])}
+
+
+def preview_payload(q: Dict) -> Dict:
+    """A question handed out ahead of time: no answers."""
+    return {"id": q["id"], "text": q["text"], "choices": list(q["choices"])}
+
+
+@dataclass(frozen=True)
+class QuestionBank:
+    """Read-only snapshot of one category. Never mutate the question dicts."""
+    category: Optional[str]
+    questions: Tuple[Dict, ...]
+    by_id: Mapping[int, Dict]
+    ids: array  # array('I') of question ids, in bank order
+    # CRC32 of the id list: identical on every replica reading the same rows,
+    # and changes whenever a question is added or removed.
+    version: int
+    # Encoded payloads, filled on first use; they live and die with the snapshot
+    _payloads: Dict[int, RawJSON] = field(default_factory=dict, repr=False, compare=False)
+    _previews: Dict[int, bytes] = field(default_factory=dict, repr=False, compare=False)
+    _buckets: List[BucketIndex] = field(default_factory=list, repr=False, compare=False)
+
+    @classmethod
+    def build(cls, category: Optional[str], questions: List[Dict]) -> "QuestionBank":
+        questions = tuple(q for q in questions if q.get("id") is not None)
+        by_id = MappingProxyType({q["id"]: q for q in questions})
+        ids = array("I", (q["id"] for q in questions))
+        version = zlib.crc32(ids.tobytes())
+        return cls(category=category, questions=questions, by_id=by_id, ids=ids, version=version)
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def payload_json(self, qid: int) -> RawJSON:
+        """question_payload() of one question as JSON bytes, encoded once per snapshot."""
+        raw = self._payloads.get(qid)
+        if raw is None:
+            raw = self._payloads[qid] = RawJSON(dumps(question_payload(self.by_id[qid])))
+        return raw
+
+    def preview_json(self, qid: int, index: int) -> RawJSON:
+        """preview_payload() plus the session position, reusing the cached encoding."""
+        raw = self._previews.get(qid)
+        if raw is None:
+            raw = self._previews[qid] = dumps(preview_payload(self.by_id[qid]))
+        return RawJSON(b'{"index":%d,' % index + raw[1:])
+
+    def buckets(self) -> BucketIndex:
+        """(difficulty, topic) buckets for adaptive sessions, built on first use."""
+        if not self._buckets:
+            self._buckets.append(BucketIndex.from_questions(self.questions))
+        return self._buckets[0]
+
+    def sample(self, count: int, rng=random) -> array:
+        """Pick `count` distinct ids in random order.
+
+        random.sample over a range draws k positions with a set of seen
+        indices, so this is O(count) regardless of bank size: no shuffle or
+        sort of the whole id array.
+        """
+        count = min(count, len(self.ids))
+        return array("I", (self.ids[i] for i in rng.sample(range(len(self.ids)), count)))
+
+
+class BankCache:
+    """Per-category QuestionBank snapshots with hit/miss/rebuild counters."""
+
+    def __init__(self, loader: Callable[[Optional[str]], List[Dict]] = load_category,
+                 async_loader: Optional[Callable[[Optional[str]], Awaitable[List[Dict]]]] = None):
+        self._loader = loader
+        self._async_loader = async_loader
+        self._lock = threading.Lock()
+        self._build_locks: Dict[Optional[str], threading.Lock] = {}
+        self._async_build_locks: Dict[Optional[str], asyncio.Lock] = {}
+        self._banks: Dict[Optional[str], QuestionBank] = {}
+        # Bumped on every invalidation so a build that raced with an admin
+        # write never installs the stale snapshot it read.
+        self._generations: Dict[Optional[str], int] = {}
+        self._epoch = 0
+        # category -> generation last seen in bank_generations (see sync())
+        self._shared: Dict[str, int] = {}
+        self._sync_stop = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+        self.invalidations = 0
+        self.remote_invalidations = 0
+        self.rebuild_seconds_total = 0.0
+        self.last_rebuild_seconds = 0.0
+
+    def _cached(self, key) -> Optional[QuestionBank]:
+        with self._lock:
+            bank = self._banks.get(key)
+            if bank is not None:
+                self.hits += 1
+            return bank
+
+    def _start_build(self, key):
+        """Return (cached bank, None) or (None, generation) for a build about to start."""
+        with self._lock:
+            bank = self._banks.get(key)
+            if bank is not None:
+                self.hits += 1
+                return bank, None
+            self.misses += 1
+            return None, (self._epoch, self._generations.get(key, 0))
+
+    def _finish_build(self, key, questions, generation, started) -> QuestionBank:
+        bank = QuestionBank.build(key, questions)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.rebuilds += 1
+            self.rebuild_seconds_total += elapsed
+            self.last_rebuild_seconds = elapsed
+            if (self._epoch, self._generations.get(key, 0)) == generation:
+                self._banks[key] = bank
+        return bank
+
+    def get(self, category: Optional[str] = None) -> QuestionBank:
+        key = category_key(category)
+        bank = self._cached(key)
+        if bank is not None:
+            return bank
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        # One builder per category; concurrent starts wait for its snapshot
+        with build_lock:
+            bank, generation = self._start_build(key)
+            if bank is not None:
+                return bank
+            started = time.perf_counter()
+            return self._finish_build(key, self._loader(key), generation, started)
+
+    async def aget(self, category: Optional[str] = None) -> QuestionBank:
+        """get() for the event loop: a miss awaits the async loader instead of blocking."""
+        if self._async_loader is None:
+            return self.get(category)
+        key = category_key(category)
+        bank = self._cached(key)
+        if bank is not None:
+            return bank
+        async with self._async_build_locks.setdefault(key, asyncio.Lock()):
+            bank, generation = self._start_build(key)
+            if bank is not None:
+                return bank
+            started = time.perf_counter()
+            return self._finish_build(key, await self._async_loader(key), generation, started)
+
+    def invalidate(self, category=ALL_CATEGORIES) -> None:
+        """Drop the snapshot of one category (or all); the next get() rebuilds it."""
+        with self._lock:
+            if category is ALL_CATEGORIES:
+                self._epoch += 1
+                self._banks.clear()
+            else:
+                key = category_key(category)
+                self._generations[key] = self._generations.get(key, 0) + 1
+                self._banks.pop(key, None)
+            self.invalidations += 1
+
+    def sync(self, engine) -> List[str]:
+        """Invalidate every category whose shared generation moved since the last sync; returns them.
+
+        Categories not seen before count as moved, so call this once before
+        the first get() and nothing loaded earlier can be stale.
+        """
+        c = bank_generations.c
+        with engine.connect() as conn:
+            generations = dict(conn.execute(select(c.category, c.generation)).all())
+        changed = [category for category, generation in generations.items() if self._shared.get(category) != generation]
+        for category in changed:
+            self.invalidate(category)
+        self._shared = generations
+        with self._lock:
+            self.remote_invalidations += len(changed)
+        return changed
+
+    def _sync_forever(self, engine, interval: float):
+        while not self._sync_stop.wait(interval):
+            try:
+                self.sync(engine)
+            except Exception as e:
+                print(f"⚠️  Could not check bank generations: {e}")
+
+    def start_sync(self, engine, interval: float = BANK_SYNC_INTERVAL) -> None:
+        """Poll bank_generations in a background thread (no-op with interval <= 0)."""
+        if self._sync_thread is None and interval > 0:
+            self._sync_stop.clear()
+            self._sync_thread = threading.Thread(target=self._sync_forever, args=(engine, interval),
+                                                 name="bank-sync", daemon=True)
+            self._sync_thread.start()
+
+    def stop_sync(self) -> None:
+        if self._sync_thread is not None:
+            self._sync_stop.set()
+            self._sync_thread.join()
+            self._sync_thread = None
+
+    def rebuild(self, category: Optional[str] = None) -> QuestionBank:
+        """Invalidate and eagerly rebuild one category."""
+        self.invalidate(category)
+        return self.get(category)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "rebuilds": self.rebuilds,
+                "invalidations": self.invalidations,
+                "remote_invalidations": self.remote_invalidations,
+                "rebuild_seconds_total": round(self.rebuild_seconds_total, 6),
+                "last_rebuild_seconds": round(self.last_rebuild_seconds, 6),
+                "cached": {key or "general": len(bank) for key, bank in self._banks.items()},
+            }
+
+
+# Global instance
+BANK_CACHE = BankCache(load_category, load_category_async)
@@ -1,9 +1,14 @@
 """Database initialization and session management for Quiz App."""
 import os
+from functools import partial
+
+import anyio
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./quiz.db")
+# auto: use the async engine when its driver is installed; 1: require it; 0: never
+DB_ASYNC = os.getenv("DB_ASYNC", "auto").lower()
 
 engine = create_engine(
     DATABASE_URL,
@@ -23,3 +28,96 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver (asyncpg / aiosqlite)."""
+    scheme, sep, rest = url.partition("://")
+    backend = scheme.split("+", 1)[0]
+    if backend in ("postgres", "postgresql"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    if backend == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return url
+
+
+def _create_async_engine():
+    if DB_ASYNC in ("0", "false", "no"):
+        return None, None
+    try:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        async_engine = create_async_engine(
+            os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL),
+            echo=bool(os.getenv("SQL_ECHO")),
+        )
+    except ImportError as e:
+        if DB_ASYNC in ("1", "true", "yes"):
+            raise
+        print(f"⚠️  Async database driver unavailable ({e}); DB calls run in the threadpool")
+        return None, None
+    return async_engine, async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async_engine, AsyncSessionLocal = _create_async_engine()
+
+
+class ThreadedSession:
+    """AsyncSession look-alike over a sync Session, for when no async driver is installed.
+
+    Each call runs in a worker thread and results are buffered there, so
+    handlers can be written once against the AsyncSession API.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    async def _run(self, fn, *args, **kwargs):
+        return await anyio.to_thread.run_sync(partial(fn, *args, **kwargs))
+
+    def add(self, obj):
+        self.sync_session.add(obj)
+
+    def expunge_all(self):
+        self.sync_session.expunge_all()
+
+    async def execute(self, statement, params=None):
+        def run():
+            result = self.sync_session.execute(statement, params)
+            # Buffer rows in the worker thread; DML without RETURNING has none
+            return result.freeze() if getattr(result, "returns_rows", True) else result
+        result = await self._run(run)
+        return result() if callable(result) else result
+
+    async def get(self, entity, ident, **kwargs):
+        return await self._run(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, obj):
+        await self._run(self.sync_session.delete, obj)
+
+    async def flush(self):
+        await self._run(self.sync_session.flush)
+
+    async def commit(self):
+        await self._run(self.sync_session.commit)
+
+    async def rollback(self):
+        await self._run(self.sync_session.rollback)
+
+    async def close(self):
+        await self._run(self.sync_session.close)
+
+
+def async_session():
+    """New AsyncSession, or a ThreadedSession when the async engine is disabled."""
+    if AsyncSessionLocal is not None:
+        return AsyncSessionLocal()
+    return ThreadedSession(SessionLocal(expire_on_commit=False))
+
+
+async def get_async_db():
+    """FastAPI dependency: per-request session whose I/O does not hold a threadpool slot."""
+    db = async_session()
+    try:
+        yield db
+    finally:
+        await db.close()
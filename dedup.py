@@ -0,0 +1,421 @@
+"""
+Near-duplicate question detection with MinHash and locality-sensitive hashing.
+
+A question is normalized (lowercase, accents and leading question numbers
+stripped, choices sorted so their order does not matter) and cut into
+word 3-grams. Each question gets a MinHash signature whose positions agree
+with probability equal to the Jaccard similarity of the shingle sets.
+Signatures are split into bands; questions sharing any band land in the
+same bucket and become candidates, and only candidates are compared.
+Bucketing is a sort per band, so checking N questions is O(N log N)
+instead of comparing all N² pairs.
+
+Used by the bulk import (?dedup=true skips rows that nearly duplicate the
+bank or an earlier row) and as a CLI over the extracted JSON files and
+the database:
+
+    python dedup.py pspo1_complete_v2.json pspo1_questions.json
+    python dedup.py --db --threshold 0.7
+    python dedup.py --db --json > clusters.ndjson
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import unicodedata
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+NUM_PERM = 128
+SHINGLE = 3
+DEDUP_THRESHOLD = float(os.environ.get("DEDUP_THRESHOLD", "0.8"))
+# Buckets larger than this are joined as a star around their first member
+# rather than all pairs, so one very common band cannot go quadratic
+_MAX_BUCKET_PAIRS = 64
+# Tokens with a dense id; enough for any real question bank's vocabulary
+_MAX_VOCAB = 200_000
+# DuplicateIndex.add buffers rows in per-band dicts and merges them into the
+# sorted arrays once there are this many, or 1/8 of the index
+_MERGE_MIN = 1024
+
+_WORD = re.compile(r"\w+")
+_NUMBERING = re.compile(r"^\s*(?:vraag\s*|question\s*|no\.?\s*)?\d+\s*[.):-]?\s+", re.IGNORECASE)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+Item = Tuple[str, Sequence[str]]  # (question text, choice texts)
+
+
+def normalize(text: str) -> str:
+    text = text.lower()
+    if not text.isascii():
+        text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return text
+
+
+def document(text: str, choices: Sequence[str] = ()) -> List[str]:
+    """Token stream of one question; numbering and choice order are irrelevant."""
+    body = _NUMBERING.sub("", text or "") + " " + " ".join(sorted(str(c).strip().lower() for c in choices or ()))
+    return _WORD.findall(normalize(body))
+
+
+class _Vocabulary(dict):
+    """Token -> small int id, assigned on first sight (0 is the padding token).
+
+    Holds at most `limit` tokens; later new tokens get a CRC32-based id above
+    2**32 instead, so the vocabulary stays bounded however many questions
+    pass through a long-running process.
+    """
+
+    def __init__(self, limit: int = _MAX_VOCAB):
+        super().__init__()
+        self.limit = limit
+
+    def __missing__(self, word):
+        if len(self) >= self.limit:
+            return zlib.crc32(word.encode("utf-8")) | (1 << 32)
+        value = self[word] = len(self) + 1
+        return value
+
+
+def optimal_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """(bands, rows per band) with the highest S-curve midpoint (1/b)^(1/r) not above `threshold`.
+
+    Staying at or below the threshold favours recall: pairs just above it
+    are almost always bucketed together, and the extra candidates are
+    cheap to reject on their signature similarity.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows == 0 and (1 / (num_perm // rows)) ** (1 / rows) <= threshold:
+            best = (num_perm // rows, rows)
+    return best
+
+
+class MinHasher:
+    """MinHash signatures (uint32, one row per question) from multiply-shift hash permutations."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        self._vocab = _Vocabulary()
+        self._lock = threading.Lock()
+
+    def signatures(self, items: Sequence[Item]) -> np.ndarray:
+        """Signatures for many questions, hashed in one vectorized pass."""
+        n = len(items)
+        sig = np.full((n, self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        if n == 0:
+            return sig
+        # Token ids of all questions back to back, each padded to at least one full shingle
+        ids, starts = [], []
+        lookup = self._vocab.__getitem__
+        with self._lock:
+            for text, choices in items:
+                words = list(map(lookup, document(text, choices)))
+                words += [0] * (SHINGLE - len(words))
+                starts.append(len(ids))
+                ids.extend(words)
+        ids = np.asarray(ids, dtype=np.uint64)
+        starts = np.asarray(starts, dtype=np.int64)
+        # Shingle i hashes tokens i..i+SHINGLE-1; drop those crossing into the next question
+        span = len(ids) - SHINGLE + 1
+        with np.errstate(over="ignore"):
+            shingles = ids[:span].copy()
+            for k in range(1, SHINGLE):
+                shingles = shingles * _MIX + ids[k:k + span]
+            lengths = np.diff(np.append(starts, len(ids)))
+            owner = np.repeat(np.arange(n), lengths)[:span]
+            keep = np.arange(span) + SHINGLE - 1 < np.repeat(starts + lengths, lengths)[:span]
+            shingles, owner = shingles[keep], owner[keep]
+            first = np.searchsorted(owner, np.arange(n))
+            hashed = np.empty_like(shingles)
+            for p in range(self.num_perm):
+                np.multiply(shingles, self._a[p], out=hashed)
+                np.add(hashed, self._b[p], out=hashed)
+                np.right_shift(hashed, np.uint64(32), out=hashed)
+                sig[:, p] = np.minimum.reduceat(hashed, first)
+        return sig
+
+
+def _band_keys(sig: np.ndarray, bands: int, rows: int) -> np.ndarray:
+    """One uint64 bucket key per (question, band): shape (n, bands)."""
+    keys = np.zeros((sig.shape[0], bands), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for r in range(rows):
+            keys = keys * _MIX + sig[:, r::rows][:, :bands].astype(np.uint64)
+    return keys
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity of paired signatures."""
+    return (a == b).mean(axis=-1)
+
+
+def candidate_pairs(keys: np.ndarray) -> np.ndarray:
+    """Unique (i, j) with i < j sharing a bucket in any band."""
+    pairs = []
+    n = keys.shape[0]
+    for band in keys.T:
+        order = np.argsort(band, kind="stable")
+        ordered = band[order]
+        starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1])))
+        sizes = np.diff(np.append(starts, n))
+        for start, size in zip(starts[sizes > 1].tolist(), sizes[sizes > 1].tolist()):
+            group = order[start:start + size]
+            if len(group) > _MAX_BUCKET_PAIRS:
+                pairs.append(np.stack([np.full(len(group) - 1, group[0]), group[1:]], axis=1))
+            else:
+                i, j = np.triu_indices(len(group), k=1)
+                pairs.append(np.stack([group[i], group[j]], axis=1))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(pairs), axis=1).astype(np.int64)
+    codes = np.unique(pairs[:, 0] * n + pairs[:, 1])
+    return np.stack([codes // n, codes % n], axis=1)
+
+
+def find_clusters(sig: np.ndarray, threshold: float = DEDUP_THRESHOLD) -> List[List[int]]:
+    """Groups (row indexes, in order) of questions that are near-duplicates of each other."""
+    bands, rows = optimal_bands(sig.shape[1], threshold)
+    pairs = candidate_pairs(_band_keys(sig, bands, rows))
+    pairs = pairs[similarity(sig[pairs[:, 0]], sig[pairs[:, 1]]) >= threshold]
+    parent = list(range(sig.shape[0]))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in pairs.tolist():
+        ri, rj = root(i), root(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+    groups: Dict[int, List[int]] = {}
+    for i in range(sig.shape[0]):
+        groups.setdefault(root(i), []).append(i)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+class DuplicateIndex:
+    """Signatures of a bank with per-band sorted bucket keys, for checking new questions against it.
+
+    Added rows first go into a per-band dict (bucket key -> rows), so adding
+    one question is O(bands); the buffer is merged into the sorted arrays
+    once it holds max(_MERGE_MIN, len / 8) rows, an O(len) step that keeps
+    the amortized cost of an add constant. Storage grows by doubling.
+    """
+
+    def __init__(self, hasher: MinHasher, threshold: float = DEDUP_THRESHOLD):
+        self.hasher = hasher
+        self.threshold = threshold
+        self.bands, self.rows = optimal_bands(hasher.num_perm, threshold)
+        self._size = 0
+        self._ids = np.empty(0, dtype=np.int64)
+        self._sig = np.empty((0, hasher.num_perm), dtype=np.uint32)
+        self._keys = np.empty((0, self.bands), dtype=np.uint64)
+        # Rows [0, _merged) are in the sorted arrays, the rest in _delta
+        self._merged = 0
+        self._sorted: List[Tuple[np.ndarray, np.ndarray]] = [
+            (np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)) for _ in range(self.bands)]
+        self._delta: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[:self._size]
+
+    @property
+    def sig(self) -> np.ndarray:
+        return self._sig[:self._size]
+
+    def _reserve(self, n: int) -> None:
+        if n <= len(self._ids):
+            return
+        capacity = max(n, 2 * len(self._ids), 64)
+        for name in ("_ids", "_sig", "_keys"):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def add(self, ids: Sequence[int], sig: np.ndarray) -> None:
+        start, end = self._size, self._size + len(ids)
+        self._reserve(end)
+        self._ids[start:end] = np.asarray(ids, dtype=np.int64)
+        self._sig[start:end] = sig
+        keys = self._keys[start:end] = _band_keys(sig, self.bands, self.rows)
+        self._size = end
+        if end - self._merged >= max(_MERGE_MIN, self._merged // 8):
+            self._merge()
+            return
+        for row, row_keys in enumerate(keys.tolist(), start):
+            for delta, key in zip(self._delta, row_keys):
+                delta.setdefault(key, []).append(row)
+
+    def _merge(self) -> None:
+        """Fold every row added since the last merge into the sorted per-band arrays."""
+        new_rows = np.arange(self._merged, self._size, dtype=np.int64)
+        for b, (ordered, order) in enumerate(self._sorted):
+            band = self._keys[self._merged:self._size, b]
+            new_order = np.argsort(band, kind="stable")
+            new_keys = band[new_order]
+            at = np.searchsorted(ordered, new_keys, side="right")
+            self._sorted[b] = (np.insert(ordered, at, new_keys), np.insert(order, at, new_rows[new_order]))
+            self._delta[b] = {}
+        self._merged = self._size
+
+    def query(self, sig: np.ndarray) -> List[Optional[Tuple[int, float]]]:
+        """For each signature: (id, similarity) of the closest indexed near-duplicate, or None."""
+        found: List[Optional[Tuple[int, float]]] = [None] * sig.shape[0]
+        if not len(self) or not sig.shape[0]:
+            return found
+        keys = _band_keys(sig, self.bands, self.rows)
+        candidates = [set() for _ in range(sig.shape[0])]
+        for b, (ordered, order) in enumerate(self._sorted):
+            lo = np.searchsorted(ordered, keys[:, b], side="left")
+            hi = np.searchsorted(ordered, keys[:, b], side="right")
+            for q in np.flatnonzero(hi > lo):
+                candidates[q].update(order[lo[q]:hi[q]].tolist())
+        if self._merged < self._size:
+            for q, row_keys in enumerate(keys.tolist()):
+                for delta, key in zip(self._delta, row_keys):
+                    candidates[q].update(delta.get(key, ()))
+        for q, rows in enumerate(candidates):
+            if not rows:
+                continue
+            rows = np.fromiter(rows, dtype=np.int64)
+            scores = similarity(self._sig[rows], sig[q])
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                found[q] = (int(self._ids[rows[best]]), float(scores[best]))
+        return found
+
+
+def check_batch(index: DuplicateIndex, items: Sequence[Item],
+                labels: Optional[Sequence[int]] = None) -> Tuple[np.ndarray, List[Optional[str]]]:
+    """Signatures of `items` and, per item, why it is a near-duplicate (None if it is new).
+
+    Items are compared with the index and with the items before them, so
+    only the first of several near-identical rows in one batch is kept;
+    `labels` are the row numbers used in the messages (default: positions).
+    """
+    labels = labels if labels is not None else range(len(items))
+    sig = index.hasher.signatures(items)
+    reasons: List[Optional[str]] = [
+        None if hit is None else f"Near-duplicate of question {hit[0]} ({hit[1]:.0%} similar)"
+        for hit in index.query(sig)
+    ]
+    for cluster in find_clusters(sig, index.threshold):
+        first = next((i for i in cluster if reasons[i] is None), None)
+        for i in cluster:
+            if i != first and reasons[i] is None:
+                reasons[i] = f"Near-duplicate of row {labels[first]}"
+    return sig, reasons
+
+
+class BankDuplicates:
+    """Lazily built DuplicateIndex over the whole question bank in the database."""
+
+    def __init__(self, engine, threshold: float = DEDUP_THRESHOLD):
+        self.engine = engine
+        self.threshold = threshold
+        self.hasher = MinHasher()
+        self._index: Optional[DuplicateIndex] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> DuplicateIndex:
+        with self._lock:
+            if self._index is None:
+                rows = list(load_db(self.engine))
+                index = DuplicateIndex(self.hasher, self.threshold)
+                index.add([r["id"] for r in rows], self.hasher.signatures([(r["text"], r["choices"]) for r in rows]))
+                self._index = index
+            return self._index
+
+    def add(self, ids: Sequence[int], items: Sequence[Item], sig: Optional[np.ndarray] = None) -> None:
+        """Index newly inserted questions (a no-op until the index is first built)."""
+        with self._lock:
+            if self._index is not None:
+                self._index.add(ids, sig if sig is not None else self.hasher.signatures(items))
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._index = None
+
+
+# --- CLI ---
+
+def load_json(path: str) -> List[Dict]:
+    """Questions from an extraction output or import file (text/question, choices/answers)."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("questions", [])
+    rows = []
+    for i, item in enumerate(data):
+        if not isinstance(item, dict):
+            continue
+        choices = item.get("choices") or item.get("answers") or []
+        rows.append({
+            "source": f"{path}#{i}",
+            "text": str(item.get("text") or item.get("question") or ""),
+            "choices": [c.get("text", "") if isinstance(c, dict) else str(c) for c in choices],
+        })
+    return rows
+
+
+def load_db(engine):
+    from question_io import iter_export_rows
+
+    for row in iter_export_rows(engine):
+        yield {"source": f"db:{row['id']}", "id": row["id"], "text": row["text"] or "", "choices": row["choices"]}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Find near-duplicate questions (MinHash/LSH).")
+    parser.add_argument("files", nargs="*", help="question JSON files")
+    parser.add_argument("--db", action="store_true", help="include the questions in DATABASE_URL")
+    parser.add_argument("--threshold", type=float, default=DEDUP_THRESHOLD, help="minimum similarity (0-1)")
+    parser.add_argument("--json", action="store_true", help="print one JSON cluster per line")
+    args = parser.parse_args(argv)
+    if not args.files and not args.db:
+        parser.error("give JSON files and/or --db")
+
+    rows = []
+    for path in args.files:
+        try:
+            rows.extend(load_json(path))
+        except (OSError, ValueError) as e:
+            print(f"Cannot read {path}: {e}")
+            return 2
+    if args.db:
+        from db import engine
+        rows.extend(load_db(engine))
+
+    sig = MinHasher().signatures([(r["text"], r["choices"]) for r in rows])
+    clusters = sorted(find_clusters(sig, args.threshold), key=len, reverse=True)
+    for cluster in clusters:
+        if args.json:
+            print(json.dumps({"size": len(cluster), "questions": [
+                {"source": rows[i]["source"], "text": rows[i]["text"]} for i in cluster]}, ensure_ascii=False))
+            continue
+        print(f"{len(cluster)} near-duplicates:")
+        for i in cluster:
+            print(f"  {rows[i]['source']}: {rows[i]['text'][:90]}")
+    duplicates = sum(len(c) - 1 for c in clusters)
+    print(f"{len(rows)} questions, {len(clusters)} clusters, {duplicates} redundant", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Fast JSON encoding for API responses.
+
+Uses orjson when installed and falls back to the stdlib encoder with
+compact separators. ``RawJSON`` marks bytes that are already encoded JSON
+(such as the cached question payloads in bank_cache): they are spliced
+into the output verbatim instead of being serialized again.
+"""
+
+import json
+import re
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is used instead
+    orjson = None
+
+
+class RawJSON(bytes):
+    """Bytes holding one complete, already-encoded JSON value."""
+
+
+_PLACEHOLDER = "\x00RAWJSON{}\x00"
+_PLACEHOLDER_RE = re.compile(rb'"\\u0000RAWJSON(\d+)\\u0000"')
+
+
+def _splice(encode, obj) -> bytes:
+    fragments = []
+
+    def default(value):
+        if isinstance(value, RawJSON):
+            fragments.append(value)
+            return _PLACEHOLDER.format(len(fragments) - 1)
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    out = encode(obj, default)
+    if fragments:
+        out = _PLACEHOLDER_RE.sub(lambda m: fragments[int(m.group(1))], out)
+    return out
+
+
+if orjson is not None and hasattr(orjson, "Fragment"):
+    def _default(value):
+        if isinstance(value, RawJSON):
+            return orjson.Fragment(bytes(value))
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_default)
+elif orjson is not None:
+    def dumps(obj: Any) -> bytes:
+        return _splice(lambda o, default: orjson.dumps(o, default=default), obj)
+else:
+    def dumps(obj: Any) -> bytes:
+        return _splice(lambda o, default: json.dumps(
+            o, ensure_ascii=False, separators=(",", ":"), default=default).encode("utf-8"), obj)
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: orjson (or compact stdlib) encoding, RawJSON spliced in."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
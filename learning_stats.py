@@ -0,0 +1,207 @@
+"""
+Running per-user, per-category answer statistics.
+
+Every graded answer updates one LearnerAggregate in O(1): answer and
+correct counts, latency totals, a ring buffer with the last RECENT_WINDOW
+results, and exponentially weighted least-squares sums from which the
+learning velocity (trend in accuracy) is read without a history scan.
+LearningAnalytics (personalized_learning.py) only looks aggregates up.
+
+The aggregates live in process memory. At startup they are rebuilt from
+the answers table (see answer_log.py) in a single pass; after that each
+worker updates them for the answers it grades.
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+RECENT_WINDOW = int(os.environ.get("LEARNER_RECENT_WINDOW", "10"))
+# Weight of an answer in the velocity fit halves every VELOCITY_HALF_LIFE answers
+VELOCITY_HALF_LIFE = float(os.environ.get("LEARNER_VELOCITY_HALF_LIFE", "100"))
+# Velocity is the change in accuracy per block of this many answers
+VELOCITY_BLOCK = 10
+_MIN_TREND_POINTS = 3
+# Answer counts at which the recommendation engine changes its mind about
+# having enough data (see personalized_learning.py)
+_DATA_THRESHOLDS = (10, 20, 50)
+
+
+class Trend:
+    """Online weighted least-squares slope of y over time.
+
+    The newest point sits at x = 0 and older points at their age, so the
+    sums stay bounded however long the series gets. Adding a point ages the
+    existing ones by `step` and decays their weight by `decay`, both in O(1).
+    """
+
+    __slots__ = ("decay", "n", "w", "sx", "sy", "sxx", "sxy")
+
+    def __init__(self, decay: float = 1.0):
+        self.decay = decay
+        self.n = 0
+        self.w = self.sx = self.sy = self.sxx = self.sxy = 0.0
+
+    def add(self, y: float, step: float = 1.0) -> None:
+        d = self.decay
+        # Shift every x by +step: sum(x+s) = sx + s*w, sum((x+s)^2) = sxx + 2s*sx + s^2*w
+        self.sxx = d * (self.sxx + 2 * step * self.sx + step * step * self.w)
+        self.sxy = d * (self.sxy + step * self.sy)
+        self.sx = d * (self.sx + step * self.w)
+        self.sy = d * self.sy
+        self.w = d * self.w + 1.0
+        self.sy += y
+        self.n += 1
+
+    def slope(self) -> float:
+        """Change in y per unit of time (positive = rising), 0.0 with too few points."""
+        if self.n < _MIN_TREND_POINTS:
+            return 0.0
+        var = self.sxx * self.w - self.sx * self.sx
+        if var <= 1e-12:
+            return 0.0
+        # The fit is over age, which runs backwards in time
+        return -(self.sxy * self.w - self.sx * self.sy) / var
+
+
+def _velocity_decay() -> float:
+    return 0.5 ** (1.0 / VELOCITY_HALF_LIFE) if VELOCITY_HALF_LIFE > 0 else 1.0
+
+
+class LearnerAggregate:
+    """Running statistics of one user in one category."""
+
+    __slots__ = ("total", "correct", "latency_total_ms", "latency_count", "recent", "recent_pos",
+                 "recent_count", "recent_correct", "trend", "signature", "generation")
+
+    def __init__(self, window: int = RECENT_WINDOW, decay: float = 1.0):
+        self.total = 0
+        self.correct = 0
+        self.latency_total_ms = 0
+        self.latency_count = 0
+        self.recent = bytearray(max(1, window))
+        self.recent_pos = 0
+        self.recent_count = 0
+        self.recent_correct = 0
+        self.trend = Trend(decay)
+        self.signature = None
+        # Bumped when the aggregate changes meaningfully; keys cached recommendations
+        self.generation = 0
+
+    def _signature(self) -> tuple:
+        """Coarse state the recommendations depend on: small drifts leave it unchanged."""
+        velocity = self.velocity
+        return (
+            sum(self.total >= t for t in _DATA_THRESHOLDS),
+            int(self.accuracy * 20),          # 5% bands
+            int(self.recent_accuracy * 10),   # 10% bands
+            (velocity > 0.05) - (velocity < -0.05) + (velocity > 0.01) - (velocity < -0.01),
+        )
+
+    def add(self, correct: bool, latency_ms: Optional[int] = None) -> None:
+        result = 1 if correct else 0
+        self.total += 1
+        self.correct += result
+        if latency_ms is not None:
+            self.latency_total_ms += latency_ms
+            self.latency_count += 1
+        # Ring buffer: overwrite the oldest result once the window is full
+        if self.recent_count == len(self.recent):
+            self.recent_correct -= self.recent[self.recent_pos]
+        else:
+            self.recent_count += 1
+        self.recent[self.recent_pos] = result
+        self.recent_correct += result
+        self.recent_pos = (self.recent_pos + 1) % len(self.recent)
+        self.trend.add(result, 1.0 / VELOCITY_BLOCK)
+        signature = self._signature()
+        if signature != self.signature:
+            self.signature = signature
+            self.generation += 1
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.total if self.total else 0.0
+
+    @property
+    def recent_accuracy(self) -> float:
+        return self.recent_correct / self.recent_count if self.recent_count else 0.0
+
+    @property
+    def average_time(self) -> Optional[float]:
+        """Mean seconds per answer, or None when no latencies were reported."""
+        return self.latency_total_ms / self.latency_count / 1000 if self.latency_count else None
+
+    @property
+    def velocity(self) -> float:
+        """Trend in accuracy per VELOCITY_BLOCK answers, recent answers weighing most."""
+        return self.trend.slope()
+
+    def recent_results(self) -> List[bool]:
+        """The last results, oldest first."""
+        n, size = self.recent_count, len(self.recent)
+        start = (self.recent_pos - n) % size
+        return [bool(self.recent[(start + i) % size]) for i in range(n)]
+
+
+class LearnerStats:
+    """(user_id, category) -> LearnerAggregate, updated as answers are graded."""
+
+    def __init__(self, window: int = RECENT_WINDOW, decay: Optional[float] = None):
+        self.window = window
+        self.decay = _velocity_decay() if decay is None else decay
+        self._aggregates: Dict[Tuple[str, str], LearnerAggregate] = {}
+        self._categories: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, user_id: Optional[str], category: str, correct: bool, latency_ms: Optional[int] = None) -> None:
+        """Fold one answer into the user's aggregate; anonymous answers are ignored."""
+        if user_id is None:
+            return
+        key = (user_id, category)
+        with self._lock:
+            aggregate = self._aggregates.get(key)
+            if aggregate is None:
+                aggregate = self._aggregates[key] = LearnerAggregate(self.window, self.decay)
+                self._categories.setdefault(user_id, []).append(category)
+            aggregate.add(correct, latency_ms)
+
+    def get(self, user_id: str, category: str) -> Optional[LearnerAggregate]:
+        return self._aggregates.get((user_id, category))
+
+    def generation(self, user_id: str, category: Optional[str] = None) -> tuple:
+        """Changes whenever the user's aggregates (in `category`, or all of them) change meaningfully."""
+        categories = [category] if category else self._categories.get(user_id, ())
+        return tuple((c, a.generation if (a := self._aggregates.get((user_id, c))) else 0) for c in categories)
+
+    def categories(self, user_id: str) -> List[str]:
+        """Categories the user has answered questions in, in first-answered order."""
+        return list(self._categories.get(user_id, ()))
+
+    def replay(self, events: Iterable[Tuple[Optional[str], str, bool, Optional[int]]]) -> int:
+        """Record (user_id, category, correct, latency_ms) events in order; returns how many."""
+        count = 0
+        for user_id, category, correct, latency_ms in events:
+            self.record(user_id, category, correct, latency_ms)
+            count += 1
+        return count
+
+    def load(self, engine, batch_size: int = 10_000) -> int:
+        """Rebuild from the answers table in one ordered pass."""
+        from answer_log import answers
+
+        query = (select(answers.c.user_id, answers.c.category, answers.c.correct, answers.c.latency_ms)
+                 .where(answers.c.user_id.is_not(None)).order_by(answers.c.id))
+        with engine.connect() as conn:
+            result = conn.execution_options(yield_per=batch_size).execute(query)
+            return self.replay(result)
+
+    def stats(self) -> Dict:
+        """Gauges for /api/admin/stats."""
+        return {"users": len(self._categories), "aggregates": len(self._aggregates), "recent_window": self.window}
+
+
+# Shared by webapi (which feeds it) and personalized_learning (which reads it)
+LEARNER_STATS = LearnerStats()
@@ -0,0 +1,62 @@
+"""
+Schema migrations.
+
+Each module in this package named ``mNNNN_<description>.py`` defines
+``upgrade(conn)``; they run in order and are recorded in the
+``schema_migrations`` table, so every migration is applied exactly once.
+This replaces ``Base.metadata.create_all()`` at startup, which could only
+create missing tables and never alter existing ones.
+
+Usage:
+    python -m migrations            # apply pending migrations to DATABASE_URL
+    python -m migrations --status   # list applied/pending migrations
+"""
+
+import importlib
+import pkgutil
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, text
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _metadata,
+    Column("version", String(64), primary_key=True),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+# Arbitrary key for pg_advisory_xact_lock so concurrent workers migrate one at a time
+_PG_LOCK_KEY = 7_240_001
+
+
+def discover() -> List[Tuple[str, object]]:
+    """Return (version, module) for every migration, oldest first."""
+    found = []
+    for info in pkgutil.iter_modules(__path__):
+        if info.name.startswith("m") and info.name[1:5].isdigit():
+            found.append((info.name, importlib.import_module(f"{__name__}.{info.name}")))
+    return sorted(found)
+
+
+def applied_versions(engine) -> set:
+    with engine.begin() as conn:
+        _metadata.create_all(conn, checkfirst=True)
+        return {row[0] for row in conn.execute(schema_migrations.select())}
+
+
+def upgrade(engine) -> List[str]:
+    """Apply pending migrations, each in its own transaction. Returns the versions applied."""
+    applied = []
+    applied_versions(engine)  # ensure the bookkeeping table exists
+    for version, module in discover():
+        with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _PG_LOCK_KEY})
+            done = conn.execute(schema_migrations.select().where(schema_migrations.c.version == version)).first()
+            if done is not None:
+                continue
+            module.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(version=version, applied_at=datetime.now(timezone.utc)))
+            applied.append(version)
+    return applied
@@ -0,0 +1,20 @@
+import sys
+
+from db import engine
+from migrations import applied_versions, discover, upgrade
+
+
+def main(argv) -> int:
+    if "--status" in argv:
+        done = applied_versions(engine)
+        for version, module in discover():
+            mark = "x" if version in done else " "
+            print(f"[{mark}] {version}: {(module.__doc__ or '').strip().splitlines()[0]}")
+        return 0
+    applied = upgrade(engine)
+    print(f"Applied {len(applied)} migration(s): {', '.join(applied) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,39 @@
+"""Initial schema (as created by the original create_all): questions, choices, bank_generations."""
+
+from sqlalchemy import BigInteger, Boolean, Column, ForeignKey, Integer, MetaData, String, Table, Text, select
+
+_metadata = MetaData()
+
+Table(
+    "questions", _metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("text", Text, nullable=False),
+    Column("explanation", Text, nullable=True),
+    Column("difficulty", Integer),
+)
+
+Table(
+    "choices", _metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("question_id", Integer, ForeignKey("questions.id"), nullable=False),
+    Column("text", String(500), nullable=False),
+    Column("is_correct", Boolean),
+)
+
+bank_generations = Table(
+    "bank_generations", _metadata,
+    Column("category", String(64), primary_key=True),
+    Column("generation", BigInteger, nullable=False),
+)
+
+# The general bank and PSPO1 / NURSING from models.py, spelled out so the migration never changes with them
+_CATEGORIES = ("general", "PSPO1", "Verpleegkundig Rekenen")
+
+
+def upgrade(conn):
+    # Databases created before migrations existed already have these tables
+    _metadata.create_all(conn, checkfirst=True)
+    present = set(conn.execute(select(bank_generations.c.category)).scalars())
+    missing = [{"category": c, "generation": 0} for c in _CATEGORIES if c not in present]
+    if missing:
+        conn.execute(bank_generations.insert(), missing)
@@ -0,0 +1,26 @@
+"""Dedicated questions.category column plus indexes for the serving filters."""
+
+from sqlalchemy import inspect, text
+
+# Categories that used to be encoded in questions.explanation
+_LEGACY_CATEGORIES = ("PSPO1", "Verpleegkundig Rekenen")
+
+
+def upgrade(conn):
+    columns = {c["name"] for c in inspect(conn).get_columns("questions")}
+    if "category" not in columns:
+        conn.execute(text("ALTER TABLE questions ADD COLUMN category VARCHAR(64)"))
+
+    # explanation NULL meant "general"; any other non-category text was a real
+    # explanation and those rows were never served, so they stay uncategorized.
+    conn.execute(text("""
+        UPDATE questions SET category = CASE
+            WHEN explanation IN (:pspo1, :nursing) THEN explanation
+            WHEN explanation IS NULL THEN 'general'
+        END
+        WHERE category IS NULL
+    """), {"pspo1": _LEGACY_CATEGORIES[0], "nursing": _LEGACY_CATEGORIES[1]})
+
+    # (category, difficulty) also serves plain category filters via its prefix
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_questions_category_difficulty ON questions (category, difficulty)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_choices_question_id ON choices (question_id)"))
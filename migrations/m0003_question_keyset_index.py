@@ -0,0 +1,7 @@
+"""(category, id) index for keyset-paginated admin listings filtered by category."""
+
+from sqlalchemy import text
+
+
+def upgrade(conn):
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_questions_category_id ON questions (category, id)"))
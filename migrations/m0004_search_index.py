@@ -0,0 +1,8 @@
+"""Full-text search index over questions and choices (see search_index.py), backfilled from the bank."""
+
+import search_index
+
+
+def upgrade(conn):
+    search_index.create(conn)
+    search_index.rebuild(conn)
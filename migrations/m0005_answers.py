@@ -0,0 +1,26 @@
+"""answers event table: one row per graded answer (see answer_log.py)."""
+
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Index, Integer, MetaData, String, Table
+
+_metadata = MetaData()
+
+Table(
+    "answers", _metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("session_id", String(64), nullable=False),
+    Column("user_id", String(64), nullable=True),
+    # No foreign key (and 64-bit): generated question ids have bit 31 set
+    # and are not stored in questions
+    Column("question_id", BigInteger, nullable=False),
+    Column("category", String(64), nullable=False),
+    Column("choice", Integer, nullable=False),
+    Column("correct", Boolean, nullable=False),
+    Column("latency_ms", Integer, nullable=True),
+    Column("answered_at", DateTime(timezone=True), nullable=False),
+    Index("ix_answers_user_category_answered_at", "user_id", "category", "answered_at"),
+    Index("ix_answers_session_id", "session_id"),
+)
+
+
+def upgrade(conn):
+    _metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,22 @@
+"""review_items: spaced-repetition state per (user, question) with a due-date index."""
+
+from sqlalchemy import BigInteger, Column, DateTime, Float, Index, MetaData, SmallInteger, String, Table
+
+_metadata = MetaData()
+
+Table(
+    "review_items", _metadata,
+    Column("user_id", String(64), primary_key=True),
+    Column("question_id", BigInteger, primary_key=True),
+    Column("category", String(64), nullable=False),
+    Column("due_at", DateTime(timezone=True), nullable=False),
+    Column("interval_days", Float, nullable=False),
+    Column("ease", SmallInteger, nullable=False),
+    Column("repetitions", SmallInteger, nullable=False),
+    Column("lapses", SmallInteger, nullable=False),
+    Index("ix_review_items_user_category_due_at", "user_id", "category", "due_at"),
+)
+
+
+def upgrade(conn):
+    _metadata.create_all(conn, checkfirst=True)
@@ -1,19 +1,93 @@
-from sqlalchemy import Integer, String, Boolean, ForeignKey, Text
+from sqlalchemy import BigInteger, Integer, SmallInteger, Float, String, Boolean, DateTime, ForeignKey, Text, Index, event
 from sqlalchemy.orm import mapped_column, relationship
 from db import Base
 
+GENERAL = "general"
+PSPO1 = "PSPO1"
+NURSING = "Verpleegkundig Rekenen"
+CATEGORIES = (PSPO1, NURSING)
+
+
+def legacy_category(explanation):
+    """Category for rows that still only mark it in `explanation` (NULL = general)."""
+    if explanation is None:
+        return GENERAL
+    return explanation if explanation in CATEGORIES else None
+
+
 class Question(Base):
     __tablename__ = "questions"
     id = mapped_column(Integer, primary_key=True, autoincrement=True)
     text = mapped_column(Text, nullable=False)
     explanation = mapped_column(Text, nullable=True)
+    category = mapped_column(String(64), nullable=True)
     difficulty = mapped_column(Integer, default=1)
-    choices = relationship("Choice", back_populates="question", cascade="all, delete-orphan")
+    choices = relationship("Choice", back_populates="question", cascade="all, delete-orphan", order_by="Choice.id")
+
+    __table_args__ = (
+        Index("ix_questions_category_difficulty", "category", "difficulty"),
+        Index("ix_questions_category_id", "category", "id"),
+    )
 
 class Choice(Base):
     __tablename__ = "choices"
     id = mapped_column(Integer, primary_key=True, autoincrement=True)
-    question_id = mapped_column(ForeignKey("questions.id"), nullable=False)
+    question_id = mapped_column(ForeignKey("questions.id"), nullable=False, index=True)
     text = mapped_column(String(500), nullable=False)
     is_correct = mapped_column(Boolean, default=False)
     question = relationship("Question", back_populates="choices")
+
+
+class BankGeneration(Base):
+    """Counter per category, bumped by every admin write; replicas poll it to drop stale banks (bank_cache.py)."""
+    __tablename__ = "bank_generations"
+    category = mapped_column(String(64), primary_key=True)
+    generation = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class Answer(Base):
+    """One graded answer. Written in batches by answer_log.AnswerLog.
+
+    question_id has no foreign key: generated questions (nursing_generator.py)
+    have ids (bit 31 set, hence BigInteger) that never exist in the questions table.
+    """
+    __tablename__ = "answers"
+    id = mapped_column(Integer, primary_key=True, autoincrement=True)
+    session_id = mapped_column(String(64), nullable=False)
+    user_id = mapped_column(String(64), nullable=True)
+    question_id = mapped_column(BigInteger, nullable=False)
+    category = mapped_column(String(64), nullable=False)
+    choice = mapped_column(Integer, nullable=False)
+    correct = mapped_column(Boolean, nullable=False)
+    latency_ms = mapped_column(Integer, nullable=True)
+    answered_at = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_answers_user_category_answered_at", "user_id", "category", "answered_at"),
+        Index("ix_answers_session_id", "session_id"),
+    )
+
+
+class ReviewItem(Base):
+    """Spaced-repetition state of one (user, question) pair; see review_scheduler.py."""
+    __tablename__ = "review_items"
+    user_id = mapped_column(String(64), primary_key=True)
+    question_id = mapped_column(BigInteger, primary_key=True)
+    category = mapped_column(String(64), nullable=False)
+    due_at = mapped_column(DateTime(timezone=True), nullable=False)
+    interval_days = mapped_column(Float, nullable=False)
+    # SM-2 ease factor in hundredths (250 = 2.5)
+    ease = mapped_column(SmallInteger, nullable=False)
+    repetitions = mapped_column(SmallInteger, nullable=False)
+    lapses = mapped_column(SmallInteger, nullable=False)
+
+    __table_args__ = (
+        Index("ix_review_items_user_category_due_at", "user_id", "category", "due_at"),
+    )
+
+
+@event.listens_for(Question, "before_insert")
+def _fill_category(mapper, connection, target):
+    # Older seeding code only sets explanation; keep category in step
+    if target.category is None:
+        target.category = legacy_category(target.explanation)
@@ -0,0 +1,530 @@
+"""
+Parametric nursing calculation questions ("Verpleegkundig Rekenen").
+
+Instead of a fixed list of stored rows, every question is a template
+(dosage, IV rate, drip rate, concentration, unit conversion, pediatric
+dose) plus a grid of values for each parameter. A question id encodes the
+template and one point on its parameter grid:
+
+    bit 31      always 1 (never collides with database ids)
+    bits 24-30  template number
+    bits 0-23   mixed-radix index into the template's parameter grids
+
+so a session's id list (see session_store.py) is all the state a
+generated quiz needs; questions are re-rendered from their id on demand.
+Answers and distractors are computed with NumPy for all questions of a
+template at once.
+
+GeneratedBank exposes the QuestionBank interface the quiz endpoints use
+(by_id, ids, payload_json, preview_json, sample, buckets), so webapi.py serves the
+category from it when NURSING_GENERATOR is enabled (the default).
+"""
+
+import math
+import os
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from itertools import accumulate, permutations
+from string import Formatter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from adaptive import BucketIndex, RangeBucket
+from bank_cache import preview_payload, question_payload
+from json_response import RawJSON, dumps
+from models import NURSING
+
+GENERATED_BIT = 1 << 31
+_TEMPLATE_SHIFT = 24
+_LOCAL_MASK = (1 << _TEMPLATE_SHIFT) - 1
+NURSING_SESSION_SIZE = int(os.environ.get("NURSING_SESSION_SIZE", "100"))
+
+# The 24 orders of four choices; a question's order is picked from its id
+_ORDERS = np.array(list(permutations(range(4))), dtype=np.int64)
+
+_PATIENTS = np.array([
+    "Een patiënt", "Mevrouw Jansen", "Meneer de Vries", "Mevrouw Bakker", "Meneer Visser", "Mevrouw Smit",
+    "Meneer Mulder", "Mevrouw de Boer", "Meneer Bos", "Mevrouw Vos", "Meneer Peters", "Mevrouw Hendriks",
+    "Meneer van Dijk", "Mevrouw Dekker", "Meneer Brouwer", "Mevrouw de Wit", "Mevrouw Meijer", "Meneer de Jong",
+    "Mevrouw van den Berg", "Meneer Janssen", "Mevrouw Willems", "Meneer Jacobs", "Mevrouw van der Linden",
+    "Meneer Kok", "Mevrouw Schouten", "Meneer Prins", "Mevrouw Huisman", "Meneer Postma", "Mevrouw Kuipers",
+    "Meneer Verhoeven", "Mevrouw van Leeuwen", "Meneer Koster",
+], dtype=object)
+_CHILDREN = np.array([
+    "Een kind", "Daan", "Emma", "Sem", "Julia", "Lucas", "Tess", "Finn", "Zoë", "Noah", "Mila", "Sophie", "Levi",
+    "Liam", "Nora", "Luuk", "Sara", "Milan", "Yara", "Jesse", "Evi", "Bram", "Lotte", "Thijs",
+], dtype=object)
+_FLUIDS = np.array(["NaCl 0,9%", "glucose 5%", "Ringerlactaat", "glucose 10%", "NaCl 0,45%", "Plasmalyte"], dtype=object)
+_SOLUTES = np.array(["glucose", "NaCl", "lidocaïne", "kaliumchloride", "natriumbicarbonaat", "magnesiumsulfaat"], dtype=object)
+_PUMP_DRUGS = np.array(["morfine", "insuline", "heparine", "midazolam", "noradrenaline", "furosemide"], dtype=object)
+
+
+def _grid(start, stop, step) -> np.ndarray:
+    return np.round(np.arange(start, stop + step / 2, step), 4)
+
+
+def _regimens(table: Dict[str, Sequence[float]]):
+    """{drug: usual amounts} as parallel (drug, amount) arrays; a template's "regimen" grid indexes them.
+
+    Drug and amount vary together, so a question never pairs a drug with
+    an amount it is not given in.
+    """
+    pairs = [(drug, amount) for drug, amounts in table.items() for amount in amounts]
+    return np.array([d for d, _ in pairs], dtype=object), np.array([a for _, a in pairs], dtype=float)
+
+
+# Tablet strengths (mg) on the market; at most 2 tablets per dose
+_TABLET_DRUG, _TABLET_STRENGTH = _regimens({
+    "paracetamol": (500,), "ibuprofen": (200, 400), "metoprolol": (25, 50, 100), "furosemide": (20, 40),
+    "digoxine": (0.125, 0.25), "prednisolon": (5, 20), "amoxicilline": (250, 500), "metformine": (500, 850),
+    "enalapril": (5, 10, 20), "diclofenac": (25, 50), "oxazepam": (10, 50), "haloperidol": (1, 5),
+})
+# Usual single doses in mg/kg; with the weight grids the totals stay within adult / pediatric maxima
+_ADULT_DRUG, _ADULT_PER_KG = _regimens({
+    "prednisolon": (0.5, 0.75), "vancomycine": (15, 20), "gentamicine": (5, 7), "amikacine": (15,),
+    "enoxaparine": (1, 1.5), "morfine": (0.05, 0.1), "propofol": (1, 1.5, 2), "rocuronium": (0.6, 1.2),
+    "ketamine": (0.5, 1), "midazolam": (0.03, 0.05), "dexamethason": (0.1, 0.15),
+})
+_CHILD_DRUG, _CHILD_PER_KG = _regimens({
+    "paracetamol": (10, 15), "ibuprofen": (5, 7.5, 10), "amoxicilline": (15, 20), "gentamicine": (5, 7),
+    "vancomycine": (10, 15), "prednisolon": (1, 2), "morfine": (0.05, 0.1), "cefazoline": (25, 30),
+    "ceftriaxon": (50, 80), "dexamethason": (0.15, 0.6),
+})
+# Suspension strengths (mg per 5 ml)
+_SUSPENSION_DRUG, _SUSPENSION_STRENGTH = _regimens({
+    "paracetamol": (120, 240), "ibuprofen": (100, 200), "amoxicilline": (125, 250), "claritromycine": (125, 250),
+})
+
+
+@dataclass(frozen=True)
+class Template:
+    key: str
+    difficulty: int
+    text: str  # str.format over the parameter names
+    params: Dict[str, np.ndarray]  # name -> grid of values
+    answer: Callable[..., np.ndarray]  # vectorized over parameter arrays
+    distractors: Callable[..., Sequence[np.ndarray]]  # (answer, **params) -> three wrong values
+    unit: str
+    decimals: int = 1
+
+    @cached_property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(len(g) for g in self.params.values())
+
+    @property
+    def size(self) -> int:
+        return math.prod(self.shape)
+
+    @cached_property
+    def labels(self) -> Dict[str, List[str]]:
+        """Every grid value formatted once, for the question text."""
+        return {name: [fmt(v) for v in grid.tolist()] for name, grid in self.params.items()}
+
+    @cached_property
+    def choice_format(self) -> str:
+        """%-format for one question's choice values, unit included; fmt() is this plus the decimal comma."""
+        return "\t".join(["%.10g" + self.unit] * _ORDERS.shape[1])
+
+    @cached_property
+    def fields(self) -> List[str]:
+        """The parameter of each {field} in the text, in order."""
+        return [name for _, name, _, _ in Formatter().parse(self.text) if name]
+
+    @cached_property
+    def positional_text(self) -> str:
+        """The text with {0}, {1}, ... for `fields`: one str.format(*args) per question."""
+        return "".join(literal.replace("{", "{{").replace("}", "}}") + ("{%d}" % i if name else "")
+                       for i, (literal, name, _, _) in enumerate(Formatter().parse(self.text)))
+
+    def decode(self, local: np.ndarray):
+        """(values, grid positions) per parameter for mixed-radix indexes (last parameter varies fastest)."""
+        positions = dict(zip(self.params, np.unravel_index(local, self.shape)))
+        return {name: self.params[name][r] for name, r in positions.items()}, positions
+
+
+TEMPLATES: List[Template] = [
+    Template(
+        "tabletten", 1,
+        "{patient} moet {dose} mg {drug} krijgen. De tabletten bevatten {strength} mg per stuk. Hoeveel tabletten geef je?",
+        {"patient": _PATIENTS, "regimen": np.arange(len(_TABLET_DRUG)), "tablets": np.array([0.5, 1, 1.5, 2])},
+        lambda strength, tablets, **_: tablets,
+        lambda a, **_: (a * 2, a / 2, a + 1),
+        " tablet(ten)", 2,
+    ),
+    Template(
+        "dosis_per_kg", 2,
+        "{patient} weegt {weight} kg en moet {per_kg} mg/kg {drug} krijgen. Wat is de totale dosis?",
+        {"patient": _PATIENTS, "regimen": np.arange(len(_ADULT_DRUG)), "weight": _grid(40, 150, 0.1)},
+        lambda weight, per_kg, **_: weight * per_kg,
+        lambda a, weight, per_kg, **_: (a * 10, a / 10, (weight + 10) * per_kg),
+        " mg", 2,
+    ),
+    Template(
+        "infuus_ml_per_uur", 2,
+        "{patient} krijgt een infuus van {volume} ml {fluid} in {hours} uur. Bereken de inloopsnelheid in ml/uur:",
+        {"patient": _PATIENTS, "fluid": _FLUIDS,
+         "volume": np.array([50, 100, 150, 200, 250, 300, 400, 500, 750, 1000]),
+         "hours": np.array([1, 1.5, 2, 3, 4, 5, 6, 8, 10, 12, 16, 24])},
+        lambda volume, hours, **_: volume / hours,
+        lambda a, volume, hours, **_: (volume * hours / 10, volume / (hours * 60), volume / (hours + 1)),
+        " ml/uur", 1,
+    ),
+    Template(
+        "druppelsnelheid", 3,
+        "Een infuus van {volume} ml {fluid} moet in {hours} uur inlopen. Het infuussysteem geeft {drops} druppels/ml. "
+        "Hoeveel druppels per minuut stel je in?",
+        {"fluid": _FLUIDS, "volume": np.array([100, 250, 500, 750, 1000]),
+         "hours": np.array([2, 3, 4, 6, 8, 10, 12, 24]), "drops": np.array([15, 20, 60])},
+        lambda volume, hours, drops, **_: np.round(volume * drops / (hours * 60)),
+        lambda a, volume, hours, drops, **_: (np.round(volume / (hours * 60)), np.round(volume * drops / hours),
+                                              np.round(a * 20 / drops) + np.where(drops == 20, 5, 0)),
+        " druppels/min", 0,
+    ),
+    Template(
+        "pomp_totaal", 1,
+        "Een pomp met {drug} staat op {rate} ml/uur. Hoeveel ml krijgt {patient_lower} in {hours} uur?",
+        {"patient_lower": np.array(["de patiënt", "mevrouw", "meneer", "het kind"], dtype=object), "drug": _PUMP_DRUGS,
+         "rate": _grid(0.1, 10, 0.1), "hours": np.array([1, 2, 4, 6, 8, 12, 24])},
+        lambda rate, hours, **_: rate * hours,
+        lambda a, rate, hours, **_: (rate * (hours + 2), a / 2, rate * 60 * hours / 100),
+        " ml", 1,
+    ),
+    Template(
+        "procent_gram", 2,
+        "Hoeveel gram {solute} zit er in {volume} ml van een {percent}% oplossing?",
+        {"solute": _SOLUTES, "percent": np.array([0.45, 0.9, 1, 2, 2.5, 3, 5, 7.5, 8.4, 10, 15, 20, 40, 50]),
+         "volume": np.array([5, 10, 20, 50, 100, 250, 500, 1000])},
+        lambda percent, volume, **_: percent * volume / 100,
+        lambda a, percent, volume, **_: (a * 10, a / 10, percent * volume),
+        " gram", 3,
+    ),
+    Template(
+        "procent_mg", 2,
+        "Een {percent}% {solute}-oplossing: hoeveel mg bevat {volume} ml?",
+        {"solute": _SOLUTES, "percent": np.array([0.5, 1, 2, 3, 4, 5, 10, 20]),
+         "volume": np.array([1, 2, 2.5, 5, 10, 20, 50])},
+        lambda percent, volume, **_: percent * 10 * volume,
+        lambda a, **_: (a / 10, a * 10, a / 100),
+        " mg", 1,
+    ),
+    Template(
+        "procent_ml_nodig", 3,
+        "Hoeveel ml van een {percent}% {solute}-oplossing heb je nodig voor {grams} gram werkzame stof?",
+        {"solute": _SOLUTES, "percent": np.array([1, 2, 2.5, 5, 10, 20, 25, 40, 50]),
+         "grams": np.array([0.5, 1, 1.5, 2, 2.5, 3, 4, 5, 10, 20])},
+        lambda percent, grams, **_: grams * 100 / percent,
+        lambda a, percent, grams, **_: (grams * percent, a / 10, a * 10),
+        " ml", 1,
+    ),
+    Template(
+        "gram_naar_mg", 1, "Reken {value} gram om naar milligram:",
+        {"value": _grid(0.005, 10, 0.005)},
+        lambda value, **_: value * 1000,
+        lambda a, **_: (a / 10, a * 10, a / 1000),
+        " mg", 3,
+    ),
+    Template(
+        "mg_naar_microgram", 1, "Hoeveel microgram is {value} mg?",
+        {"value": _grid(0.001, 5, 0.001)},
+        lambda value, **_: value * 1000,
+        lambda a, **_: (a / 10, a * 10, a / 1000),
+        " microgram", 3,
+    ),
+    Template(
+        "mg_naar_gram", 1, "Hoeveel gram is {value} mg?",
+        {"value": _grid(1, 5000, 1)},
+        lambda value, **_: value / 1000,
+        lambda a, **_: (a * 10, a / 10, a * 1000),
+        " gram", 4,
+    ),
+    Template(
+        "liter_naar_ml", 1, "Reken {value} liter om naar milliliter:",
+        {"value": _grid(0.05, 5, 0.05)},
+        lambda value, **_: value * 1000,
+        lambda a, **_: (a / 10, a * 10, a / 100),
+        " ml", 1,
+    ),
+    Template(
+        "kind_dosis", 2,
+        "{child} ({weight} kg) moet {per_kg} mg/kg {drug} krijgen. Wat is de totale dosis?",
+        {"child": _CHILDREN, "regimen": np.arange(len(_CHILD_DRUG)), "weight": _grid(2.5, 45, 0.05)},
+        lambda weight, per_kg, **_: weight * per_kg,
+        lambda a, weight, per_kg, **_: (a * 10, a / 10, (weight + 5) * per_kg),
+        " mg", 2,
+    ),
+    Template(
+        "kind_suspensie", 3,
+        "{child} moet {dose} mg {drug} krijgen. De suspensie bevat {strength} mg per 5 ml. Hoeveel ml geef je?",
+        {"child": _CHILDREN, "regimen": np.arange(len(_SUSPENSION_DRUG)), "ml": _grid(0.5, 10, 0.5)},
+        lambda ml, **_: ml,
+        lambda a, strength, **_: (a * 2, a / 5, a + 2.5),
+        " ml", 2,
+    ),
+]
+
+# Topic of each template, named as in personalized_learning's topic lists
+TOPICS = {
+    "tabletten": "Dosering berekeningen",
+    "dosis_per_kg": "Dosering berekeningen",
+    "kind_dosis": "Dosering berekeningen",
+    "kind_suspensie": "Dosering berekeningen",
+    "infuus_ml_per_uur": "IV druppelsnelheid",
+    "druppelsnelheid": "IV druppelsnelheid",
+    "pomp_totaal": "IV druppelsnelheid",
+    "procent_gram": "Percentage oplossingen",
+    "procent_mg": "Percentage oplossingen",
+    "procent_ml_nodig": "Percentage oplossingen",
+    "gram_naar_mg": "Eenheid conversies",
+    "mg_naar_microgram": "Eenheid conversies",
+    "mg_naar_gram": "Eenheid conversies",
+    "liter_naar_ml": "Eenheid conversies",
+}
+
+# Derived parameters shown in a question but not stored in its id
+_DERIVED = {
+    "tabletten": lambda v: {"drug": _TABLET_DRUG[v["regimen"]], "strength": _TABLET_STRENGTH[v["regimen"]],
+                            "dose": _TABLET_STRENGTH[v["regimen"]] * v["tablets"]},
+    "dosis_per_kg": lambda v: {"drug": _ADULT_DRUG[v["regimen"]], "per_kg": _ADULT_PER_KG[v["regimen"]]},
+    "kind_dosis": lambda v: {"drug": _CHILD_DRUG[v["regimen"]], "per_kg": _CHILD_PER_KG[v["regimen"]]},
+    "kind_suspensie": lambda v: {"drug": _SUSPENSION_DRUG[v["regimen"]], "strength": _SUSPENSION_STRENGTH[v["regimen"]],
+                                 "dose": _SUSPENSION_STRENGTH[v["regimen"]] * v["ml"] / 5},
+}
+
+_SIZES = np.array([t.size for t in TEMPLATES], dtype=np.int64)
+_DECIMALS = np.array([t.decimals for t in TEMPLATES])
+assert len(TEMPLATES) < 128 and (_SIZES <= _LOCAL_MASK + 1).all()
+
+
+def variant_count() -> int:
+    return int(_SIZES.sum())
+
+
+def is_generated(qid: int) -> bool:
+    return bool(qid & GENERATED_BIT)
+
+
+@lru_cache(maxsize=1 << 16)
+def fmt(value) -> str:
+    """A number the Dutch way: decimal comma, no trailing zeros."""
+    if isinstance(value, str):
+        return value
+    return ("%.10g" % value).replace(".", ",")
+
+
+def _distinct(values: np.ndarray, decimals: np.ndarray) -> np.ndarray:
+    """Round each row of the (n, 4) answer/distractor matrix to its decimals; make its values distinct and positive."""
+    scale = (10.0 ** decimals)[:, None]
+    values = np.round(values * scale) / scale
+    step = 1 / scale[:, 0]
+    values[:, 1:] = np.where(values[:, 1:] <= 0, values[:, :1] + step[:, None], values[:, 1:])
+    ordered = np.sort(values, axis=1)
+    if (ordered[:, 1:] != ordered[:, :-1]).all():
+        return values  # the usual case
+    for col in range(1, values.shape[1]):
+        for _ in range(values.shape[1]):
+            clash = (values[:, col:col + 1] == values[:, :col]).any(axis=1)
+            if not clash.any():
+                break
+            bumped = values[clash, col] + np.maximum(values[clash, 0] * 0.25, step[clash])
+            values[clash, col] = np.round(bumped * scale[clash, 0]) / scale[clash, 0]
+    return values
+
+
+def render(ids: Sequence[int]) -> List[Optional[Dict]]:
+    """Question dicts (the bank_cache format) for generated ids; None for ids that are not valid."""
+    ids = np.asarray(ids, dtype=np.int64)
+    out: List[Optional[Dict]] = [None] * len(ids)
+    template_no = (ids >> _TEMPLATE_SHIFT) & 0x7F
+    local = ids & _LOCAL_MASK
+    valid = ((ids & GENERATED_BIT) != 0) & (template_no < len(TEMPLATES))
+    valid[valid] &= local[valid] < _SIZES[template_no[valid]]
+    if not valid.any():
+        return out
+
+    # Answers and distractors per template, then one pass over the whole batch
+    parts, texts = [], {}
+    grouped = np.flatnonzero(valid)
+    grouped = grouped[np.argsort(template_no[grouped], kind="stable")]
+    templates, starts = np.unique(template_no[grouped], return_index=True)
+    for t, rows in zip(templates.tolist(), np.split(grouped, starts[1:])):
+        template = TEMPLATES[t]
+        values, positions = template.decode(local[rows])
+        derived = _DERIVED[template.key](values) if template.key in _DERIVED else {}
+        answer = np.asarray(template.answer(**values, **derived), dtype=float)
+        wrong = template.distractors(answer, **values, **derived)
+        parts.append((rows, np.array((answer, *wrong))))
+        labels = template.labels
+        columns = [[fmt(v) for v in derived[name].tolist()] if name in derived
+                   else [labels[name][i] for i in positions[name].tolist()]
+                   for name in template.fields]
+        text = template.positional_text
+        for row, args in zip(rows.tolist(), zip(*columns)):
+            texts[row] = (template, text.format(*args))
+
+    rows = np.concatenate([p[0] for p in parts])
+    options = _distinct(np.concatenate([p[1] for p in parts], axis=1).T, _DECIMALS[template_no[rows]])
+    order = _ORDERS[(local[rows] * 2654435761 + template_no[rows]) % len(_ORDERS)]
+    options = np.take_along_axis(options, order, axis=1).tolist()
+    correct = np.argmax(order == 0, axis=1).tolist()
+    qids = ids.tolist()
+    for row, opts, index in zip(rows.tolist(), options, correct):
+        template, text = texts[row]
+        out[row] = {
+            "id": qids[row],
+            "text": text,
+            # Units have no "." of their own
+            "choices": tuple((template.choice_format % tuple(opts)).replace(".", ",").split("\t")),
+            "answer": index,
+            "correct_answers": (index,),
+            "difficulty": template.difficulty,
+        }
+    return out
+
+
+# Templates with huge grids would crowd out the rest; cap their share
+_SAMPLE_CAP = 50_000
+_WEIGHTS = np.minimum(_SIZES, _SAMPLE_CAP) / np.minimum(_SIZES, _SAMPLE_CAP).sum()
+_CUMULATIVE = np.cumsum(_WEIGHTS)
+_CUMULATIVE[-1] = 1.0  # a uniform draw in [0, 1) always lands on a template
+
+
+# Seeding a Generator costs more than a whole draw, so keep one per process
+# (a forked worker gets its own, or every worker would draw the same ids)
+_RNG = np.random.default_rng()
+
+
+def _reseed() -> None:
+    global _RNG
+    _RNG = np.random.default_rng()
+
+
+os.register_at_fork(after_in_child=_reseed)
+
+
+def _numpy_rng(rng) -> Optional[np.random.Generator]:
+    """A NumPy Generator for `rng`: as is, or seeded from a random.Random (or the random module)."""
+    if rng is None or isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng(rng.getrandbits(64))
+
+
+def sample_ids(count: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """`count` distinct generated ids, templates weighted by how many variants they have (capped)."""
+    rng = rng if rng is not None else _RNG
+    chosen = np.empty(0, dtype=np.int64)
+    while len(chosen) < count:
+        u = rng.random((2, count - len(chosen)))
+        t = np.searchsorted(_CUMULATIVE, u[0], side="right")
+        local = (u[1] * _SIZES[t]).astype(np.int64)
+        chosen = np.concatenate([chosen, GENERATED_BIT | (t << _TEMPLATE_SHIFT) | local])
+        _, first = np.unique(chosen, return_index=True)
+        chosen = chosen[np.sort(first)]
+    return chosen[:count]
+
+
+@lru_cache(maxsize=1)
+def bucket_index() -> BucketIndex:
+    """(difficulty, topic) buckets over every template's id range, weighted like sample_ids."""
+    grouped: Dict[tuple, list] = {}
+    for t, template in enumerate(TEMPLATES):
+        key = (template.difficulty, TOPICS.get(template.key))
+        grouped.setdefault(key, []).append((GENERATED_BIT | (t << _TEMPLATE_SHIFT), int(_SIZES[t]), float(_WEIGHTS[t])))
+    return BucketIndex({
+        key: RangeBucket([(base, size) for base, size, _ in ranges], [w for _, _, w in ranges])
+        for key, ranges in grouped.items()
+    })
+
+
+def generate(count: int, rng: Optional[np.random.Generator] = None) -> List[Dict]:
+    """A fresh set of `count` questions."""
+    return render(sample_ids(count, rng))
+
+
+@lru_cache(maxsize=65536)
+def _question(qid: int) -> Optional[Dict]:
+    return render([qid])[0]
+
+
+class _Variants(Mapping):
+    """id -> question for every generated id, rendered lazily."""
+
+    def __getitem__(self, qid):
+        q = _question(qid) if isinstance(qid, int) else None
+        if q is None:
+            raise KeyError(qid)
+        return q
+
+    def __iter__(self):
+        raise TypeError("generated questions cannot be enumerated")
+
+    def __len__(self):
+        return variant_count()
+
+
+class _VariantIds(Sequence):
+    """Generated ids as an indexable sequence, for orders that address ids by position.
+
+    Each template contributes min(size, _SAMPLE_CAP) evenly spread variants,
+    so a uniform draw over the sequence weighs templates like sample_ids does.
+    Nothing is materialized: position -> id is a bisection over the templates.
+    """
+
+    def __init__(self):
+        self._slots = np.minimum(_SIZES, _SAMPLE_CAP).tolist()
+        self._starts = [0, *accumulate(self._slots)]
+
+    def __len__(self) -> int:
+        return self._starts[-1]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("variant index out of range")
+        t = bisect_right(self._starts, i) - 1
+        local = (i - self._starts[t]) * int(_SIZES[t]) // self._slots[t]
+        return GENERATED_BIT | (t << _TEMPLATE_SHIFT) | local
+
+
+class GeneratedBank:
+    """The QuestionBank interface over generated questions."""
+
+    def __init__(self, category: str = NURSING, session_size: int = NURSING_SESSION_SIZE):
+        self.category = category
+        self.session_size = session_size
+        self.by_id = _Variants()
+        # Positional view for token sessions (session_tokens.SeededOrder)
+        self.ids = _VariantIds()
+        self.version = len(TEMPLATES)
+
+    def __len__(self) -> int:
+        return variant_count()
+
+    def payload_json(self, qid: int) -> RawJSON:
+        return _payload_json(qid)
+
+    def preview_json(self, qid: int, index: int) -> RawJSON:
+        return RawJSON(b'{"index":%d,' % index + _preview_json(qid)[1:])
+
+    def sample(self, count: int, rng=None) -> array:
+        """Like QuestionBank.sample; `rng` is a NumPy Generator or a random.Random."""
+        return array("I", sample_ids(count, _numpy_rng(rng)).tolist())
+
+    def buckets(self) -> BucketIndex:
+        return bucket_index()
+
+
+@lru_cache(maxsize=65536)
+def _payload_json(qid: int) -> RawJSON:
+    return RawJSON(dumps(question_payload(_question(qid))))
+
+
+@lru_cache(maxsize=65536)
+def _preview_json(qid: int) -> bytes:
+    return dumps(preview_payload(_question(qid)))
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Extract questions from a PDF question bank (such as PSPO1_v1.2.1.pdf) as NDJSON.
+
+Replaces the extract_pspo*.py / extract_all_pspo1.py /
+extract_clean_pspo_questions.py scripts with one engine:
+
+- pages are extracted with pdfplumber in a process pool, in contiguous
+  chunks so each worker opens the PDF once per chunk;
+- the text of every page is cached on disk, keyed by the PDF's SHA-256
+  and the page number (EXTRACT_CACHE_DIR, default .extract_cache), so a
+  re-run after a parser change never touches the PDF;
+- lines are parsed in one pass by a small state machine (QuestionParser)
+  and each question is written as soon as it is complete.
+
+The correct answer comes from an answer line after the choices ("Correct
+answer: B", "Antwoord: A, C", "The answer is True", "D is correct") or from
+an answer-key section ("Answer key" / "Antwoordsleutel" followed by
+"1. B  2. A ..."). Questions wait for the key only while their answer is
+unknown, so output stays in document order.
+
+Output rows use the bulk import format (text, choices, correct_index,
+category) plus the source "number" and "page"; "correct_indices" lists
+every correct choice of multiple-answer questions. A question whose answer
+was not found has no correct_index: the bulk import reports it as a row
+error, so fill those in before importing:
+
+    python pdf_extract.py PSPO1_v1.2.1.pdf -o pspo1.ndjson
+    ./scripts/seed_questions.py pspo1.ndjson --dedup
+
+Requires pdfplumber (pip install pdfplumber) unless every page is cached.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+CACHE_DIR = os.environ.get("EXTRACT_CACHE_DIR", ".extract_cache")
+MIN_TEXT = 10
+MAX_CHOICES = 6
+
+_SKIP = re.compile(r"^(?:PSPO1_v[\d.]+\.md\b|⬆|Table of Contents$|No\.\s+Questions$|Page \d+|\d+\s*/\s*\d+$)", re.IGNORECASE)
+_NUMBERED = re.compile(r"^(\d{1,4})[.)]?(?:\s+(\S.*))?$")
+_TRUE_FALSE = re.compile(r"^True or False\b", re.IGNORECASE)
+_LABELLED = re.compile(r"^([A-Fa-f])[.)]\s+(.*)$")
+_BULLET = re.compile(r"^[-•▪]\s+(.*)$")
+_ASKS = re.compile(r"(\?|\(choose [^)]*\)|choose (?:the best|all that apply)[^.]*[.)]?)\s*$", re.IGNORECASE)
+_ANSWER = re.compile(r"^(?:correct\s+answers?|answers?|solution|(?:juiste\s+)?antwoord(?:en)?|oplossing)\s*[:\-]\s*(.+)$"
+                     r"|^the\s+(?:correct\s+)?answers?\s+(?:is|are)\s*:?\s*(.+)$", re.IGNORECASE)
+_IS_CORRECT = re.compile(r"^\(?([A-F])\)?\s+(?:is|are)\s+correct\b", re.IGNORECASE)
+_LETTERS = re.compile(r"^\(?[A-F]\)?(?:\s*(?:,|/|&|\band\b|\ben\b)\s*\(?[A-F]\)?)*(?![A-Za-z])", re.IGNORECASE)
+_KEY_HEADING = re.compile(r"^(?:answer\s+key|answers|correct\s+answers|antwoordsleutel|antwoorden)\s*:?$", re.IGNORECASE)
+_KEY_ENTRY = re.compile(r"\b(\d{1,4})\s*[.):\-]?\s*([A-F](?:\s*,\s*[A-F])*)(?![A-Za-z])", re.IGNORECASE)
+
+
+def answer_indices(value: str, choices: Sequence[str]) -> List[int]:
+    """Choice indexes named by an answer ("B", "a, c", "True"); [] if it names none."""
+    value = value.strip()
+    by_text = [i for i, c in enumerate(choices) if c.strip().lower() == value.rstrip(".").lower()]
+    if by_text:
+        return by_text
+    match = _LETTERS.match(value)
+    if not match:
+        return []
+    indices = [ord(letter.upper()) - ord("A") for letter in re.findall(r"[A-F]", match.group(0), re.IGNORECASE)]
+    return [i for i in dict.fromkeys(indices) if i < len(choices)]
+
+
+# --- Page text (process pool + cache) ---
+
+def pdf_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def count_pages(path: str) -> int:
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_chunk(path: str, pages: Sequence[int]) -> List[Tuple[int, str]]:
+    """Text of the given 0-based pages; runs in a worker process."""
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return [(n, pdf.pages[n].extract_text() or "") for n in pages]
+
+
+class PageCache:
+    """Page texts of one PDF under <cache dir>/<sha256>/, one file per page."""
+
+    def __init__(self, root: str, digest: str):
+        self.dir = os.path.join(root, digest)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.dir, name)
+
+    def _write(self, name: str, data: str):
+        os.makedirs(self.dir, exist_ok=True)
+        tmp = self._path(f"{name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, self._path(name))
+
+    def page_count(self) -> Optional[int]:
+        try:
+            with open(self._path("meta.json"), encoding="utf-8") as f:
+                return json.load(f)["pages"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set_page_count(self, pages: int):
+        self._write("meta.json", json.dumps({"pages": pages}))
+
+    def get(self, page: int) -> Optional[str]:
+        try:
+            with open(self._path(f"{page:05d}.txt"), encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, page: int, text: str):
+        self._write(f"{page:05d}.txt", text)
+
+
+def iter_pages(path: str, workers: Optional[int] = None, cache_dir: Optional[str] = CACHE_DIR,
+               extract=extract_chunk, pages: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    """Yield (0-based page number, text) in page order.
+
+    Cached pages are read from disk; the rest are extracted in parallel and
+    yielded as soon as every earlier page is available.
+    """
+    cache = PageCache(cache_dir, pdf_hash(path)) if cache_dir else None
+    cached_total = cache.page_count() if cache else None
+    total = pages if pages is not None else cached_total
+    if total is None:
+        total = count_pages(path)
+    if cache and cached_total != total:
+        cache.set_page_count(total)
+
+    texts: Dict[int, str] = {}
+    missing = []
+    for n in range(total):
+        text = cache.get(n) if cache else None
+        if text is None:
+            missing.append(n)
+        else:
+            texts[n] = text
+
+    next_page = 0
+
+    def ready():
+        nonlocal next_page
+        while next_page in texts:
+            yield next_page, texts.pop(next_page)
+            next_page += 1
+
+    if not missing:
+        yield from ready()
+        return
+    workers = workers or os.cpu_count() or 1
+    size = max(1, -(-len(missing) // (workers * 4)))
+    chunks = [missing[i:i + size] for i in range(0, len(missing), size)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        futures = [pool.submit(extract, path, chunk) for chunk in chunks]
+        yield from ready()
+        for future in as_completed(futures):
+            for n, text in future.result():
+                if cache:
+                    cache.put(n, text)
+                texts[n] = text
+            yield from ready()
+
+
+# --- Question parser ---
+
+class QuestionParser:
+    """Single-pass state machine over the lines of a question bank.
+
+    States: "idle" (between questions), "question" (collecting question
+    text) and "choices" (collecting answer options). A numbered line or a
+    "True or False:" line starts a new question and completes the previous
+    one. Labelled (A. / a) / bullet) lines are choices; once the question
+    text ends in "?" or a "(choose ...)" hint, plain lines are choices too.
+    An answer line sets the correct choices of the current question; after
+    an answer-key heading the parser only collects "<number> <letter>"
+    entries into `key`.
+    """
+
+    def __init__(self, category: str = "PSPO1"):
+        self.category = category
+        self.state = "idle"
+        self.number: Optional[int] = None
+        self.page: Optional[int] = None
+        self.text: List[str] = []
+        self.choices: List[str] = []
+        self.labelled = False
+        self.correct: List[int] = []
+        # question number -> choice letters from an answer-key section
+        self.key: Dict[int, List[int]] = {}
+        self.in_key = False
+        self._pending_number: Optional[int] = None
+        self._counter = 0
+
+    def _start(self, number: Optional[int], text: str, page: Optional[int], choices=()) -> Optional[Dict]:
+        done = self._finish()
+        self._counter = number if number is not None else self._counter + 1
+        self.number, self.page = self._counter, page
+        self.text = [text] if text else []
+        self.choices = list(choices)
+        self.labelled = False
+        self.correct = []
+        self.state = "question"
+        return done
+
+    def _finish(self) -> Optional[Dict]:
+        text = " ".join(self.text).strip()
+        choices = [c.strip() for c in self.choices if c.strip()]
+        complete = self.state != "idle" and len(text) >= MIN_TEXT and len(choices) >= 2
+        correct = [i for i in self.correct if i < min(len(choices), MAX_CHOICES)]
+        self.state, self.text, self.choices, self.correct = "idle", [], [], []
+        if not complete:
+            return None
+        row = {"number": self.number, "page": self.page, "text": re.sub(r"\s+", " ", text),
+               "choices": choices[:MAX_CHOICES], "category": self.category}
+        set_correct(row, correct)
+        return row
+
+    def feed(self, line: str, page: Optional[int] = None) -> Optional[Dict]:
+        """Consume one line; returns the question it completed, if any."""
+        line = line.strip()
+        if not line or _SKIP.match(line):
+            return None
+        if self.in_key:
+            for number, letters in _KEY_ENTRY.findall(line):
+                self.key[int(number)] = [ord(c.upper()) - ord("A") for c in re.findall(r"[A-F]", letters, re.I)]
+            return None
+        if _KEY_HEADING.match(line):
+            self.in_key = True
+            return self._finish()
+
+        true_false = ["True", "False"] if _TRUE_FALSE.match(line) else []
+        if self._pending_number is not None:
+            number, self._pending_number = self._pending_number, None
+            return self._start(number, line, page, true_false)
+        if true_false:
+            return self._start(None, line, page, true_false)
+        # Question numbers only go up and are followed by a sentence; anything
+        # else is part of the text ("2 Sprints", "4 weeks")
+        match = _NUMBERED.match(line)
+        if match and int(match.group(1)) > self._counter and (match.group(2) or "A")[:1].isupper():
+            if match.group(2) is None:
+                self._pending_number = int(match.group(1))
+                return self._finish()
+            text = match.group(2)
+            return self._start(int(match.group(1)), text, page, ["True", "False"] if _TRUE_FALSE.match(text) else ())
+        if self.state == "idle":
+            return None
+
+        answer = _ANSWER.match(line)
+        if answer and self.choices:
+            self.correct = answer_indices(answer.group(1) or answer.group(2), self.choices)
+            self.state = "answered"
+            return None
+        answer = _IS_CORRECT.match(line)
+        if answer and self.choices:
+            self.correct = answer_indices(answer.group(1), self.choices)
+            self.state = "answered"
+            return None
+        if self.state == "answered":
+            return None  # explanation after the answer
+
+        match = _LABELLED.match(line) or _BULLET.match(line)
+        if match:
+            if not self.labelled:
+                self.choices = []  # labelled options replace guessed or True/False ones
+            self.choices.append(match.group(match.lastindex))
+            self.state, self.labelled = "choices", True
+        elif self.state == "question":
+            asked = self.text and _ASKS.search(self.text[-1])
+            if asked and self.choices != ["True", "False"]:
+                self.choices.append(line)
+                self.state = "choices"
+            else:
+                self.text.append(line)
+        elif self.labelled or line[:1].islower():
+            self.choices[-1] += " " + line  # a wrapped line continues the last option
+        else:
+            self.choices.append(line)
+        return None
+
+    def close(self) -> Optional[Dict]:
+        return self._finish()
+
+
+def set_correct(row: Dict, correct: Sequence[int]) -> Dict:
+    """Store the correct choices of a parsed question in the bulk import fields."""
+    correct = [i for i in correct if 0 <= i < len(row["choices"])]
+    if correct:
+        row["correct_index"] = correct[0]
+        if len(correct) > 1:
+            row["correct_indices"] = correct
+    return row
+
+
+def parse_pages(pages: Iterator[Tuple[int, str]], category: str = "PSPO1") -> Iterator[Dict]:
+    """Questions, in document order, from (page, text) pairs.
+
+    Questions are yielded as they complete, except that once one has no
+    answer yet, it and everything after it wait for the end of the
+    document, where the answer key (if any) fills them in.
+    """
+    parser = QuestionParser(category)
+    waiting: List[Dict] = []
+    for page, text in pages:
+        for line in text.splitlines():
+            question = parser.feed(line, page + 1)
+            if question is None:
+                continue
+            if waiting or "correct_index" not in question:
+                waiting.append(question)
+            else:
+                yield question
+    question = parser.close()
+    if question:
+        waiting.append(question)
+    for question in waiting:
+        if "correct_index" not in question:
+            set_correct(question, parser.key.get(question["number"], ()))
+        yield question
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Extract questions from a PDF question bank as NDJSON.")
+    parser.add_argument("pdf", nargs="?", default="PSPO1_v1.2.1.pdf")
+    parser.add_argument("-o", "--output", default="-", help="NDJSON output file (default: stdout)")
+    parser.add_argument("--category", default="PSPO1")
+    parser.add_argument("--workers", type=int, default=None, help="extraction processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the page cache")
+    args = parser.parse_args(argv)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    count = unanswered = 0
+    try:
+        pages = iter_pages(args.pdf, args.workers, None if args.no_cache else CACHE_DIR)
+        for question in parse_pages(pages, args.category):
+            out.write(json.dumps(question, ensure_ascii=False) + "\n")
+            out.flush()
+            count += 1
+            unanswered += "correct_index" not in question
+    except ImportError:
+        print("⚠️ pdfplumber is not installed (pip install pdfplumber)", file=sys.stderr)
+        return 2
+    except OSError as e:
+        print(f"Cannot read {args.pdf}: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Extracted {count} questions", file=sys.stderr)
+    if unanswered:
+        print(f"⚠️ {unanswered} questions have no correct answer in the PDF (no correct_index); "
+              "the bulk import rejects them until it is filled in", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,27 +3,24 @@ Personalized Learning Engine
 Analyzes user performance and provides adaptive recommendations
 """
 
-import numpy as np
-import pandas as pd
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from enum import Enum
+from collections import OrderedDict
 import logging
-from sqlalchemy import text
-# Database connection handled separately
+import threading
+import time
 
-logger = logging.getLogger(__name__)
+from ai_config import get_ai_config
+from learning_stats import LEARNER_STATS, LearnerAggregate, LearnerStats, Trend
 
+logger = logging.getLogger(__name__)
 
-def get_database_session():
-    """Get database session - imported locally to avoid circular imports"""
-    try:
-        from webapi import SessionLocal
-        return SessionLocal()
-    except ImportError:
-        # Return None if webapi is not available (testing, etc)
-        return None
+# Assumed seconds per question until the user has reported latencies
+DEFAULT_AVERAGE_TIME = 45.0
+# Upper bound on cached results (least recently used are dropped)
+CACHE_MAX_ENTRIES = 50_000
 
 
 class LearningStyle(Enum):
@@ -66,15 +63,18 @@ class LearningRecommendation:
     confidence: float
 
 class LearningAnalytics:
-    """Machine learning engine for personalized learning"""
+    """Machine learning engine for personalized learning
+
+    Reads the running aggregates in learning_stats.LEARNER_STATS, which are
+    updated as answers are graded, so analysis never scans answer history.
+    """
     
-    def __init__(self):
-        self.db = get_database_session()
+    def __init__(self, stats: LearnerStats = None):
+        self.stats = stats if stats is not None else LEARNER_STATS
     
     def analyze_user_performance(self, user_id: str, category: str = None) -> Dict[str, UserPerformance]:
         """Analyze user performance across categories"""
         try:
-            # Query user quiz history
             if category:
                 categories = [category]
             else:
@@ -95,88 +95,63 @@ class LearningAnalytics:
     
     def _get_user_categories(self, user_id: str) -> List[str]:
         """Get categories the user has attempted"""
-        try:
-            # This would need to be adapted based on your session storage
-            # For now, return default categories
-            return ["general", "PSPO1", "Verpleegkundig Rekenen"]
-        except Exception:
-            return ["general"]
+        return self.stats.categories(user_id)
     
     def _calculate_performance_metrics(self, user_id: str, category: str) -> Optional[UserPerformance]:
         """Calculate detailed performance metrics for a user in a category"""
         try:
-            # Simulate user performance data (in real implementation, this would come from database)
-            # You would query actual user sessions and answers
-            
-            # For demonstration, we'll create sample data
-            sample_data = self._generate_sample_performance(user_id, category)
-            
-            total_questions = sample_data.get("total_questions", 0)
-            if total_questions == 0:
+            aggregate = self.stats.get(user_id, category)
+            if aggregate is None or aggregate.total == 0:
                 return None
-            
-            correct_answers = sample_data.get("correct_answers", 0)
-            accuracy = correct_answers / total_questions if total_questions > 0 else 0
-            
-            # Calculate recent performance (last 10 questions)
-            recent_accuracy = sample_data.get("recent_accuracy", accuracy)
-            
-            # Estimate difficulty level based on performance
-            difficulty_level = self._estimate_difficulty_level(accuracy, recent_accuracy)
-            
-            # Calculate learning velocity (improvement rate)
-            learning_velocity = self._calculate_learning_velocity(sample_data.get("historical_scores", []))
-            
-            # Identify weak and strong topics
-            weak_topics, strong_topics = self._identify_topic_strengths(user_id, category)
-            
-            # Recommend difficulty adjustment
-            recommended_difficulty = self._recommend_difficulty(
-                accuracy, recent_accuracy, difficulty_level, learning_velocity
-            )
-            
-            # Calculate confidence score
-            confidence_score = self._calculate_confidence_score(
-                total_questions, accuracy, learning_velocity
-            )
-            
-            return UserPerformance(
-                user_id=user_id,
-                category=category,
-                total_questions=total_questions,
-                correct_answers=correct_answers,
-                average_time=sample_data.get("average_time", 45.0),
-                recent_accuracy=recent_accuracy,
-                difficulty_level=difficulty_level,
-                learning_velocity=learning_velocity,
-                weak_topics=weak_topics,
-                strong_topics=strong_topics,
-                recommended_difficulty=recommended_difficulty,
-                confidence_score=confidence_score
-            )
+            return self._performance_from(user_id, category, aggregate)
             
         except Exception as e:
             logger.error(f"Error calculating performance metrics: {e}")
             return None
     
-    def _generate_sample_performance(self, user_id: str, category: str) -> Dict[str, Any]:
-        """Generate sample performance data (replace with real database queries)"""
-        # This simulates user performance data
-        # In real implementation, query from user_sessions, user_answers tables
+    def _performance_from(self, user_id: str, category: str, aggregate: LearnerAggregate) -> UserPerformance:
+        """Derive UserPerformance from a running aggregate (constant time)"""
+        total_questions = aggregate.total
+        correct_answers = aggregate.correct
+        accuracy = aggregate.accuracy
         
-        import random
-        random.seed(hash(user_id + category) % 1000)  # Consistent "randomness" per user/category
+        # Recent performance (ring buffer of the last RECENT_WINDOW answers)
+        recent_accuracy = aggregate.recent_accuracy
         
-        total_questions = random.randint(20, 100)
-        accuracy_base = random.uniform(0.4, 0.9)
+        # Estimate difficulty level based on performance
+        difficulty_level = self._estimate_difficulty_level(accuracy, recent_accuracy)
         
-        return {
-            "total_questions": total_questions,
-            "correct_answers": int(total_questions * accuracy_base),
-            "recent_accuracy": accuracy_base + random.uniform(-0.1, 0.1),
-            "average_time": random.uniform(30, 60),
-            "historical_scores": [accuracy_base + random.uniform(-0.2, 0.2) for _ in range(10)]
-        }
+        # Learning velocity (improvement rate) from the online regression sums
+        learning_velocity = aggregate.velocity
+        
+        # Identify weak and strong topics
+        weak_topics, strong_topics = self._identify_topic_strengths(user_id, category)
+        
+        # Recommend difficulty adjustment
+        recommended_difficulty = self._recommend_difficulty(
+            accuracy, recent_accuracy, difficulty_level, learning_velocity
+        )
+        
+        # Calculate confidence score
+        confidence_score = self._calculate_confidence_score(
+            total_questions, accuracy, learning_velocity
+        )
+        
+        average_time = aggregate.average_time
+        return UserPerformance(
+            user_id=user_id,
+            category=category,
+            total_questions=total_questions,
+            correct_answers=correct_answers,
+            average_time=average_time if average_time is not None else DEFAULT_AVERAGE_TIME,
+            recent_accuracy=recent_accuracy,
+            difficulty_level=difficulty_level,
+            learning_velocity=learning_velocity,
+            weak_topics=weak_topics,
+            strong_topics=strong_topics,
+            recommended_difficulty=recommended_difficulty,
+            confidence_score=confidence_score
+        )
     
     def _estimate_difficulty_level(self, accuracy: float, recent_accuracy: float) -> int:
         """Estimate current difficulty level based on performance"""
@@ -194,17 +169,11 @@ class LearningAnalytics:
             return 1  # Beginner
     
     def _calculate_learning_velocity(self, historical_scores: List[float]) -> float:
-        """Calculate rate of learning improvement"""
-        if len(historical_scores) < 3:
-            return 0.0
-        
-        # Simple linear regression to find improvement trend
-        x = np.array(range(len(historical_scores)))
-        y = np.array(historical_scores)
-        
-        # Calculate slope (learning velocity)
-        slope = np.polyfit(x, y, 1)[0]
-        return float(slope)
+        """Calculate rate of learning improvement (least-squares slope per score)"""
+        trend = Trend()
+        for score in historical_scores:
+            trend.add(score)
+        return float(trend.slope())
     
     def _identify_topic_strengths(self, user_id: str, category: str) -> Tuple[List[str], List[str]]:
         """Identify weak and strong topics within a category"""
@@ -396,13 +365,65 @@ class PersonalizedRecommendationEngine:
             "estimated_time": int(cat_performance.average_time * 1.1)
         }
 
+class RecommendationCache:
+    """TTL cache of per-(user, category) results.
+
+    Each entry remembers the LearnerStats generation it was computed from,
+    so it is recomputed as soon as the user's aggregates change
+    meaningfully, not only when cache_ttl_seconds runs out. Honours
+    AIConfig.use_caching.
+    """
+    
+    def __init__(self, stats: LearnerStats = None, config=None, clock=time.monotonic,
+                 max_entries: int = CACHE_MAX_ENTRIES):
+        self.stats = stats if stats is not None else LEARNER_STATS
+        self.config = config or get_ai_config()
+        self._clock = clock
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, kind: str, user_id: str, category: Optional[str], compute, extra: tuple = ()):
+        if not self.config.use_caching:
+            return compute()
+        key = (kind, user_id, category, extra)
+        generation = self.stats.generation(user_id, category)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation and now - entry[1] < self.config.cache_ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._entries[key] = (generation, now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats_summary(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "enabled": self.config.use_caching, "ttl_seconds": self.config.cache_ttl_seconds}
+
 # Global instances
 personalized_engine = PersonalizedRecommendationEngine()
+recommendation_cache = RecommendationCache()
 
 def get_user_recommendations(user_id: str, category: str = None) -> List[Dict[str, Any]]:
     """Get personalized recommendations for a user"""
-    recommendations = personalized_engine.get_learning_recommendations(user_id, category)
-    return [asdict(rec) for rec in recommendations]
+    def compute():
+        recommendations = personalized_engine.get_learning_recommendations(user_id, category)
+        return [asdict(rec) for rec in recommendations]
+    return recommendation_cache.get("recommendations", user_id, category, compute)
 
 def get_adaptive_question_params(
     user_id: str,
@@ -410,6 +431,11 @@ def get_adaptive_question_params(
     session_performance: Dict[str, Any] = None
 ) -> Dict[str, Any]:
     """Get adaptive parameters for next question selection"""
-    return personalized_engine.get_next_question_recommendation(
-        user_id, category, session_performance
+    session_key = ()
+    if session_performance:
+        session_key = (session_performance.get("correct", 0), session_performance.get("total", 0))
+    return recommendation_cache.get(
+        "next-params", user_id, category,
+        lambda: personalized_engine.get_next_question_recommendation(user_id, category, session_performance),
+        session_key,
     )
\ No newline at end of file
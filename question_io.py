@@ -0,0 +1,341 @@
+"""
+Bulk question import and export.
+
+Import parses a batch of questions from a JSON array, NDJSON or CSV body,
+validates every row before anything is written, and inserts the valid
+rows with two batched executemany statements (questions, then choices)
+inside the caller's transaction.
+
+Export streams the bank from a server-side cursor as NDJSON, CSV (both in
+the import row format, so an export can be re-imported) or a compact
+length-prefixed binary format (see ``binary_record``).
+
+Row format (JSON/NDJSON):
+    {"text": str, "choices": [str, ...], "correct_index": int,
+     "correct_indices": [int, ...] (optional, multiple-answer questions),
+     "category": str (optional), "difficulty": int 1-5 (optional)}
+
+A question needs ``correct_index`` or ``correct_indices`` (a list in
+``correct_index`` means the same); every listed choice is stored as
+correct. Exports write both, ``correct_index`` being the first.
+
+CSV needs a header with at least ``text,choices,correct_index``;
+``choices`` and ``correct_indices`` are pipe-separated (``"3|4|5"``),
+``correct_indices``, ``category`` and ``difficulty`` columns are optional.
+"""
+
+import csv
+import io
+import json
+import struct
+from itertools import groupby
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert, select
+
+from models import CATEGORIES, GENERAL, Choice, Question
+
+MAX_BULK_ROWS = 50_000
+CSV_REQUIRED = ("text", "choices", "correct_index")
+# choices.text is String(500)
+MAX_CHOICE_LENGTH = Choice.__table__.c.text.type.length
+MAX_CHOICES = 26
+# The 1-5 scale of the learning engine (personalized_learning.py)
+MIN_DIFFICULTY, MAX_DIFFICULTY = 1, 5
+
+
+class BulkFormatError(ValueError):
+    """The body as a whole could not be parsed (as opposed to a bad row)."""
+
+
+def parse_body(body: bytes, content_type: str) -> Tuple[List[Optional[Dict]], List[Dict]]:
+    """Split a request body into raw rows.
+
+    Returns (rows, errors); a row that could not be decoded is None in
+    `rows` and has an entry in `errors`, so row numbers stay aligned.
+    """
+    media = (content_type or "application/json").split(";")[0].strip().lower()
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        raise BulkFormatError(f"Body must be UTF-8 encoded: {e}")
+    if media in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        rows, errors = [], []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as e:
+                errors.append({"row": len(rows), "error": f"Invalid JSON: {e}"})
+                rows.append(None)
+        return rows, errors
+    if media in ("text/csv", "application/csv"):
+        reader = csv.DictReader(io.StringIO(text))
+        rows = []
+        try:
+            missing = [c for c in CSV_REQUIRED if c not in (reader.fieldnames or [])]
+            if missing:
+                raise BulkFormatError(f"CSV must include headers: {', '.join(CSV_REQUIRED)}")
+            for row in reader:
+                row["choices"] = [c.strip() for c in (row.get("choices") or "").split("|") if c.strip()]
+                if "correct_indices" in row:
+                    row["correct_indices"] = [i.strip() for i in (row["correct_indices"] or "").split("|") if i.strip()]
+                rows.append(row)
+        except csv.Error as e:
+            raise BulkFormatError(f"Invalid CSV (line {reader.line_num}): {e}")
+        return rows, []
+    try:
+        data = json.loads(text)
+    except ValueError as e:
+        raise BulkFormatError(f"Invalid JSON: {e}")
+    if not isinstance(data, list):
+        raise BulkFormatError("Body must be a JSON array of questions")
+    return data, []
+
+
+def range_error(choices: Optional[List[str]] = None, difficulty: Optional[int] = None) -> Optional[str]:
+    """Why choices or difficulty do not fit the columns and the export format, or None.
+
+    Shared by the bulk import and the single-question create/update endpoints.
+    """
+    if choices is not None:
+        if len(choices) > MAX_CHOICES:
+            return f"At most {MAX_CHOICES} choices"
+        if any(len(c) > MAX_CHOICE_LENGTH for c in choices):
+            return f"Choices can be at most {MAX_CHOICE_LENGTH} characters"
+    if difficulty is not None and not MIN_DIFFICULTY <= difficulty <= MAX_DIFFICULTY:
+        return f"difficulty must be between {MIN_DIFFICULTY} and {MAX_DIFFICULTY}"
+    return None
+
+
+def validate_row(raw) -> Tuple[Optional[Dict], Optional[str]]:
+    """Apply the admin create rules to one row. Returns (row, None) or (None, error)."""
+    if not isinstance(raw, dict):
+        return None, "Row must be an object"
+    text = str(raw.get("text") or "").strip()
+    if not text:
+        return None, "Question text is required"
+    choices = raw.get("choices")
+    if not isinstance(choices, list) or len(choices) < 2:
+        return None, "Provide at least 2 choices"
+    choices = [str(c) for c in choices]
+    value, listed = raw.get("correct_index"), raw.get("correct_indices")
+    if isinstance(value, list):
+        value, listed = None, listed or value
+    if listed in (None, "", []):
+        if value in (None, ""):
+            return None, "correct_index is required"
+        listed = [value]
+    elif not isinstance(listed, list):
+        return None, "correct_indices must be a list"
+    try:
+        correct = sorted({int(i) for i in listed})
+        first = int(value) if value not in (None, "") else correct[0]
+    except (TypeError, ValueError):
+        return None, "Invalid correct_index"
+    if correct[0] < 0 or correct[-1] >= len(choices):
+        return None, "correct_index out of range"
+    if first not in correct:
+        return None, "correct_index must be one of correct_indices"
+    difficulty = raw.get("difficulty")
+    try:
+        difficulty = int(difficulty) if difficulty not in (None, "") else 1
+    except (TypeError, ValueError):
+        return None, "Invalid difficulty"
+    error = range_error(choices, difficulty)
+    if error:
+        return None, error
+    category = raw.get("category") or GENERAL
+    if category != GENERAL and category not in CATEGORIES:
+        return None, f"Unknown category: {category}"
+    return {
+        "text": text,
+        "choices": choices,
+        "correct_index": first,
+        "correct_indices": correct,
+        "category": category,
+        "difficulty": difficulty,
+    }, None
+
+
+def validate_rows(raw_rows: List) -> Tuple[List[Tuple[int, Dict]], List[Dict]]:
+    """Validate every row; returns ([(row number, row)], [errors])."""
+    valid, errors = [], []
+    for i, raw in enumerate(raw_rows):
+        if raw is None:
+            continue  # already reported by parse_body
+        row, error = validate_row(raw)
+        if error:
+            errors.append({"row": i, "error": error})
+        else:
+            valid.append((i, row))
+    return valid, errors
+
+
+def question_rows(rows: List[Dict]) -> List[Dict]:
+    # Same columns the admin API writes, explanation mirrored for the legacy readers
+    return [{
+        "text": r["text"],
+        "category": r["category"],
+        "explanation": None if r["category"] == GENERAL else r["category"],
+        "difficulty": r["difficulty"],
+    } for r in rows]
+
+
+def choice_rows(rows: List[Dict], question_ids: List[int]) -> List[Dict]:
+    out = []
+    for r, qid in zip(rows, question_ids):
+        correct = r.get("correct_indices") or [r["correct_index"]]
+        out.extend({"question_id": qid, "text": text, "is_correct": i in correct} for i, text in enumerate(r["choices"]))
+    return out
+
+
+def insert_statements():
+    """(questions insert returning ids in parameter order, choices insert)."""
+    questions = Question.__table__
+    return (
+        insert(questions).returning(questions.c.id, sort_by_parameter_order=True),
+        insert(Choice.__table__),
+    )
+
+
+# --- Export ---
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "bin": "application/octet-stream",
+}
+CSV_COLUMNS = ("id", "text", "choices", "correct_index", "correct_indices", "category", "difficulty")
+EXPORT_BATCH = 1000
+
+BINARY_MAGIC = b"QZBANK3\n"
+# id, difficulty, correct choices (bit i set = choice i is correct; MAX_CHOICES
+# fit), number of choices; id and difficulty are as wide as their Integer
+# columns, so any stored row fits
+_RECORD = struct.Struct("<IiIH")
+_LENGTH = struct.Struct("<I")
+
+
+def iter_export_rows(engine, category: Optional[str] = None, batch: int = EXPORT_BATCH) -> Iterator[Dict]:
+    """Yield questions in id order in the import row format (plus "id").
+
+    One query over questions LEFT JOIN choices, read with yield_per so the
+    driver streams it (a server-side cursor on Postgres) and grouped on the
+    fly: memory stays flat however large the bank is.
+    """
+    q, c = Question.__table__, Choice.__table__
+    stmt = (
+        select(q.c.id, q.c.text, q.c.category, q.c.difficulty, c.c.text, c.c.is_correct)
+        .select_from(q.outerjoin(c, c.c.question_id == q.c.id))
+        .order_by(q.c.id, c.c.id)
+    )
+    if category is not None:
+        stmt = stmt.where(q.c.category == category)
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=batch).execute(stmt)
+        for qid, group in groupby(result, key=lambda r: r[0]):
+            group = list(group)
+            first = group[0]
+            choice_rows = [r for r in group if r[4] is not None]
+            correct = [i for i, r in enumerate(choice_rows) if r[5]]
+            yield {
+                "id": qid,
+                "text": first[1],
+                "choices": [r[4] for r in choice_rows],
+                "correct_index": correct[0] if correct else None,
+                "correct_indices": correct,
+                "category": first[2],
+                "difficulty": first[3],
+            }
+
+
+def ndjson_line(row: Dict) -> bytes:
+    return json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def csv_chunk(rows: List[Dict], header: bool = False) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    if header:
+        writer.writerow(CSV_COLUMNS)
+    for row in rows:
+        writer.writerow([row["id"], row["text"], "|".join(row["choices"]),
+                         "" if row["correct_index"] is None else row["correct_index"],
+                         "|".join(str(i) for i in row["correct_indices"]),
+                         row["category"] or "", row["difficulty"] if row["difficulty"] is not None else ""])
+    return buf.getvalue().encode("utf-8")
+
+
+def _string(value: Optional[str]) -> bytes:
+    data = (value or "").encode("utf-8")
+    return _LENGTH.pack(len(data)) + data
+
+
+def binary_record(row: Dict) -> bytes:
+    """One question: fixed header, then text, category and choices as u32-length-prefixed UTF-8."""
+    mask = sum(1 << i for i in row["correct_indices"])
+    difficulty = row["difficulty"] if row["difficulty"] is not None else 0
+    return (_RECORD.pack(row["id"], difficulty, mask, len(row["choices"]))
+            + _string(row["text"]) + _string(row["category"])
+            + b"".join(_string(c) for c in row["choices"]))
+
+
+def _binary_records(rows: List[Dict]) -> Iterator[bytes]:
+    for row in rows:
+        try:
+            yield binary_record(row)
+        except struct.error as e:
+            # Rows written before range validation; skip rather than end the stream mid-export
+            print(f"⚠️  Question {row['id']} left out of binary export: {e}")
+
+
+def read_binary(f: BinaryIO) -> Iterator[Dict]:
+    """Decode a stream written by the bin export."""
+    if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+        raise BulkFormatError("Not a question bank export")
+
+    def string() -> str:
+        (length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+        return f.read(length).decode("utf-8")
+
+    while True:
+        head = f.read(_RECORD.size)
+        if not head:
+            return
+        qid, difficulty, mask, n_choices = _RECORD.unpack(head)
+        text, category = string(), string()
+        correct = [i for i in range(n_choices) if mask >> i & 1]
+        yield {
+            "id": qid,
+            "text": text,
+            "choices": [string() for _ in range(n_choices)],
+            "correct_index": correct[0] if correct else None,
+            "correct_indices": correct,
+            "category": category or None,
+            "difficulty": difficulty,
+        }
+
+
+def export_chunks(rows: Iterator[Dict], fmt: str, batch: int = EXPORT_BATCH) -> Iterator[bytes]:
+    """Encode rows as `fmt`, yielding one chunk per `batch` questions."""
+    if fmt == "bin":
+        yield BINARY_MAGIC
+    chunk: List[Dict] = []
+    first = True
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= batch:
+            yield _encode_chunk(chunk, fmt, first)
+            chunk, first = [], False
+    if chunk or (first and fmt == "csv"):
+        yield _encode_chunk(chunk, fmt, first)
+
+
+def _encode_chunk(rows: List[Dict], fmt: str, first: bool) -> bytes:
+    if fmt == "csv":
+        return csv_chunk(rows, header=first)
+    if fmt == "bin":
+        return b"".join(_binary_records(rows))
+    return b"".join(ndjson_line(r) for r in rows)
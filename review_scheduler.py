@@ -0,0 +1,142 @@
+"""
+Spaced-repetition review scheduling (SM-2).
+
+Every answer of a known user updates the review state of that (user,
+question) pair in ``review_items``: ease factor, interval, repetition and
+lapse counts, and the moment it is next due. The updates run in the answer
+log's writer thread, in the same transaction as the batch of answers that
+caused them (see AnswerLog.listeners), so answering never waits on them.
+
+A correct answer grades the recall 4 (5 when answered within
+REVIEW_FAST_MS), a wrong one 1. Recalled items are due again after 1 day,
+then 6, then interval x ease; a missed item is relearned after
+REVIEW_RELEARN_MINUTES and its ease drops.
+
+The (user_id, category, due_at) index is the due-date index:
+``/api/start?mode=review`` reads the N most overdue questions with one
+index range scan, without touching the user's answer history.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import bindparam, select, tuple_, update
+
+from models import ReviewItem
+
+REVIEW_FAST_MS = int(os.environ.get("REVIEW_FAST_MS", "8000"))
+REVIEW_RELEARN_MINUTES = float(os.environ.get("REVIEW_RELEARN_MINUTES", "10"))
+REVIEW_SESSION_SIZE = int(os.environ.get("REVIEW_SESSION_SIZE", "20"))
+INITIAL_EASE = 250
+MIN_EASE = 130
+MAX_INTERVAL_DAYS = 365.0
+
+review_items = ReviewItem.__table__
+
+
+class ReviewState(NamedTuple):
+    due_at: datetime
+    interval_days: float
+    ease: int  # hundredths
+    repetitions: int
+    lapses: int
+
+
+def grade(correct: bool, latency_ms: Optional[int] = None) -> int:
+    """SM-2 recall quality (0-5) of a multiple-choice answer."""
+    if not correct:
+        return 1
+    return 5 if latency_ms is not None and latency_ms <= REVIEW_FAST_MS else 4
+
+
+def schedule(state: Optional[ReviewState], quality: int, answered_at: datetime) -> ReviewState:
+    """The state after one review with the given quality; `state` None for a first answer."""
+    interval, ease, repetitions, lapses = (0.0, INITIAL_EASE, 0, 0) if state is None else state[1:]
+    ease = max(MIN_EASE, round(ease + 100 * (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))))
+    if quality < 3:
+        return ReviewState(answered_at + timedelta(minutes=REVIEW_RELEARN_MINUTES), 0.0, ease, 0, lapses + 1)
+    if repetitions == 0:
+        interval = 1.0
+    elif repetitions == 1:
+        interval = 6.0
+    else:
+        interval = min(MAX_INTERVAL_DAYS, interval * ease / 100)
+    return ReviewState(answered_at + timedelta(days=interval), interval, ease, repetitions + 1, lapses)
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything is stored in UTC
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def apply_answers(conn, rows: Iterable[Dict]) -> int:
+    """Fold a batch of answer rows (answer_log format) into review_items; returns pairs updated.
+
+    One SELECT for the existing states of the batch, then one executemany
+    for new pairs and one for changed ones.
+    """
+    rows = [r for r in rows if r.get("user_id") is not None]
+    if not rows:
+        return 0
+    keys = list({(r["user_id"], r["question_id"]) for r in rows})
+    states: Dict[tuple, ReviewState] = {}
+    for start in range(0, len(keys), 500):
+        chunk = keys[start:start + 500]
+        for row in conn.execute(select(review_items).where(
+                tuple_(review_items.c.user_id, review_items.c.question_id).in_(chunk))):
+            states[(row.user_id, row.question_id)] = ReviewState(
+                _utc(row.due_at), row.interval_days, row.ease, row.repetitions, row.lapses)
+    existing = set(states)
+
+    categories = {}
+    for r in rows:
+        key = (r["user_id"], r["question_id"])
+        states[key] = schedule(states.get(key), grade(r["correct"], r.get("latency_ms")), _utc(r["answered_at"]))
+        categories[key] = r["category"]
+
+    def params(key):
+        s = states[key]
+        return {"b_user_id": key[0], "b_question_id": key[1], "category": categories[key], "due_at": s.due_at,
+                "interval_days": s.interval_days, "ease": s.ease, "repetitions": s.repetitions, "lapses": s.lapses}
+
+    new = [params(k) for k in categories if k not in existing]
+    changed = [params(k) for k in categories if k in existing]
+    if new:
+        conn.execute(review_items.insert(), [
+            {"user_id": p.pop("b_user_id"), "question_id": p.pop("b_question_id"), **p} for p in new])
+    if changed:
+        conn.execute(
+            update(review_items)
+            .where(review_items.c.user_id == bindparam("b_user_id"),
+                   review_items.c.question_id == bindparam("b_question_id")),
+            changed,
+        )
+    return len(categories)
+
+
+def due_query(user_id: str, category: str, limit: int, now: Optional[datetime] = None):
+    """Question ids of the user's due reviews in `category`, most overdue first (an index range scan)."""
+    now = now or datetime.now(timezone.utc)
+    return (
+        select(review_items.c.question_id)
+        .where(review_items.c.user_id == user_id, review_items.c.category == category, review_items.c.due_at <= now)
+        .order_by(review_items.c.due_at)
+        .limit(limit)
+    )
+
+
+def next_due_query(user_id: str, category: str):
+    """When the user's next review in `category` falls due (None without any)."""
+    return (
+        select(review_items.c.due_at)
+        .where(review_items.c.user_id == user_id, review_items.c.category == category)
+        .order_by(review_items.c.due_at)
+        .limit(1)
+    )
+
+
+def due_ids(engine, user_id: str, category: str, limit: int = REVIEW_SESSION_SIZE,
+            now: Optional[datetime] = None) -> List[int]:
+    with engine.connect() as conn:
+        return list(conn.execute(due_query(user_id, category, limit, now)).scalars())
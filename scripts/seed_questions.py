@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Seed questions through the admin bulk API, concurrently and resumably.
+
+Reads a JSON array, NDJSON (.ndjson/.jsonl) or CSV file (same formats as
+POST /api/admin/questions/bulk), splits it into batches and uploads a
+bounded number of batches at a time over one pooled HTTP session.
+
+Each finished batch is recorded in a checkpoint file next to the input;
+re-running the same command after an interruption or failed batches
+only uploads what is missing. Rows the server rejects are reported and
+do not stop the run.
+
+Usage:
+  BASE_URL=http://localhost:8000 ./scripts/seed_questions.py data/questions.sample.json
+  ./scripts/seed_questions.py bank.csv --batch-size 1000 --concurrency 8
+  ./scripts/seed_questions.py bank.csv --restart     # ignore an existing checkpoint
+  ./scripts/seed_questions.py bank.csv --dedup       # skip near-duplicates of the bank
+
+If BASE_URL is not provided, defaults to http://localhost:8000.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:8000").rstrip("/")
+BULK_URL = f"{BASE_URL}/api/admin/questions/bulk"
+
+
+def read_rows(path: str):
+    """Load the input as a list of row dicts in the bulk import format."""
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            row["choices"] = [c.strip() for c in (row.get("choices") or "").split("|") if c.strip()]
+        return rows
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".ndjson", ".jsonl")):
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError("Input must be a JSON array of questions")
+    return data
+
+
+class Checkpoint:
+    """Set of uploaded batch numbers, tied to the input's content and batch size."""
+
+    def __init__(self, path: str, fingerprint: str, restart: bool = False):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.done = set()
+        self._lock = threading.Lock()
+        if not restart and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("fingerprint") == fingerprint:
+                self.done = set(state.get("done", []))
+
+    def mark(self, batch_no: int):
+        with self._lock:
+            self.done.add(batch_no)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"fingerprint": self.fingerprint, "done": sorted(self.done)}, f)
+            os.replace(tmp, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def make_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def upload(session: requests.Session, rows, timeout: float, dedup: bool = False):
+    body = "\n".join(json.dumps(r, ensure_ascii=False) for r in rows).encode("utf-8")
+    r = session.post(BULK_URL, data=body, params={"dedup": "true"} if dedup else None,
+                     headers={"Content-Type": "application/x-ndjson"}, timeout=timeout)
+    r.raise_for_status()
+    return r.json()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="questions file (.json, .ndjson/.jsonl or .csv)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=4, help="batches in flight at once")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <path>.checkpoint.json)")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--dedup", action="store_true", help="let the server skip near-duplicate questions")
+    args = parser.parse_args(argv)
+
+    try:
+        rows = read_rows(args.path)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read {args.path}: {e}")
+        return 2
+    with open(args.path, "rb") as f:
+        fingerprint = f"{hashlib.sha256(f.read()).hexdigest()}:{args.batch_size}"
+    checkpoint = Checkpoint(args.checkpoint or f"{args.path}.checkpoint.json", fingerprint, args.restart)
+
+    batches = [(n, start) for n, start in enumerate(range(0, len(rows), args.batch_size)) if n not in checkpoint.done]
+    if checkpoint.done:
+        print(f"Resuming: {len(checkpoint.done)} batches already uploaded")
+
+    inserted = rejected = failed = 0
+    started = time.perf_counter()
+    session = make_session(args.concurrency)
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = {
+            pool.submit(upload, session, rows[start:start + args.batch_size], args.timeout, args.dedup): (n, start)
+            for n, start in batches
+        }
+        for future in as_completed(futures):
+            n, start = futures[future]
+            try:
+                result = future.result()
+            except requests.RequestException as e:
+                failed += 1
+                print(f"Batch {n + 1} (rows {start + 1}-{start + args.batch_size}) FAILED: {e}")
+                continue
+            checkpoint.mark(n)
+            inserted += result["inserted"]
+            rejected += len(result["errors"])
+            for err in result["errors"]:
+                print(f"Row {start + err['row'] + 1}: {err['error']}")
+            elapsed = time.perf_counter() - started
+            print(f"Batch {n + 1}: +{result['inserted']} ({inserted / elapsed:.0f} questions/s)")
+
+    elapsed = time.perf_counter() - started
+    rate = inserted / elapsed if elapsed > 0 else 0.0
+    print(f"Done. Added {inserted} questions in {elapsed:.2f}s ({rate:.0f} questions/s), "
+          f"{rejected} rejected, {failed} batches failed.")
+    if failed:
+        print("Re-run the same command to retry the failed batches.")
+        return 1
+    checkpoint.clear()
+    return 0 if rejected == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
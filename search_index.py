@@ -0,0 +1,143 @@
+"""
+Full-text search index over question and choice texts.
+
+SQLite uses an FTS5 table (``questions_fts``, rowid = question id) with
+the unicode61 tokenizer, diacritics folded and no stemming: the only
+stemmer FTS5 ships is the English Porter one, which mangles Dutch words,
+so SQLite matches word prefixes only ("toedien" finds "toedienen" but
+"dosis" does not find "doses"). Postgres uses ``question_search`` with
+a weighted ``tsvector`` built from both the Dutch and English
+configurations and a GIN index. Question text weighs more than choice
+text in the ranking.
+
+The index is kept in step by the admin endpoints: every create, update,
+bulk import and delete runs the statements from ``upsert_statements`` /
+``delete_statements`` in its own transaction. Rows written around the
+API (raw SQL seed scripts) are picked up by ``python search_index.py``,
+which rebuilds the index.
+
+Usage:
+    python search_index.py      # rebuild the index for DATABASE_URL
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+
+SQLITE_TABLE = "questions_fts"
+PG_TABLE = "question_search"
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_MAX_TOKENS = 16
+
+# Postgres document: question text (A/B) outranks choice text (C/D), each in both languages
+_PG_DOCUMENT = (
+    "setweight(to_tsvector('dutch', :text), 'A') || setweight(to_tsvector('english', :text), 'B') || "
+    "setweight(to_tsvector('dutch', :choices), 'C') || setweight(to_tsvector('english', :choices), 'D')"
+)
+
+
+def tokens(query: str) -> List[str]:
+    """Words of a user query; operators and punctuation are dropped."""
+    return _TOKEN.findall(query or "")[:_MAX_TOKENS]
+
+
+def create(conn) -> None:
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {PG_TABLE} (
+                question_id INTEGER PRIMARY KEY REFERENCES questions(id) ON DELETE CASCADE,
+                document tsvector NOT NULL
+            )"""))
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{PG_TABLE}_document ON {PG_TABLE} USING GIN (document)"))
+    else:
+        conn.execute(text(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_TABLE}
+            USING fts5(text, choices, tokenize='unicode61 remove_diacritics 2')"""))
+
+
+def rebuild(conn) -> None:
+    """Re-index every question in one statement."""
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(f"TRUNCATE {PG_TABLE}"))
+        conn.execute(text(f"""
+            INSERT INTO {PG_TABLE} (question_id, document)
+            SELECT d.id, {_PG_DOCUMENT.replace(':text', 'd.text').replace(':choices', 'd.choices')}
+            FROM (
+                SELECT q.id, q.text, coalesce(string_agg(c.text, ' ' ORDER BY c.id), '') AS choices
+                FROM questions q LEFT JOIN choices c ON c.question_id = q.id
+                GROUP BY q.id, q.text
+            ) d"""))
+    else:
+        conn.execute(text(f"DELETE FROM {SQLITE_TABLE}"))
+        conn.execute(text(f"""
+            INSERT INTO {SQLITE_TABLE} (rowid, text, choices)
+            SELECT q.id, q.text, coalesce(group_concat(c.text, ' '), '')
+            FROM questions q LEFT JOIN choices c ON c.question_id = q.id
+            GROUP BY q.id"""))
+
+
+def upsert_statements(dialect: str, rows: Sequence[Tuple[int, str, Sequence[str]]]):
+    """Statements (with executemany params) that (re)index the given (id, text, choices) rows."""
+    params = [{"id": qid, "text": body, "choices": " ".join(choices)} for qid, body, choices in rows]
+    if not params:
+        return []
+    if dialect == "postgresql":
+        return [(text(f"""
+            INSERT INTO {PG_TABLE} (question_id, document) VALUES (:id, {_PG_DOCUMENT})
+            ON CONFLICT (question_id) DO UPDATE SET document = EXCLUDED.document"""), params)]
+    return [
+        (text(f"DELETE FROM {SQLITE_TABLE} WHERE rowid = :id"), [{"id": p["id"]} for p in params]),
+        (text(f"INSERT INTO {SQLITE_TABLE} (rowid, text, choices) VALUES (:id, :text, :choices)"), params),
+    ]
+
+
+def delete_statements(dialect: str, qid: int):
+    table, key = (PG_TABLE, "question_id") if dialect == "postgresql" else (SQLITE_TABLE, "rowid")
+    return [(text(f"DELETE FROM {table} WHERE {key} = :id"), {"id": qid})]
+
+
+def search_statement(dialect: str, query: str, category: Optional[str], limit: int, offset: int):
+    """(statement, params) returning (id, rank, snippet) best match first, or None for an empty query."""
+    words = tokens(query)
+    if not words:
+        return None
+    params: Dict = {"limit": limit, "offset": offset}
+    where = " AND q.category = :category" if category is not None else ""
+    if category is not None:
+        params["category"] = category
+    if dialect == "postgresql":
+        # Every word must match, as a prefix, after stemming in either language
+        params["q"] = " & ".join(f"{w}:*" for w in words)
+        return text(f"""
+            WITH query AS (SELECT to_tsquery('dutch', :q) || to_tsquery('english', :q) AS tsq)
+            SELECT q.id, ts_rank_cd(s.document, query.tsq) AS rank,
+                   ts_headline('dutch', q.text, query.tsq, 'StartSel=<mark>, StopSel=</mark>') AS snippet
+            FROM {PG_TABLE} s JOIN questions q ON q.id = s.question_id, query
+            WHERE s.document @@ query.tsq{where}
+            ORDER BY rank DESC, q.id LIMIT :limit OFFSET :offset"""), params
+    params["q"] = " AND ".join('"{}"*'.format(w.replace('"', '')) for w in words)
+    return text(f"""
+        SELECT q.id, -bm25({SQLITE_TABLE}, 4.0, 1.0) AS rank,
+               snippet({SQLITE_TABLE}, -1, '<mark>', '</mark>', '…', 16) AS snippet
+        FROM {SQLITE_TABLE} JOIN questions q ON q.id = {SQLITE_TABLE}.rowid
+        WHERE {SQLITE_TABLE} MATCH :q{where}
+        ORDER BY rank DESC, q.id LIMIT :limit OFFSET :offset"""), params
+
+
+def matching_choices(query: str, choices: Sequence[str]) -> List[int]:
+    """Indexes of the choices containing a word that starts with one of the query words."""
+    words = [w.lower() for w in tokens(query)]
+    return [
+        i for i, choice in enumerate(choices)
+        if any(t.lower().startswith(w) for t in _TOKEN.findall(choice) for w in words)
+    ]
+
+
+if __name__ == "__main__":
+    from db import engine
+
+    with engine.begin() as conn:
+        create(conn)
+        rebuild(conn)
+    print("Search index rebuilt")
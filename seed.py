@@ -1,7 +1,8 @@
-from db import Base, engine, SessionLocal
+from db import engine, SessionLocal
 from models import Question, Choice
+from migrations import upgrade
 
-Base.metadata.create_all(engine)
+upgrade(engine)
 
 def ensure_seed():
     s = SessionLocal()
@@ -0,0 +1,472 @@
+"""
+Quiz session storage backends.
+
+A session is a compact question-id permutation plus index and score. The
+store is chosen with SESSION_BACKEND so several uvicorn workers (or several
+quiz-app replicas behind Traefik) can share sessions:
+
+- memory: process-local dict (default, single worker only)
+- sql:    a quiz_sessions table in DATABASE_URL (or SESSION_DATABASE_URL)
+- redis:  any Redis-protocol server at SESSION_REDIS_URL
+- token:  no server state at all; the session id is a signed token
+          (see session_tokens.py)
+
+Every backend implements advance() as an atomic compare-and-set on the index,
+so a double-submitted answer can never be scored twice. Idle sessions expire
+after SESSION_TTL_SECONDS; the memory backend is also capped at
+SESSION_MAX_COUNT entries with least-recently-used eviction.
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Optional, Sequence
+from uuid import uuid4
+
+from sqlalchemy import Column, Float, Integer, LargeBinary, MetaData, String, Table, Text, create_engine, func, select, update
+
+SESSION_TTL_SECONDS = int(os.environ.get("SESSION_TTL_SECONDS", "7200"))
+SESSION_MAX_COUNT = int(os.environ.get("SESSION_MAX_COUNT", "50000"))
+# Rough per-entry cost of a memory session beyond its order array
+# (dataclass, sid string, dict slot)
+_SESSION_OVERHEAD_BYTES = 400
+
+
+@dataclass
+class QuizSession:
+    """State of one quiz attempt; `order` holds question ids, usually as array('I')."""
+    category: Optional[str]
+    order: Sequence[int]
+    index: int = 0
+    score: int = 0
+    # Set by the store; token sessions get a new id after every answer
+    sid: Optional[str] = None
+    # Learner the answers are attributed to (not kept by token sessions)
+    user_id: Optional[str] = None
+    # "adaptive": `order` grows by one picked question per answer, up to `length`
+    mode: Optional[str] = None
+    length: Optional[int] = None
+
+    @property
+    def total(self) -> int:
+        return self.length if self.length is not None else len(self.order)
+
+
+def pack_order(order: array) -> bytes:
+    """Serialize an id permutation as little-endian uint32s."""
+    if sys.byteorder == "big":
+        order = array("I", order)
+        order.byteswap()
+    return order.tobytes()
+
+
+def unpack_order(data: bytes) -> array:
+    order = array("I")
+    order.frombytes(data or b"")
+    if sys.byteorder == "big":
+        order.byteswap()
+    return order
+
+
+_META_FIELDS = ("user_id", "mode", "length")
+
+
+def _pack_meta(session: QuizSession) -> str:
+    meta = {"category": session.category}
+    for name in _META_FIELDS:
+        if getattr(session, name) is not None:
+            meta[name] = getattr(session, name)
+    return json.dumps(meta)
+
+
+def _unpack_meta(data) -> Dict:
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return json.loads(data or "{}")
+
+
+def _unpack_session(meta_data, **fields) -> QuizSession:
+    meta = _unpack_meta(meta_data)
+    return QuizSession(category=meta.get("category"), **{name: meta.get(name) for name in _META_FIELDS}, **fields)
+
+
+class SessionStore:
+    """Interface shared by all backends."""
+
+    # Whether create()/advance() accept an explicit question order (adaptive sessions)
+    explicit_orders = True
+
+    def new_order(self, bank, count: Optional[int] = None) -> Sequence[int]:
+        """Question order for a new session: the whole bank shuffled, or `count` sampled ids."""
+        if count is not None:
+            return bank.sample(count)
+        order = array("I", bank.ids)
+        random.shuffle(order)
+        return order
+
+    def create(self, session: QuizSession) -> str:
+        """Persist a new session and return its id."""
+        raise NotImplementedError
+
+    def get(self, sid: str) -> Optional[QuizSession]:
+        raise NotImplementedError
+
+    def advance(self, sid: str, from_index: int, to_index: int, correct: bool,
+                order: Optional[Sequence[int]] = None) -> Optional[QuizSession]:
+        """Move the session from `from_index` to `to_index`, adding a point if `correct`.
+
+        With `order`, the session's question order is replaced in the same
+        step (adaptive sessions append their next pick). Returns the updated
+        session, or None if the session is gone or its index no longer equals
+        `from_index` (the answer was already recorded).
+        """
+        raise NotImplementedError
+
+    def delete(self, sid: str) -> None:
+        raise NotImplementedError
+
+    def reap(self) -> int:
+        """Remove expired sessions; returns how many were dropped."""
+        return 0
+
+    def stats(self) -> Dict:
+        """Gauges for /api/admin/stats."""
+        return {"backend": type(self).__name__}
+
+
+class MemorySessionStore(SessionStore):
+    """Process-local sessions in LRU order (least recently used first)."""
+
+    def __init__(self, ttl_seconds: int = SESSION_TTL_SECONDS, max_sessions: int = SESSION_MAX_COUNT,
+                 clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._lock = threading.Lock()
+        # sid -> (session, last access); order of insertion == order of last access
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self.evicted = 0
+        self.expired = 0
+
+    @staticmethod
+    def _size(s: QuizSession) -> int:
+        return sys.getsizeof(s.order) + _SESSION_OVERHEAD_BYTES
+
+    def _drop(self, sid: str) -> None:
+        s, _ = self._sessions.pop(sid)
+        self._bytes -= self._size(s)
+
+    def _touch(self, sid: str, now: float) -> Optional[QuizSession]:
+        """Return the live session and mark it used, or expire it. Caller holds the lock."""
+        entry = self._sessions.get(sid)
+        if entry is None:
+            return None
+        s, last_access = entry
+        if now - last_access > self.ttl_seconds:
+            self._drop(sid)
+            self.expired += 1
+            return None
+        self._sessions[sid] = (s, now)
+        self._sessions.move_to_end(sid)
+        return s
+
+    def create(self, session):
+        sid = str(uuid4())
+        session = replace(session, sid=sid)
+        with self._lock:
+            self._sessions[sid] = (session, self._clock())
+            self._bytes += self._size(session)
+            while len(self._sessions) > self.max_sessions:
+                self._drop(next(iter(self._sessions)))
+                self.evicted += 1
+        return sid
+
+    def get(self, sid):
+        with self._lock:
+            s = self._touch(sid, self._clock())
+            # Hand out a copy so callers never observe half-applied updates
+            return replace(s) if s is not None else None
+
+    def advance(self, sid, from_index, to_index, correct, order=None):
+        with self._lock:
+            s = self._touch(sid, self._clock())
+            if s is None or s.index != from_index:
+                return None
+            s.index = to_index
+            if correct:
+                s.score += 1
+            if order is not None:
+                self._bytes += sys.getsizeof(order) - sys.getsizeof(s.order)
+                s.order = order
+            return replace(s)
+
+    def delete(self, sid):
+        with self._lock:
+            if sid in self._sessions:
+                self._drop(sid)
+
+    def reap(self):
+        cutoff = self._clock() - self.ttl_seconds
+        dropped = 0
+        with self._lock:
+            # Oldest access first, so stop at the first live entry
+            while self._sessions:
+                sid, (_, last_access) = next(iter(self._sessions.items()))
+                if last_access >= cutoff:
+                    break
+                self._drop(sid)
+                dropped += 1
+            self.expired += dropped
+        return dropped
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "memory",
+                "live": len(self._sessions),
+                "evicted": self.evicted,
+                "expired": self.expired,
+                "approx_bytes": self._bytes,
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+_metadata = MetaData()
+quiz_sessions = Table(
+    "quiz_sessions", _metadata,
+    Column("sid", String(64), primary_key=True),
+    Column("meta", Text, nullable=False),
+    Column("question_order", LargeBinary, nullable=False),
+    Column("idx", Integer, nullable=False, default=0),
+    Column("score", Integer, nullable=False, default=0),
+    Column("last_access", Float, nullable=False, index=True),
+)
+
+
+class SQLSessionStore(SessionStore):
+    """Sessions in a SQL table (SQLite or Postgres); idx/score updated in one UPDATE."""
+
+    def __init__(self, engine, ttl_seconds: int = SESSION_TTL_SECONDS, clock=time.time):
+        self.engine = engine
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self.expired = 0
+        # Only this table: SESSION_DATABASE_URL may point at a database of its own
+        quiz_sessions.create(engine, checkfirst=True)
+
+    def _row_to_session(self, row) -> QuizSession:
+        return _unpack_session(row.meta, order=unpack_order(row.question_order),
+                               index=row.idx, score=row.score, sid=row.sid)
+
+    def create(self, session):
+        sid = str(uuid4())
+        with self.engine.begin() as conn:
+            conn.execute(quiz_sessions.insert().values(
+                sid=sid, meta=_pack_meta(session), question_order=pack_order(session.order),
+                idx=session.index, score=session.score, last_access=self._clock(),
+            ))
+        return sid
+
+    def get(self, sid):
+        with self.engine.connect() as conn:
+            row = conn.execute(select(quiz_sessions).where(
+                quiz_sessions.c.sid == sid,
+                quiz_sessions.c.last_access >= self._clock() - self.ttl_seconds,
+            )).first()
+        return self._row_to_session(row) if row is not None else None
+
+    def advance(self, sid, from_index, to_index, correct, order=None):
+        now = self._clock()
+        values = {"idx": to_index, "score": quiz_sessions.c.score + (1 if correct else 0), "last_access": now}
+        if order is not None:
+            # Safe without a read lock: the row only changes if idx still equals from_index
+            values["question_order"] = pack_order(order)
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                update(quiz_sessions)
+                .where(quiz_sessions.c.sid == sid, quiz_sessions.c.idx == from_index,
+                       quiz_sessions.c.last_access >= now - self.ttl_seconds)
+                .values(**values)
+            )
+            if result.rowcount != 1:
+                return None
+            row = conn.execute(select(quiz_sessions).where(quiz_sessions.c.sid == sid)).first()
+        return self._row_to_session(row)
+
+    def delete(self, sid):
+        with self.engine.begin() as conn:
+            conn.execute(quiz_sessions.delete().where(quiz_sessions.c.sid == sid))
+
+    def reap(self):
+        with self.engine.begin() as conn:
+            result = conn.execute(quiz_sessions.delete().where(
+                quiz_sessions.c.last_access < self._clock() - self.ttl_seconds))
+        self.expired += result.rowcount
+        return result.rowcount
+
+    def stats(self):
+        with self.engine.connect() as conn:
+            live, approx_bytes = conn.execute(select(
+                func.count(), func.coalesce(func.sum(func.length(quiz_sessions.c.question_order)), 0)
+            )).one()
+        return {"backend": "sql", "live": live, "expired": self.expired,
+                "approx_bytes": int(approx_bytes), "ttl_seconds": self.ttl_seconds}
+
+
+class RedisSessionStore(SessionStore):
+    """Sessions as Redis hashes.
+
+    Only plain hash, sorted-set and WATCH/MULTI/EXEC commands are used (no
+    Lua), so a lightweight Redis-protocol stand-in can serve it as well as
+    Redis itself. Expiry is left to Redis via EXPIRE, refreshed on every
+    answer. A sorted set (``<prefix>live``) scores each session id by the
+    time it expires, so stats() can count live sessions without a SCAN.
+    """
+
+    # Sessions whose size is measured for stats()
+    STATS_SAMPLE = 50
+
+    def __init__(self, url: str, prefix: str = "quiz:session:", client=None,
+                 ttl_seconds: int = SESSION_TTL_SECONDS, clock=time.time):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.live_key = f"{prefix}live"
+        self._clock = clock
+
+    def _key(self, sid):
+        return f"{self.prefix}{sid}"
+
+    def create(self, session):
+        sid = str(uuid4())
+        with self.client.pipeline() as pipe:
+            pipe.hset(self._key(sid), mapping={
+                "meta": _pack_meta(session),
+                "order": pack_order(session.order),
+                "index": session.index,
+                "score": session.score,
+            })
+            pipe.expire(self._key(sid), self.ttl_seconds)
+            now = self._clock()
+            pipe.zremrangebyscore(self.live_key, "-inf", now)
+            pipe.zadd(self.live_key, {sid: now + self.ttl_seconds})
+            pipe.execute()
+        return sid
+
+    def get(self, sid):
+        data = self.client.hgetall(self._key(sid))
+        if not data:
+            return None
+        data = {k.decode() if isinstance(k, bytes) else k: v for k, v in data.items()}
+        return _unpack_session(data.get("meta"), order=unpack_order(data.get("order")),
+                               index=int(data.get("index", 0)), score=int(data.get("score", 0)), sid=sid)
+
+    def advance(self, sid, from_index, to_index, correct, order=None):
+        from redis.exceptions import WatchError
+
+        key = self._key(sid)
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    current = pipe.hget(key, "index")
+                    if current is None or int(current) != from_index:
+                        pipe.unwatch()
+                        return None
+                    pipe.multi()
+                    pipe.hset(key, "index", to_index)
+                    if correct:
+                        pipe.hincrby(key, "score", 1)
+                    if order is not None:
+                        pipe.hset(key, "order", pack_order(order))
+                    pipe.expire(key, self.ttl_seconds)
+                    pipe.zadd(self.live_key, {sid: self._clock() + self.ttl_seconds})
+                    pipe.execute()
+                    break
+                except WatchError:
+                    # Another worker touched the session; re-check the index
+                    continue
+        return self.get(sid)
+
+    def delete(self, sid):
+        with self.client.pipeline() as pipe:
+            pipe.delete(self._key(sid))
+            pipe.zrem(self.live_key, sid)
+            pipe.execute()
+
+    def stats(self):
+        """Gauges for /api/admin/stats.
+
+        live is the ZCARD of the live set after dropping the ids whose
+        expiry has passed; keys Redis evicts under maxmemory stay counted
+        until then. approx_bytes scales the MEMORY USAGE of up to
+        STATS_SAMPLE sessions (their field lengths where MEMORY is
+        unsupported) to all live ones. evicted and expired are the
+        server-wide counters from INFO stats.
+        """
+        from redis.exceptions import ResponseError
+
+        with self.client.pipeline() as pipe:
+            pipe.zremrangebyscore(self.live_key, "-inf", self._clock())
+            pipe.zcard(self.live_key)
+            pipe.zrange(self.live_key, 0, self.STATS_SAMPLE - 1)
+            _, live, sample = pipe.execute()
+        sizes = []
+        for sid in sample:
+            key = self._key(sid.decode() if isinstance(sid, bytes) else sid)
+            try:
+                size = self.client.memory_usage(key)
+            except ResponseError:
+                size = self.client.hstrlen(key, "order") + self.client.hstrlen(key, "meta")
+            if size is not None:
+                sizes.append(size)
+        try:
+            info = self.client.info("stats")
+        except ResponseError:
+            info = {}
+        return {
+            "backend": "redis",
+            "live": live,
+            "evicted": info.get("evicted_keys"),
+            "expired": info.get("expired_keys"),
+            "approx_bytes": round(sum(sizes) / len(sizes) * live) if sizes else 0,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+def create_session_store(backend: Optional[str] = None, bank_for: Optional[Callable] = None) -> SessionStore:
+    """Build the store selected by SESSION_BACKEND (memory, sql, redis or token).
+
+    `bank_for` (category -> bank) is used by token sessions, which re-derive
+    their question order from the bank on every request.
+    """
+    backend = (backend or os.environ.get("SESSION_BACKEND", "memory")).lower()
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend in ("sql", "sqlite", "postgres", "db"):
+        url = os.environ.get("SESSION_DATABASE_URL")
+        if url:
+            return SQLSessionStore(create_engine(url, future=True))
+        from db import engine
+        return SQLSessionStore(engine)
+    if backend == "redis":
+        url = os.environ.get("SESSION_REDIS_URL") or os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+        return RedisSessionStore(url)
+    if backend == "token":
+        from session_tokens import TokenSessionStore
+        return TokenSessionStore.from_env(bank_for)
+    raise ValueError(f"Unknown SESSION_BACKEND: {backend}")
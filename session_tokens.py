@@ -0,0 +1,176 @@
+"""
+Stateless signed quiz sessions.
+
+With SESSION_BACKEND=token the session id handed to the client is the
+session itself: an HMAC-signed token holding category, bank version, shuffle
+seed, position and score. Any replica sharing SESSION_SECRET can serve
+/api/question and /api/answer without shared state, because the question
+order is re-derived from the seed against the cached bank. A token
+carries the bank version; after an admin write the other replicas pick up
+the new bank within BANK_SYNC_INTERVAL seconds (see bank_cache.py), and
+until then they answer 404 for tokens issued against it.
+
+Tokens are bearer state: replaying an older token reopens that position.
+Use a server-side backend when answers must be final.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import struct
+from typing import Callable, Optional, Sequence
+
+from bank_cache import BANK_CACHE, CATEGORIES, category_key
+from session_store import QuizSession, SessionStore
+
+TOKEN_VERSION = 1
+# version, category code, bank version, seed, index, score, length
+_FIELDS = struct.Struct("<BBIQIII")
+_MAC_BYTES = 16
+_M64 = (1 << 64) - 1
+
+
+def _mix(x: int) -> int:
+    """splitmix64 finalizer, used as the Feistel round function."""
+    x = (x + 0x9E3779B97F4A7C15) & _M64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _M64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _M64
+    return x ^ (x >> 31)
+
+
+class SeededOrder(Sequence):
+    """Seed-derived permutation of `ids`, addressable by position.
+
+    A four-round Feistel network with cycle-walking maps position i to a
+    unique slot in `ids`, so looking up the i-th question is O(1) and the
+    permutation is never materialized.
+    """
+
+    def __init__(self, ids: Sequence[int], seed: int, length: Optional[int] = None, bank_version: int = 0):
+        self.ids = ids
+        self.seed = seed
+        self.bank_version = bank_version
+        n = len(ids)
+        self.length = n if length is None else min(length, n)
+        bits = max(2, (n - 1).bit_length())
+        bits += bits & 1
+        self._half = bits // 2
+        self._mask = (1 << self._half) - 1
+        self._keys = [_mix(seed ^ r) for r in range(4)]
+
+    def _slot(self, x: int) -> int:
+        n = len(self.ids)
+        while True:
+            left, right = x >> self._half, x & self._mask
+            for key in self._keys:
+                left, right = right, left ^ (_mix(right ^ key) & self._mask)
+            x = (left << self._half) | right
+            if x < n:
+                return x
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.length))]
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError("SeededOrder index out of range")
+        return self.ids[self._slot(i)]
+
+
+def _category_code(category: Optional[str]) -> int:
+    key = category_key(category)
+    return 0 if key is None else CATEGORIES.index(key) + 1
+
+
+def _category_from_code(code: int) -> Optional[str]:
+    return CATEGORIES[code - 1] if 0 < code <= len(CATEGORIES) else None
+
+
+class TokenSessionStore(SessionStore):
+    """SessionStore whose session ids are signed, self-contained tokens."""
+
+    # The order is a seeded permutation; there is no room for picked questions
+    explicit_orders = False
+
+    def __init__(self, secret: bytes, bank_cache=BANK_CACHE, bank_for: Optional[Callable] = None):
+        self.secret = secret
+        self.bank_cache = bank_cache
+        # category -> bank; webapi passes its bank_for so generated categories resolve too
+        self.bank_for = bank_for or bank_cache.get
+
+    @classmethod
+    def from_env(cls, bank_for: Optional[Callable] = None) -> "TokenSessionStore":
+        secret = os.environ.get("SESSION_SECRET")
+        if not secret:
+            print("⚠️  SESSION_SECRET not set: token sessions only work within this process")
+            secret = secrets.token_hex(32)
+        return cls(secret.encode("utf-8"), bank_for=bank_for)
+
+    def _mac(self, body: bytes) -> bytes:
+        return hmac.new(self.secret, body, hashlib.sha256).digest()[:_MAC_BYTES]
+
+    def encode(self, category_code, bank_version, seed, index, score, length) -> str:
+        body = _FIELDS.pack(TOKEN_VERSION, category_code, bank_version, seed, index, score, length)
+        return base64.urlsafe_b64encode(body + self._mac(body)).rstrip(b"=").decode("ascii")
+
+    def decode(self, token: str) -> Optional[tuple]:
+        """Return the token fields, or None if it is malformed or the signature is wrong."""
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        except (ValueError, TypeError):
+            return None
+        if len(raw) != _FIELDS.size + _MAC_BYTES:
+            return None
+        body, mac = raw[:_FIELDS.size], raw[_FIELDS.size:]
+        if not hmac.compare_digest(mac, self._mac(body)):
+            return None
+        fields = _FIELDS.unpack(body)
+        if fields[0] != TOKEN_VERSION:
+            return None
+        return fields[1:]
+
+    def new_order(self, bank, count=None) -> SeededOrder:
+        # The first `count` positions of a random permutation are a uniform sample
+        return SeededOrder(bank.ids, secrets.randbits(64), count, bank.version)
+
+    def create(self, session):
+        order = session.order
+        if not isinstance(order, SeededOrder):
+            raise TypeError("token sessions need an order from TokenSessionStore.new_order()")
+        return self.encode(_category_code(session.category), order.bank_version, order.seed,
+                           session.index, session.score, len(order))
+
+    def get(self, sid):
+        fields = self.decode(sid or "")
+        if fields is None:
+            return None
+        code, bank_version, seed, index, score, length = fields
+        category = _category_from_code(code)
+        bank = self.bank_for(category)
+        if bank.version != bank_version:
+            # Questions were added or removed; the seed no longer maps to the same order
+            return None
+        return QuizSession(category=category, order=SeededOrder(bank.ids, seed, length, bank_version),
+                           index=index, score=score, sid=sid)
+
+    def advance(self, sid, from_index, to_index, correct, order=None):
+        if order is not None:
+            raise TypeError("token sessions cannot change their question order")
+        fields = self.decode(sid or "")
+        if fields is None:
+            return None
+        code, bank_version, seed, index, score, length = fields
+        if index != from_index:
+            return None
+        new_sid = self.encode(code, bank_version, seed, to_index, score + (1 if correct else 0), length)
+        return self.get(new_sid)
+
+    def delete(self, sid):
+        # Nothing is stored server-side
+        pass
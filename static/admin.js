@@ -18,8 +18,27 @@ async function api(path, opts) {
   return ct.includes('application/json') ? r.json() : r.text();
 }
 
-async function listQuestions() {
-  return api('/api/admin/questions');
+const PAGE_SIZE = 50;
+
+// One keyset page; `next` is the after_id for the following page (null on the last one)
+async function listQuestions(afterId = 0, filters = {}) {
+  const params = new URLSearchParams({ after_id: String(afterId), limit: String(PAGE_SIZE) });
+  if (filters.category) params.set('category', filters.category);
+  if (filters.difficulty) params.set('difficulty', filters.difficulty);
+  const r = await fetch(`/api/admin/questions?${params}`, { headers: { 'Content-Type': 'application/json' } });
+  if (!r.ok) throw new Error(await r.text());
+  const next = r.headers.get('X-Next-After-Id');
+  return { items: await r.json(), next: next ? parseInt(next, 10) : null };
+}
+
+// Ranked full-text search; `next` is the offset of the following page (null on the last one)
+async function searchQuestions(offset = 0, filters = {}) {
+  const params = new URLSearchParams({ q: filters.q, offset: String(offset), limit: String(PAGE_SIZE) });
+  if (filters.category) params.set('category', filters.category);
+  const r = await fetch(`/api/admin/questions/search?${params}`, { headers: { 'Content-Type': 'application/json' } });
+  if (!r.ok) throw new Error(await r.text());
+  const next = r.headers.get('X-Next-Offset');
+  return { items: await r.json(), next: next ? parseInt(next, 10) : null };
 }
 
 async function createQuestion(payload) {
@@ -52,39 +71,96 @@ function renderForm(onSubmit) {
   );
 }
 
-function renderTable(items, onDelete) {
-  const rows = items.map(q => h('tr', {},
+function renderRow(q, onDelete) {
+  const choices = q.choices || [];
+  return h('tr', {},
     h('td', {}, String(q.id ?? '')),
     h('td', {}, q.text || ''),
-    h('td', {}, (q.choices || []).join(' | ')),
-    h('td', {}, String(q.correct_index ?? q.correctIndex ?? '')),
+    h('td', {}, choices.map(c => c.text ?? c).join(' | ')),
+    h('td', {}, String(choices.findIndex(c => c.is_correct))),
     h('td', {}, h('button', { class: 'btn btn-sm btn-outline-danger', onClick: () => onDelete(q.id) }, 'Verwijderen'))
-  ));
+  );
+}
+
+function renderTable(tbody) {
   return h('table', { class: 'table table-striped' },
     h('thead', {}, h('tr', {}, h('th', {}, 'ID'), h('th', {}, 'Vraag'), h('th', {}, 'Antwoorden'), h('th', {}, 'Correct'), h('th', {}))),
-    h('tbody', {}, rows)
+    tbody
   );
 }
 
+function renderFilters(filters, onChange) {
+  const category = h('select', { class: 'form-select' },
+    h('option', { value: '' }, 'Alle categorieën'),
+    ...['general', 'PSPO1', 'Verpleegkundig Rekenen'].map(c => h('option', { value: c }, c)));
+  const difficulty = h('input', { class: 'form-control', type: 'number', min: '1', placeholder: 'Moeilijkheid' });
+  const search = h('input', { class: 'form-control', type: 'search', placeholder: 'Zoeken in vragen en antwoorden' });
+  category.value = filters.category || '';
+  difficulty.value = filters.difficulty || '';
+  search.value = filters.q || '';
+  const apply = () => onChange({ category: category.value, difficulty: difficulty.value, q: search.value.trim() });
+  category.addEventListener('change', apply);
+  difficulty.addEventListener('change', apply);
+  search.addEventListener('change', apply);
+  return h('div', { class: 'row g-2 mb-3' },
+    h('div', { class: 'col-12' }, search), h('div', { class: 'col' }, category), h('div', { class: 'col' }, difficulty));
+}
+
+let filters = {};
+let observer = null;
+
 async function render() {
+  if (observer) observer.disconnect();
   app.innerHTML = '';
   const title = h('h3', { class: 'mb-3' }, 'Vragenbeheer');
-  const loading = h('div', { class: 'text-secondary' }, 'Laden...');
-  app.append(title, loading);
-  try {
-    const items = await listQuestions();
-    const refresh = async () => render();
-    const form = renderForm(async (payload) => {
-      await createQuestion(payload);
-      await refresh();
-    });
-    const table = renderTable(items, async (id) => { await deleteQuestion(id); await refresh(); });
-    app.innerHTML = '';
-    app.append(title, form, table);
-  } catch (e) {
-    app.innerHTML = '';
-    app.append(title, h('div', { class: 'alert alert-danger' }, String(e.message || e)));
-  }
+  const refresh = async () => render();
+  const form = renderForm(async (payload) => {
+    await createQuestion(payload);
+    await refresh();
+  });
+  const onDelete = async (id) => { await deleteQuestion(id); await refresh(); };
+  const tbody = h('tbody', {});
+  const status = h('div', { class: 'text-secondary' }, 'Laden...');
+  const sentinel = h('div', {});
+  app.append(title, form, renderFilters(filters, (f) => { filters = f; render(); }), renderTable(tbody), status, sentinel);
+
+  // Load the next page whenever the bottom of the table scrolls into view;
+  // `after` is a keyset id for the listing and an offset for search results
+  const fetchPage = filters.q ? searchQuestions : listQuestions;
+  let after = 0;
+  let loading = false;
+  const loadMore = async () => {
+    if (loading || after === null) return;
+    loading = true;
+    try {
+      const page = await fetchPage(after, filters);
+      page.items.forEach(q => tbody.appendChild(renderRow(q, onDelete)));
+      after = page.next;
+      status.textContent = after === null ? `${tbody.children.length} vragen` : 'Laden...';
+      if (after === null) observer.disconnect();
+    } catch (e) {
+      // Stop paging until the user retries; re-checking the sentinel would hammer a failing API
+      observer.disconnect();
+      status.className = 'alert alert-danger';
+      status.replaceChildren(String(e.message || e), h('button', {
+        class: 'btn btn-sm btn-outline-danger ms-2',
+        onClick: () => {
+          status.className = 'text-secondary';
+          status.textContent = 'Laden...';
+          observer.observe(sentinel);
+        },
+      }, 'Opnieuw'));
+      return;
+    } finally {
+      loading = false;
+    }
+    // Page did not fill the screen yet: keep going
+    if (after !== null && sentinel.getBoundingClientRect().top < window.innerHeight) loadMore();
+  };
+  observer = new IntersectionObserver((entries) => {
+    if (entries.some(e => e.isIntersecting)) loadMore();
+  });
+  observer.observe(sentinel);
 }
 
 window.adminUser = "admin";
@@ -133,4 +209,4 @@ document.addEventListener("DOMContentLoaded", function () {
   }
 });
 
-render();
+if (app) render();
@@ -109,6 +109,9 @@ const state = {
   lastCorrect: null,
   lastAnswerIndex: null,
   sessionId: null,
+  nextQuestion: null,
+  buffer: [],
+  pending: Promise.resolve(),
   score: 0,
   quizType: null,
   timer: {
@@ -146,6 +149,9 @@ window.showQuizSelector = function() {
   
   // Reset state
   state.sessionId = null;
+  state.nextQuestion = null;
+  state.buffer = [];
+  state.pending = Promise.resolve();
   state.score = 0;
   state.index = 0;
 }
@@ -262,8 +268,21 @@ function onStart(quizType) {
     });
 }
 
+// PSPO1 practice renders from a local buffer of upcoming questions while
+// answers are submitted in the background (in order, one at a time).
+var PREFETCH = 10;
+
+function usesBuffer() {
+  return state.quizType === 'pspo1';
+}
+
+function withSid(path) {
+  return path + (state.sessionId ? '?sid=' + encodeURIComponent(state.sessionId) : '?');
+}
+
 function loadQuestion() {
-  const path = state.sessionId ? '/api/question?sid=' + encodeURIComponent(state.sessionId) : '/api/question';
+  var path = state.sessionId ? '/api/question?sid=' + encodeURIComponent(state.sessionId) : '/api/question';
+  if (usesBuffer()) path = withSid('/api/question') + '&prefetch=' + PREFETCH;
   
   return fetch(path, { headers: { 'Content-Type': 'application/json' }, credentials: 'same-origin' })
     .then(function(resp) {
@@ -272,33 +291,98 @@ function loadQuestion() {
       }
       return resp.json();
     })
-    .then(function(data) {
-      if (data.finished) {
-        const resultPath = state.sessionId ? '/api/result?sid=' + encodeURIComponent(state.sessionId) : '/api/result';
-        return fetch(resultPath, { headers: { 'Content-Type': 'application/json' }, credentials: 'same-origin' })
-          .then(function(resp) { return resp.json(); })
-          .then(function(res) {
-            renderResult(res.score, res.total);
-          });
-      }
-      state.index = data.index;
-      state.total = data.total;
-      state.question = data.question;
-      state.answered = false;
-      state.lastCorrect = null;
-      state.lastAnswerIndex = null;
-      state.correctAnswers = null;
-      renderQuestion();
-    })
+    .then(showQuestionData)
     .catch(function(err) {
       showError(err);
     });
 }
 
+function showQuestionData(data) {
+  if (data.finished) {
+    const resultPath = state.sessionId ? '/api/result?sid=' + encodeURIComponent(state.sessionId) : '/api/result';
+    return fetch(resultPath, { headers: { 'Content-Type': 'application/json' }, credentials: 'same-origin' })
+      .then(function(resp) { return resp.json(); })
+      .then(function(res) {
+        renderResult(res.score, res.total);
+      });
+  }
+  state.index = data.index;
+  state.total = data.total;
+  state.question = data.question;
+  if (data.upcoming) state.buffer = data.upcoming;
+  state.answered = false;
+  state.lastCorrect = null;
+  state.lastAnswerIndex = null;
+  state.correctAnswers = null;
+  renderQuestion();
+}
+
+function markButtons(chosen, correct, correctAnswers) {
+  const buttons = document.querySelectorAll('.answers button');
+  for (var idx = 0; idx < buttons.length; idx++) {
+    var b = buttons[idx];
+    b.disabled = true;
+    if (idx === chosen && correct !== null) {
+      b.classList.add(correct ? 'correct' : 'wrong');
+    }
+    // Highlight all correct answers
+    if (correctAnswers && correctAnswers.indexOf(idx) !== -1) {
+      b.classList.add('correct');
+    }
+  }
+}
+
+function onAnswerBuffered(i) {
+  var answeredId = state.question.id;
+  state.answered = true;
+  state.lastAnswerIndex = i;
+  markButtons(i, null, null);
+  nextBtn.style.display = '';
+  nextBtn.onclick = onNext;
+
+  var refill = state.buffer.length < PREFETCH / 2;
+  state.pending = state.pending.then(function() {
+    var path = withSid('/api/step') + (refill ? '&prefetch=' + PREFETCH : '');
+    return fetch(path, { method: 'POST', headers: { 'Content-Type': 'application/json' }, credentials: 'same-origin', body: JSON.stringify({ choice: i }) })
+      .then(function(resp) {
+        if (!resp.ok) {
+          throw new Error('HTTP ' + resp.status);
+        }
+        return resp.json();
+      })
+      .then(function(res) {
+        if (res.session_id) state.sessionId = res.session_id;
+        if (res.question_id !== answeredId) {
+          // Bank changed under the buffer: drop it and ask the server where we are
+          state.buffer = [];
+          return loadQuestion();
+        }
+        if (res.correct) state.score++;
+        scoreEl.textContent = 'Score: ' + state.score;
+        if (refill && res.next && !res.next.finished) {
+          var fresh = [{ id: res.next.question.id, text: res.next.question.text, choices: res.next.question.choices, index: res.next.index }]
+            .concat(res.next.upcoming || []);
+          state.buffer = fresh.filter(function(q) { return q.index > state.index; });
+        }
+        if (state.question && state.question.id === answeredId) {
+          state.lastCorrect = !!res.correct;
+          state.correctAnswers = res.correct_answers || [];
+          markButtons(i, state.lastCorrect, state.correctAnswers);
+          if (res.finished) renderResult(res.score, res.total);
+        }
+      });
+  }).catch(function(err) {
+    state.pending = Promise.resolve();
+    showError(err);
+  });
+}
+
 function onAnswer(i, btn) {
   if (state.answered) return;
+  if (usesBuffer()) return onAnswerBuffered(i);
   
-  const path = state.sessionId ? '/api/answer?sid=' + encodeURIComponent(state.sessionId) : '/api/answer';
+  // /api/step grades the answer and returns the next question in the same response
+  const path = state.sessionId ? '/api/step?sid=' + encodeURIComponent(state.sessionId) : '/api/step';
   const body = JSON.stringify({ choice: i });
   
   fetch(path, { method: 'POST', headers: { 'Content-Type': 'application/json' }, credentials: 'same-origin', body: body })
@@ -309,27 +393,18 @@ function onAnswer(i, btn) {
       return resp.json();
     })
     .then(function(res) {
+      // Token sessions hand out a new session id after every answer
+      if (res.session_id) state.sessionId = res.session_id;
       state.answered = true;
       state.lastCorrect = !!res.correct;
       state.lastAnswerIndex = i;
       state.correctAnswers = res.correct_answers || [];
+      state.nextQuestion = res.next || null;
       
       if (res.correct) state.score++;
       scoreEl.textContent = 'Score: ' + state.score;
       
-      // Mark buttons
-      const buttons = document.querySelectorAll('.answers button');
-      for (var idx = 0; idx < buttons.length; idx++) {
-        var b = buttons[idx];
-        b.disabled = true;
-        if (idx === i) {
-          b.classList.add(res.correct ? 'correct' : 'wrong');
-        }
-        // Highlight all correct answers
-        if (state.correctAnswers.indexOf(idx) !== -1) {
-          b.classList.add('correct');
-        }
-      }
+      markButtons(i, !!res.correct, state.correctAnswers);
       
       // Show next button
       if (res.finished) {
@@ -346,7 +421,23 @@ function onAnswer(i, btn) {
 
 function onNext() {
   nextBtn.style.display = 'none';
-  loadQuestion();
+  if (usesBuffer()) {
+    var buffered = state.buffer.shift();
+    if (buffered) {
+      showQuestionData({ finished: false, question: buffered, index: buffered.index, total: state.total });
+    } else {
+      // Buffer exhausted (or quiz done): let pending answers land, then ask the server
+      state.pending.then(loadQuestion);
+    }
+    return;
+  }
+  var next = state.nextQuestion;
+  state.nextQuestion = null;
+  if (next) {
+    Promise.resolve(showQuestionData(next)).catch(showError);
+  } else {
+    loadQuestion();
+  }
 }
 
 function showError(e) {
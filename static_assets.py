@@ -0,0 +1,125 @@
+"""
+Static asset pipeline.
+
+At startup every file in static/ is read into memory once, fingerprinted
+with a content hash (``app.js`` -> ``app.3f2a1b9c0d.js``) and, for text
+types, precompressed with gzip and (if the ``brotli`` package is
+installed) brotli. References to ``/static/<name>`` in the HTML entry
+points are rewritten to the fingerprinted names.
+
+Fingerprinted URLs never change content, so they are served with a
+one-year immutable Cache-Control. The HTML entry points and the plain
+(unhashed) names stay ``no-cache`` with an ETag, so browsers revalidate
+them with a cheap 304.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+HTML_ENTRY_POINTS = ("index.html", "admin.html")
+_COMPRESSIBLE = ("text/", "application/javascript", "application/json", "image/svg+xml")
+_MIN_COMPRESS_BYTES = 512
+# /static/<name> with an optional legacy ?v=... cache-buster, inside quotes
+_STATIC_REF = re.compile(r"""(?<=["'])/static/([\w./-]+?)(?:\?v=[\w.-]*)?(?=["'])""")
+
+
+@dataclass
+class Asset:
+    """One file, held in memory with its precompressed variants."""
+    content_type: str
+    body: bytes
+    etag: str
+    cache_control: str
+    encoded: Dict[str, bytes] = field(default_factory=dict)  # "br"/"gzip" -> bytes
+
+    def select(self, accept_encoding: str):
+        """Pick (encoding, body) for an Accept-Encoding header; encoding None means identity."""
+        accepted = {part.split(";")[0].strip() for part in (accept_encoding or "").lower().split(",")}
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self.encoded:
+                return encoding, self.encoded[encoding]
+        return None, self.body
+
+
+def _content_type(name: str) -> str:
+    if name.endswith(".js"):
+        return "application/javascript"
+    guessed, _ = mimetypes.guess_type(name)
+    content_type = guessed or "application/octet-stream"
+    if content_type.startswith("text/") or content_type == "application/javascript":
+        content_type += "; charset=utf-8"
+    return content_type
+
+
+def _fingerprinted(name: str, digest: str) -> str:
+    stem, dot, ext = name.rpartition(".")
+    return f"{stem}.{digest[:10]}.{ext}" if dot else f"{name}.{digest[:10]}"
+
+
+def _make_asset(body: bytes, content_type: str, cache_control: str) -> Asset:
+    digest = hashlib.sha256(body).hexdigest()
+    # Weak: the same validator covers the identity and compressed variants
+    asset = Asset(content_type, body, f'W/"{digest[:16]}"', cache_control)
+    if len(body) >= _MIN_COMPRESS_BYTES and content_type.startswith(_COMPRESSIBLE):
+        candidates = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            candidates["br"] = brotli.compress(body, quality=11)
+        asset.encoded = {enc: data for enc, data in candidates.items() if len(data) < len(body)}
+    return asset
+
+
+class StaticAssets:
+    """In-memory, fingerprinted copy of a static directory."""
+
+    def __init__(self, directory: str = "static"):
+        self.directory = directory
+        self.assets: Dict[str, Asset] = {}      # URL path below /static/ -> asset
+        self.hashed_names: Dict[str, str] = {}  # original name -> fingerprinted name
+        self.pages: Dict[str, Asset] = {}       # HTML entry point -> rewritten page
+
+    def load(self) -> "StaticAssets":
+        for root, _dirs, files in os.walk(self.directory):
+            for filename in files:
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, self.directory).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    body = f.read()
+                content_type = _content_type(name)
+                plain = _make_asset(body, content_type, REVALIDATE)
+                self.assets[name] = plain
+                if name in HTML_ENTRY_POINTS:
+                    continue
+                # Both names share the bytes; only the caching differs
+                hashed = _fingerprinted(name, hashlib.sha256(body).hexdigest())
+                self.assets[hashed] = Asset(content_type, body, plain.etag, IMMUTABLE, plain.encoded)
+                self.hashed_names[name] = hashed
+        for page in HTML_ENTRY_POINTS:
+            if page in self.assets:
+                html = self.rewrite(self.assets[page].body.decode("utf-8")).encode("utf-8")
+                self.pages[page] = self.assets[page] = _make_asset(html, _content_type(page), REVALIDATE)
+        return self
+
+    def rewrite(self, html: str) -> str:
+        """Point /static/<name> references at the fingerprinted files."""
+        def replace(match):
+            hashed = self.hashed_names.get(match.group(1))
+            return f"/static/{hashed}" if hashed else match.group(0)
+        return _STATIC_REF.sub(replace, html)
+
+    def get(self, name: str) -> Optional[Asset]:
+        return self.assets.get(name)
+
+    def page(self, name: str) -> Asset:
+        return self.pages[name]
@@ -143,15 +143,26 @@ class TestPersonalizedLearning:
     
     def test_performance_analysis(self):
         """Test user performance analysis"""
+        from learning_stats import LearnerStats
         from personalized_learning import LearningAnalytics
         
-        analytics = LearningAnalytics()
+        stats = LearnerStats(window=10)
+        # 20 answers, wrong at first and right towards the end
+        for i in range(20):
+            stats.record("test_user", "general", i >= 8, latency_ms=30000)
+        analytics = LearningAnalytics(stats)
         performance = analytics.analyze_user_performance("test_user", "general")
         
         assert "general" in performance
         assert performance["general"].user_id == "test_user"
         assert performance["general"].category == "general"
-        assert performance["general"].total_questions > 0
+        assert performance["general"].total_questions == 20
+        assert performance["general"].correct_answers == 12
+        assert performance["general"].recent_accuracy == 1.0
+        assert performance["general"].average_time == 30.0
+        assert performance["general"].learning_velocity > 0
+        assert analytics.analyze_user_performance("test_user") == performance
+        assert analytics.analyze_user_performance("other_user") == {}
     
     def test_difficulty_estimation(self):
         """Test difficulty level estimation"""
@@ -184,9 +195,15 @@ class TestPersonalizedLearning:
     
     def test_recommendations_generation(self):
         """Test learning recommendations"""
-        from personalized_learning import PersonalizedRecommendationEngine
+        from learning_stats import LearnerStats
+        from personalized_learning import LearningAnalytics, PersonalizedRecommendationEngine
         
+        stats = LearnerStats()
+        for i in range(30):
+            stats.record("test_user", "PSPO1", i % 3 != 0)
+            stats.record("test_user", "general", i % 2 == 0)
         engine = PersonalizedRecommendationEngine()
+        engine.analytics = LearningAnalytics(stats)
         recommendations = engine.get_learning_recommendations("test_user")
         
         assert len(recommendations) > 0
@@ -0,0 +1,55 @@
+import random
+
+from adaptive import BucketIndex, RangeBucket
+
+
+def _index():
+    questions = [{"id": i, "difficulty": 1 + i % 3, "topic": "a" if i < 30 else None} for i in range(60)]
+    return BucketIndex.from_questions(questions)
+
+
+def test_pick_prefers_target_difficulty_and_topic():
+    index, rng = _index(), random.Random(1)
+    assert index.levels() == [1, 2, 3] and index.topics == {"a"}
+    for _ in range(20):
+        qid = index.pick(2, ["a", "unknown"], rng=rng)
+        assert qid % 3 == 1 and qid < 30
+    assert index.pick(2, ["unknown"], rng=rng) % 3 == 1  # unknown topics are ignored
+    assert index.pick(None, rng=rng) % 3 == 0  # default difficulty 1
+    assert index.pick(9, rng=rng) % 3 == 2  # nearest level
+
+
+def test_pick_skips_seen_ids_and_falls_back_to_other_levels():
+    index, rng = _index(), random.Random(2)
+    picks = []
+    for _ in range(60):
+        qid = index.pick(3, seen=set(picks), rng=rng)
+        assert qid not in picks
+        picks.append(qid)
+    assert index.pick(3, seen=set(picks), rng=rng) is None
+    # Level 3 is used up first, then the nearest level
+    assert {q % 3 for q in picks[:20]} == {2} and {q % 3 for q in picks[20:40]} == {1}
+
+
+def test_range_bucket_draws_inside_its_ranges():
+    bucket = RangeBucket([(1000, 10), (5000, 1_000_000)], [1, 0])
+    assert all(1000 <= bucket.draw((), random) < 1010 for _ in range(50))
+
+
+def test_adaptive_session_serves_distinct_questions():
+    import webapi
+    from starlette.testclient import TestClient
+    client = TestClient(webapi.app)
+
+    start = client.post("/api/start", params={"category": "Verpleegkundig Rekenen", "mode": "adaptive",
+                                              "count": 5, "user_id": "adaptive-1"}).json()
+    sid, seen = start["session_id"], []
+    assert start["mode"] == "adaptive"
+    for i in range(5):
+        question = client.get("/api/question", params={"sid": sid}).json()
+        assert (question["index"], question["total"]) == (i, 5)
+        seen.append(question["question"]["id"])
+        result = client.post("/api/answer", params={"sid": sid}, json={"choice": 0}).json()
+        assert result["finished"] == (i == 4)
+    assert len(set(seen)) == 5
+    assert client.get("/api/question", params={"sid": sid}).json() == {"finished": True}
@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.pool import StaticPool
+
+from answer_log import AnswerLog, answers, latency_from
+from migrations import upgrade
+
+
+def _log(**kwargs):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    upgrade(engine)
+    return AnswerLog(engine, **kwargs)
+
+
+def _rows(log):
+    with log.engine.connect() as conn:
+        return conn.execute(select(answers).order_by(answers.c.id)).all()
+
+
+def test_events_are_written_in_batches():
+    log = _log(batch_size=2)
+    for i in range(5):
+        log.record("s1", (1 << 31) + i, "Verpleegkundig Rekenen", i % 3, i % 2 == 0, user_id="u1", latency_ms=1200)
+    assert _rows(log) == []  # nothing is written by record()
+    assert log.flush() == 5
+    rows = _rows(log)
+    assert [r.question_id for r in rows] == [(1 << 31) + i for i in range(5)]
+    assert rows[0].correct and not rows[1].correct and rows[0].user_id == "u1" and rows[0].latency_ms == 1200
+    assert log.stats()["batches"] == 3 and log.stats()["pending"] == 0
+
+
+def test_failed_batch_is_kept_for_the_next_flush():
+    log = _log()
+    log.record("s1", 1, "general", 0, True)
+    engine, log.engine = log.engine, create_engine("sqlite:////nonexistent/dir/quiz.db")
+    with pytest.raises(Exception):
+        log.flush()
+    assert log.stats()["pending"] == 1 and log.stats()["failures"] == 1
+    log.engine = engine
+    log.flush()
+    assert len(_rows(log)) == 1
+
+
+def test_full_queue_drops_the_oldest_events_of_a_failed_batch():
+    log = _log(batch_size=3, max_pending=5)
+    for i in range(5):
+        log.record("s1", i, "general", 0, True)
+
+    def fail(conn, rows):
+        # Two more answers arrive while the batch is being written
+        for i in (5, 6):
+            log.record("s1", i, "general", 0, True)
+        raise RuntimeError("database went away")
+    log.listeners.append(fail)
+    with pytest.raises(RuntimeError):
+        log.flush()
+    assert [e["question_id"] for e in log._queue] == [2, 3, 4, 5, 6]
+    assert log.stats()["dropped"] == 2
+
+
+def test_background_thread_flushes_on_interval_and_stop():
+    log = _log(interval=0.01)
+    log.start()
+    log.record("s1", 1, "general", 0, True)
+    log.stop()
+    assert len(_rows(log)) == 1
+
+
+def test_latency_is_clamped():
+    assert latency_from({"latency_ms": "850"}) == 850
+    assert latency_from({"latency_ms": -5}) == 0
+    assert latency_from({"latency_ms": 10 ** 9}) == 3_600_000
+    assert latency_from({}) is None
+
+
+def test_answer_endpoint_logs_the_answer():
+    import webapi
+    from starlette.testclient import TestClient
+    client = TestClient(webapi.app)
+
+    sid = client.post("/api/start", params={"category": "Verpleegkundig Rekenen", "user_id": "learner-7"}).json()["session_id"]
+    question = client.get("/api/question", params={"sid": sid}).json()["question"]
+    result = client.post("/api/answer", params={"sid": sid}, json={"choice": 0, "latency_ms": 4321}).json()
+    webapi.ANSWER_LOG.flush()
+    with webapi.engine.connect() as conn:
+        row = conn.execute(select(answers).where(answers.c.session_id == sid)).one()
+    assert (row.user_id, row.question_id, row.choice, row.correct, row.latency_ms) == (
+        "learner-7", question["id"], 0, result["correct"], 4321)
+    assert row.category == "Verpleegkundig Rekenen"
@@ -0,0 +1,110 @@
+from bank_cache import BankCache, category_key
+
+
+def _loader(calls):
+    def load(category):
+        calls.append(category)
+        return [
+            {"id": 1, "text": "Q1", "choices": ("a", "b"), "answer": 0, "correct_answers": (0,)},
+            {"id": 2, "text": "Q2", "choices": ("a", "b"), "answer": 1, "correct_answers": (1,)},
+        ]
+    return load
+
+
+def test_category_key_maps_unknown_to_general():
+    assert category_key("PSPO1") == "PSPO1"
+    assert category_key("general") is None
+    assert category_key(None) is None
+
+
+def test_snapshot_is_built_once_and_counted():
+    calls = []
+    cache = BankCache(_loader(calls))
+    bank = cache.get("PSPO1")
+    assert cache.get("PSPO1") is bank
+    assert calls == ["PSPO1"]
+    assert bank.by_id[2]["text"] == "Q2"
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["rebuilds"] == 1
+    assert stats["cached"] == {"PSPO1": 2}
+
+
+def test_invalidate_only_drops_affected_category():
+    calls = []
+    cache = BankCache(_loader(calls))
+    cache.get("PSPO1")
+    cache.get(None)
+    cache.invalidate("PSPO1")
+    cache.get("PSPO1")
+    cache.get(None)
+    assert calls == ["PSPO1", None, "PSPO1"]
+
+
+def test_build_racing_an_invalidation_is_not_installed():
+    cache = None
+
+    def load(category):
+        # An admin write lands while the snapshot is being read
+        cache.invalidate()
+        return []
+
+    cache = BankCache(load)
+    cache.get("PSPO1")
+    assert cache.stats()["cached"] == {}
+
+
+def test_writes_on_another_replica_invalidate_through_bank_generations():
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+    from bank_cache import bump_generation
+    from migrations import upgrade
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    upgrade(engine)
+    calls = []
+    replica = BankCache(_loader(calls))
+    replica.sync(engine)
+    replica.get("PSPO1")
+    replica.get(None)
+    assert replica.sync(engine) == []
+
+    # Another process wrote a PSPO1 question
+    with engine.begin() as conn:
+        conn.execute(bump_generation("PSPO1"))
+    assert replica.sync(engine) == ["PSPO1"]
+    replica.get("PSPO1")
+    replica.get(None)
+    assert calls == ["PSPO1", None, "PSPO1"]
+    assert replica.stats()["remote_invalidations"] >= 1
+
+
+def test_sample_is_distinct_and_bounded():
+    questions = [{"id": i, "text": "", "choices": (), "answer": None, "correct_answers": ()} for i in range(1, 11)]
+    bank = BankCache(lambda category: questions).get(None)
+    picked = bank.sample(4)
+    assert len(picked) == 4 and len(set(picked)) == 4
+    assert set(picked) <= set(bank.ids)
+    assert sorted(bank.sample(50)) == list(range(1, 11))
+
+
+def test_sample_from_million_row_bank_does_not_touch_every_id():
+    from array import array
+    from bank_cache import QuestionBank
+
+    class CountingIds(array):
+        reads = 0
+
+        def __getitem__(self, i):
+            CountingIds.reads += 1
+            return super().__getitem__(i)
+
+        def __iter__(self):
+            raise AssertionError("sample() must not walk the whole id array")
+
+    ids = CountingIds("I", range(1, 1_000_001))
+    bank = QuestionBank(category=None, questions=(), by_id={}, ids=ids, version=0)
+    for _ in range(100):
+        picked = bank.sample(80)
+    assert len(set(picked)) == 80
+    # One read per picked id: O(count), not O(bank size)
+    assert CountingIds.reads == 100 * 80
@@ -0,0 +1,82 @@
+import numpy as np
+
+from dedup import DuplicateIndex, MinHasher, check_batch, document, find_clusters
+
+
+def test_normalization_ignores_numbering_case_accents_and_choice_order():
+    assert document("240 Wat doet de Product Owner?", ["B", "a"]) == document("wat doet de product owner", ["A", "b"])
+    assert document("Een patiënt") == ["een", "patient"]
+
+
+def test_clusters_near_duplicates_only():
+    base = "Who is responsible for ordering the items in the Product Backlog during the Sprint"
+    items = [
+        (base, ["The Product Owner", "The Developers", "The Scrum Master"]),
+        ("Which Scrum event is timeboxed to fifteen minutes for a one month Sprint", ["Daily Scrum", "Sprint Review"]),
+        ("12. " + base + "?", ["The Developers", "The Product Owner", "The Scrum Master"]),
+        (base.replace("ordering", "sorting"), ["The Product Owner", "The Developers", "The Scrum Master"]),
+    ]
+    sig = MinHasher().signatures(items)
+    assert sig.shape == (4, 128) and sig.dtype == np.uint32
+    assert find_clusters(sig, 0.6) == [[0, 2, 3]]
+
+
+def test_check_batch_against_index_and_within_batch():
+    hasher = MinHasher()
+    bank = [("Wat is de maximale duur van een Sprint in weken", ["1", "2", "4"])]
+    index = DuplicateIndex(hasher, 0.8)
+    index.add([41], hasher.signatures(bank))
+    new = ("Hoeveel mensen zitten er maximaal in een Scrum Team", ["7", "10"])
+    sig, reasons = check_batch(index, [bank[0], new, new], labels=[5, 6, 7])
+    assert reasons[0].startswith("Near-duplicate of question 41")
+    assert reasons[1:] == [None, "Near-duplicate of row 6"]
+    assert sig.shape[0] == 3
+
+
+def test_bulk_import_skips_near_duplicates():
+    import webapi
+    from starlette.testclient import TestClient
+    client = TestClient(webapi.app)
+
+    question = {"text": "Welke rol ordent de Product Backlog items volgens de Scrum Guide", "choices": ["Product Owner", "Developers"],
+                "correct_index": 0}
+    first = client.post("/api/admin/questions/bulk", params={"dedup": "true"}, json=[question]).json()
+    second = client.post("/api/admin/questions/bulk", params={"dedup": "true"}, json=[
+        {**question, "text": "3. " + question["text"] + "?"},
+        {"text": "Hoe lang duurt de Daily Scrum maximaal voor een Sprint", "choices": ["15 minuten", "1 uur"], "correct_index": 0},
+    ]).json()
+    try:
+        assert first["inserted"] == 1
+        assert second["inserted"] == 1
+        assert second["errors"][0]["row"] == 0
+        assert second["errors"][0]["error"].startswith(f"Near-duplicate of question {first['ids'][0]}")
+    finally:
+        for qid in first["ids"] + second["ids"]:
+            client.delete(f"/api/admin/questions/{qid}")
+
+
+def test_index_adds_are_buffered_and_merged(monkeypatch):
+    import dedup
+
+    monkeypatch.setattr(dedup, "_MERGE_MIN", 16)
+    hasher = MinHasher()
+    texts = [f"Vraag {i}: hoeveel mg paracetamol krijgt patiënt {i} per dag bij {i % 7} kg" for i in range(40)]
+    sig = hasher.signatures([(t, ["a", "b"]) for t in texts])
+    index = DuplicateIndex(hasher, 0.8)
+    index.add(list(range(30)), sig[:30])
+    for i in range(30, 40):
+        index.add([i], sig[i:i + 1])
+    assert index._merged == 30 and len(index) == 40
+    assert [hit[0] for hit in index.query(sig)] == list(range(40))
+
+    index._merge()
+    assert index._merged == 40 and not any(index._delta)
+    assert [hit[0] for hit in index.query(sig)] == list(range(40))
+
+
+def test_vocabulary_is_bounded():
+    from dedup import _Vocabulary
+
+    vocab = _Vocabulary(limit=2)
+    ids = [vocab[w] for w in ("scrum", "sprint", "backlog", "backlog")]
+    assert ids[:2] == [1, 2] and ids[2] == ids[3] > 2**32 and len(vocab) == 2
@@ -0,0 +1,35 @@
+import json
+
+import json_response
+from json_response import FastJSONResponse, RawJSON, dumps
+
+
+def test_raw_json_is_spliced_verbatim():
+    raw = RawJSON(b'{"id":1,"text":"Wat is Scrum?"}')
+    out = dumps({"finished": False, "question": raw, "upcoming": [raw], "total": 2})
+    assert json.loads(out) == {
+        "finished": False,
+        "question": {"id": 1, "text": "Wat is Scrum?"},
+        "upcoming": [{"id": 1, "text": "Wat is Scrum?"}],
+        "total": 2,
+    }
+
+
+def test_stdlib_fallback_splices_too():
+    encode = lambda o, default: json.dumps(o, ensure_ascii=False, separators=(",", ":"), default=default).encode()
+    out = json_response._splice(encode, {"q": RawJSON(b"[1,2]"), "t": "é"})
+    assert out == '{"q":[1,2],"t":"é"}'.encode()
+
+
+def test_response_class_renders_bytes():
+    assert FastJSONResponse({"a": [1, None]}).body == b'{"a":[1,null]}'
+
+
+def test_bank_encodes_each_question_once():
+    from bank_cache import QuestionBank
+    bank = QuestionBank.build(None, [
+        {"id": 7, "text": "Q", "choices": ("a", "b"), "answer": 1, "correct_answers": (1,)},
+    ])
+    assert bank.payload_json(7) is bank.payload_json(7)
+    assert json.loads(bank.payload_json(7)) == {"id": 7, "text": "Q", "choices": ["a", "b"], "correct_answers": [1]}
+    assert json.loads(bank.preview_json(7, 3)) == {"index": 3, "id": 7, "text": "Q", "choices": ["a", "b"]}
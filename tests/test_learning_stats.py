@@ -0,0 +1,43 @@
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from answer_log import AnswerLog
+from learning_stats import LearnerAggregate, LearnerStats, Trend
+from migrations import upgrade
+
+
+def test_trend_matches_weighted_least_squares():
+    rng = np.random.default_rng(1)
+    ys = rng.random(300)
+    decay = 0.99
+    trend = Trend(decay)
+    for y in ys:
+        trend.add(y)
+    weights = decay ** np.arange(len(ys))[::-1]
+    assert np.isclose(trend.slope(), np.polyfit(np.arange(len(ys)), ys, 1, w=np.sqrt(weights))[0])
+
+
+def test_ring_buffer_keeps_the_last_results():
+    aggregate = LearnerAggregate(window=3)
+    for correct in (True, False, True, True, False):
+        aggregate.add(correct)
+    assert aggregate.recent_results() == [True, True, False]
+    assert (aggregate.total, aggregate.correct, aggregate.recent_correct) == (5, 3, 2)
+    assert aggregate.average_time is None
+
+
+def test_stats_are_rebuilt_from_the_answer_log():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    upgrade(engine)
+    log = AnswerLog(engine)
+    for i in range(12):
+        log.record("s1", i, "PSPO1", 0, i % 4 != 0, user_id="u1", latency_ms=2000)
+    log.record("s2", 1, "general", 0, True)  # anonymous: not aggregated
+    log.flush()
+    stats = LearnerStats()
+    assert stats.load(log.engine) == 12
+    aggregate = stats.get("u1", "PSPO1")
+    assert (aggregate.total, aggregate.correct, aggregate.average_time) == (12, 9, 2.0)
+    assert stats.categories("u1") == ["PSPO1"]
+    assert stats.stats()["users"] == 1
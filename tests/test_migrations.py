@@ -0,0 +1,39 @@
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.pool import StaticPool
+
+from migrations import applied_versions, discover, upgrade
+
+
+def _engine():
+    return create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+
+def test_upgrade_creates_schema_and_indexes():
+    engine = _engine()
+    upgrade(engine)
+    insp = inspect(engine)
+    assert {"questions", "choices", "bank_generations", "schema_migrations"} <= set(insp.get_table_names())
+    assert "category" in {c["name"] for c in insp.get_columns("questions")}
+    assert "ix_questions_category_difficulty" in {i["name"] for i in insp.get_indexes("questions")}
+    assert "ix_choices_question_id" in {i["name"] for i in insp.get_indexes("choices")}
+    assert applied_versions(engine) == {version for version, _ in discover()}
+
+
+def test_category_is_backfilled_from_explanation():
+    engine = _engine()
+    with engine.begin() as conn:
+        # A database created before the category column existed
+        conn.execute(text("CREATE TABLE questions (id INTEGER PRIMARY KEY, text TEXT NOT NULL, "
+                          "explanation TEXT, difficulty INTEGER)"))
+        conn.execute(text("INSERT INTO questions (text, explanation) VALUES "
+                          "('a', 'PSPO1'), ('b', NULL), ('c', 'Verpleegkundig Rekenen'), ('d', 'Uitleg')"))
+    upgrade(engine)
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT text, category FROM questions ORDER BY id")).all()
+    assert rows == [("a", "PSPO1"), ("b", "general"), ("c", "Verpleegkundig Rekenen"), ("d", None)]
+
+
+def test_upgrade_is_idempotent():
+    engine = _engine()
+    assert upgrade(engine)
+    assert upgrade(engine) == []
@@ -0,0 +1,54 @@
+import numpy as np
+
+import nursing_generator as gen
+
+
+def test_ids_render_deterministically_with_the_answer_among_distinct_choices():
+    ids = gen.sample_ids(200, np.random.default_rng(7))
+    assert len(set(ids.tolist())) == 200 and all(gen.is_generated(int(i)) for i in ids)
+    questions = gen.render(ids)
+    assert gen.render(ids) == questions
+    for q in questions:
+        assert len(set(q["choices"])) == 4
+        assert q["correct_answers"] == (q["answer"],)
+    assert gen.variant_count() > 1_000_000
+    assert gen.render([12, gen.GENERATED_BIT | (127 << 24)]) == [None, None]
+
+
+def test_answers_are_computed_correctly():
+    tablets = gen.TEMPLATES.index(next(t for t in gen.TEMPLATES if t.key == "tabletten"))
+    for q in gen.render(gen.GENERATED_BIT | (tablets << 24) | np.arange(0, gen.TEMPLATES[tablets].size, 97)):
+        dose, strength = [float(x.replace(",", ".")) for x in
+                          (q["text"].split(" moet ")[1].split(" mg")[0], q["text"].split("bevatten ")[1].split(" mg")[0])]
+        assert q["choices"][q["answer"]] == gen.fmt(round(dose / strength, 2)) + " tablet(ten)"
+
+
+def test_weight_based_doses_stay_within_usual_maxima():
+    for key, limit in (("dosis_per_kg", 3000), ("kind_dosis", 4000)):
+        t = next(i for i, t in enumerate(gen.TEMPLATES) if t.key == key)
+        for q in gen.render(gen.GENERATED_BIT | (t << 24) | np.arange(0, gen.TEMPLATES[t].size, 101)):
+            total = float(q["choices"][q["answer"]].split(" ")[0].replace(",", "."))
+            assert total <= (15 if "morfine" in q["text"] else limit), q["text"]
+
+
+def test_bank_sample_follows_the_given_rng():
+    import random
+    bank = gen.GeneratedBank()
+    assert bank.sample(20, random.Random(3)) == bank.sample(20, random.Random(3))
+    assert bank.sample(20, np.random.default_rng(3)) == bank.sample(20, np.random.default_rng(3))
+    assert bank.sample(20, random.Random(3)) != bank.sample(20, random.Random(4))
+
+
+def test_nursing_sessions_are_generated():
+    import webapi
+    from starlette.testclient import TestClient
+    client = TestClient(webapi.app)
+
+    sid = client.post("/api/start", params={"category": "Verpleegkundig Rekenen", "count": 5}).json()["session_id"]
+    order = webapi.SESSIONS.get(sid).order
+    assert len(order) == 5 and all(gen.is_generated(i) for i in order)
+    q = client.get("/api/question", params={"sid": sid, "prefetch": 2}).json()
+    assert q["question"]["id"] == order[0] and len(q["upcoming"]) == 2
+    answer = q["question"]["correct_answers"][0]
+    r = client.post("/api/answer", params={"sid": sid}, json={"choice": answer}).json()
+    assert r["correct"] is True and r["score"] == 1
@@ -0,0 +1,79 @@
+import pytest
+
+from pdf_extract import QuestionParser, iter_pages, parse_pages
+
+PAGE = """PSPO1_v1.2.1.md 2025-06-14
+1 Who is responsible for ordering the Product Backlog?
+(choose the best answer)
+A. The Product Owner
+B. The Developers working together
+with the Scrum Master
+2
+True or False: Scrum has a role called Project Manager.
+"""
+
+
+def fake_extract(path, pages):
+    return [(n, PAGE if n == 0 else f"{n + 2} What happens on page {n + 1}?\nOne thing\nAnother thing\n") for n in pages]
+
+
+def broken_extract(path, pages):
+    raise AssertionError("page should have come from the cache")
+
+
+def test_parser_is_a_single_pass_state_machine():
+    questions = list(parse_pages([(0, PAGE)]))
+    assert [(q["number"], q["page"]) for q in questions] == [(1, 1), (2, 1)]
+    assert questions[0]["choices"] == ["The Product Owner", "The Developers working together with the Scrum Master"]
+    assert questions[1]["choices"] == ["True", "False"]
+
+    parser = QuestionParser()
+    assert parser.feed("7 What is the timebox of a Sprint?") is None
+    for line in ("At most one month", "2 Sprints"):
+        assert parser.feed(line) is None
+    assert parser.close()["choices"] == ["At most one month", "2 Sprints"]
+
+
+def test_correct_answers_come_from_answer_lines_or_the_answer_key():
+    page = """1 Who orders the Product Backlog?
+A. The Product Owner
+B. The Developers
+Correct answer: A
+The Product Owner is accountable for it.
+2 Which are Scrum events? (choose two)
+A. Sprint
+B. Release
+C. Daily Scrum
+Antwoord: B en C
+3 True or False: Scrum has a Project Manager.
+The answer is False
+4 What is the Increment?
+A. A document
+B. A stepping stone
+5 Who attends the Daily Scrum?
+A. The Developers
+B. The stakeholders
+Answer key
+4. B
+"""
+    questions = list(parse_pages([(0, page)]))
+    assert [q["number"] for q in questions] == [1, 2, 3, 4, 5]
+    assert [q.get("correct_index") for q in questions] == [0, 1, 1, 1, None]
+    assert questions[0]["choices"] == ["The Product Owner", "The Developers"]
+    assert questions[1]["correct_indices"] == [1, 2]
+
+
+def test_pages_are_extracted_in_parallel_once_and_cached(tmp_path):
+    pdf = tmp_path / "bank.pdf"
+    pdf.write_bytes(b"%PDF-fake")
+    cache = str(tmp_path / "cache")
+
+    first = list(iter_pages(str(pdf), workers=2, cache_dir=cache, extract=fake_extract, pages=5))
+    assert [n for n, _ in first] == [0, 1, 2, 3, 4]
+    again = list(iter_pages(str(pdf), cache_dir=cache, extract=broken_extract))
+    assert again == first
+    assert [q["number"] for q in parse_pages(iter(again))] == [1, 2, 3, 4, 5, 6]
+
+    pdf.write_bytes(b"%PDF-changed")  # new content, new cache key
+    with pytest.raises(AssertionError):
+        list(iter_pages(str(pdf), cache_dir=cache, extract=broken_extract, pages=1))
@@ -0,0 +1,152 @@
+import json
+
+import pytest
+
+from question_io import BulkFormatError, parse_body, validate_rows
+
+
+def test_parse_json_ndjson_and_csv():
+    rows, errors = parse_body(b'[{"text": "a"}]', "application/json")
+    assert rows == [{"text": "a"}] and errors == []
+
+    rows, errors = parse_body(b'{"text": "a"}\n\nnot json\n{"text": "b"}\n', "application/x-ndjson")
+    assert rows == [{"text": "a"}, None, {"text": "b"}]
+    assert errors[0]["row"] == 1
+
+    rows, _ = parse_body("text,choices,correct_index,correct_indices\nWat is 2 + 2?,3|4|5,1,1|2\n".encode(), "text/csv; charset=utf-8")
+    assert rows[0]["choices"] == ["3", "4", "5"] and rows[0]["correct_indices"] == ["1", "2"]
+
+    with pytest.raises(BulkFormatError):
+        parse_body(b"text\nx\n", "text/csv")
+    with pytest.raises(BulkFormatError):
+        parse_body(b'{"text": "a"}', "application/json")
+    with pytest.raises(BulkFormatError):
+        parse_body("text,choices,correct_index\nCafé?,a|b,0\n".encode("latin-1"), "text/csv")
+    with pytest.raises(BulkFormatError):
+        # a field over csv.field_size_limit()
+        parse_body(b"text,choices,correct_index\n" + b"x" * 200_000 + b",a|b,0\n", "text/csv")
+
+
+def test_validation_reports_every_bad_row():
+    valid, errors = validate_rows([
+        {"text": "ok", "choices": ["a", "b"], "correct_index": 1, "category": "PSPO1"},
+        {"text": "", "choices": ["a", "b"]},
+        {"text": "x", "choices": ["a"]},
+        {"text": "x", "choices": ["a", "b"], "correct_index": 5},
+        {"text": "x", "choices": ["a", "b"], "correct_index": 0, "category": "Astrologie"},
+        {"text": "x", "choices": ["a", "b"]},
+        {"text": "x", "choices": ["a", "b" * 501], "correct_index": 0},
+        {"text": "x", "choices": ["a", "b"], "correct_index": 0, "difficulty": 99999999},
+        {"text": "x", "choices": ["a", "b", "c"], "correct_index": 2, "correct_indices": [2, 0]},
+        {"text": "x", "choices": ["a", "b", "c"], "correct_index": [1, 2]},
+        {"text": "x", "choices": ["a", "b"], "correct_indices": [0, 2]},
+        {"text": "x", "choices": ["a", "b", "c"], "correct_index": 1, "correct_indices": [0, 2]},
+    ])
+    assert [i for i, _ in valid] == [0, 8, 9]
+    assert valid[0][1]["category"] == "PSPO1" and valid[0][1]["difficulty"] == 1
+    assert [(v["correct_index"], v["correct_indices"]) for _, v in valid[1:]] == [(2, [0, 2]), (1, [1, 2])]
+    assert [e["row"] for e in errors] == [1, 2, 3, 4, 5, 6, 7, 10, 11]
+    assert errors[4]["error"] == "correct_index is required"
+    assert errors[-1]["error"] == "correct_index must be one of correct_indices"
+
+
+def test_bulk_endpoint_inserts_in_one_go():
+    import webapi
+    from starlette.testclient import TestClient
+    client = TestClient(webapi.app)
+
+    rows = [{"text": f"Bulk {i}", "choices": ["a", "b", "c"], "correct_index": i % 3, "category": "PSPO1"} for i in range(5)]
+    rows[3]["correct_indices"] = [0, 2]
+    rows.insert(2, {"text": "", "choices": ["a", "b"]})
+    body = "\n".join(json.dumps(r) for r in rows).encode()
+    r = client.post("/api/admin/questions/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    data = r.json()
+    try:
+        assert r.status_code == 200
+        assert data["inserted"] == 5 and data["errors"] == [{"row": 2, "error": "Question text is required"}]
+        listed = client.get("/api/admin/questions", params={"after_id": data["ids"][0] - 1, "limit": 5}).json()
+        assert [q["text"] for q in listed] == [f"Bulk {i}" for i in range(5)]
+        assert [c["is_correct"] for c in listed[1]["choices"]] == [False, True, False]
+        assert [c["is_correct"] for c in listed[3]["choices"]] == [True, False, True]
+
+        strict = client.post("/api/admin/questions/bulk?strict=true", json=[{"text": "x", "choices": []}])
+        assert strict.status_code == 422
+    finally:
+        for qid in data.get("ids", []):
+            client.delete(f"/api/admin/questions/{qid}")
+
+
+def test_admin_endpoints_reject_out_of_range_values():
+    import webapi
+    from starlette.testclient import TestClient
+    client = TestClient(webapi.app)
+
+    question = {"text": "Bereik?", "choices": ["a", "b"], "correct_index": 0, "difficulty": 99999999}
+    assert client.post("/api/admin/questions", json=question).status_code == 400
+    created = client.post("/api/admin/questions", json={**question, "difficulty": 2}).json()
+    try:
+        assert client.patch(f"/api/admin/questions/{created['id']}", json={"difficulty": 0}).status_code == 400
+        assert client.patch(f"/api/admin/questions/{created['id']}", json={"choices": ["x"] * 27, "correct_index": 0}).status_code == 400
+    finally:
+        client.delete(f"/api/admin/questions/{created['id']}")
+
+
+def _bank_engine():
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+    from migrations import upgrade
+    from question_io import choice_rows, insert_statements, question_rows
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    upgrade(engine)
+    rows = [
+        {"text": "Wat is 2 + 2?", "choices": ["3", "4"], "correct_index": 1, "category": "general", "difficulty": 1},
+        {"text": "Rol, \"PO\"?", "choices": ["PO", "SM", "Dev"], "correct_index": 0, "category": "PSPO1", "difficulty": 2},
+        {"text": "Scrum-rollen?", "choices": ["PO", "SM", "Tester"], "correct_index": 0, "correct_indices": [0, 1],
+         "category": "PSPO1", "difficulty": 2},
+    ]
+    insert_questions, insert_choices = insert_statements()
+    with engine.begin() as conn:
+        ids = list(conn.execute(insert_questions, question_rows(rows)).scalars())
+        conn.execute(insert_choices, choice_rows(rows, ids))
+    return engine
+
+
+def test_export_formats_roundtrip():
+    import io
+    from question_io import export_chunks, iter_export_rows, parse_body, read_binary, validate_rows
+
+    engine = _bank_engine()
+    rows = list(iter_export_rows(engine, batch=1))
+    assert [(r["choices"], r["correct_indices"]) for r in rows] == [
+        (["3", "4"], [1]), (["PO", "SM", "Dev"], [0]), (["PO", "SM", "Tester"], [0, 1])]
+    assert [r["id"] for r in iter_export_rows(engine, "PSPO1")] == [rows[1]["id"], rows[2]["id"]]
+
+    # Re-importing an export keeps every correct choice
+    for fmt, media in (("ndjson", "application/x-ndjson"), ("csv", "text/csv")):
+        body = b"".join(export_chunks(iter_export_rows(engine), fmt, batch=1))
+        valid, errors = validate_rows(parse_body(body, media)[0])
+        assert errors == [] and [v["text"] for _, v in valid] == [r["text"] for r in rows]
+        assert [v["correct_indices"] for _, v in valid] == [[1], [0], [0, 1]]
+
+    body = b"".join(export_chunks(iter_export_rows(engine), "bin"))
+    assert list(read_binary(io.BytesIO(body))) == rows
+
+    # Rows stored before difficulty was range-checked still export
+    from models import Question
+    with engine.begin() as conn:
+        conn.execute(Question.__table__.update().values(difficulty=99_999_999))
+    body = b"".join(export_chunks(iter_export_rows(engine), "bin"))
+    assert [r["difficulty"] for r in read_binary(io.BytesIO(body))] == [99_999_999] * 3
+
+
+def test_export_endpoint_streams_attachment():
+    import webapi
+    from starlette.testclient import TestClient
+    client = TestClient(webapi.app)
+
+    r = client.get("/api/admin/export", params={"format": "csv", "category": "PSPO1"})
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/csv")
+    assert "attachment" in r.headers["content-disposition"]
+    assert r.text.splitlines()[0] == "id,text,choices,correct_index,correct_indices,category,difficulty"
+    assert client.get("/api/admin/export", params={"format": "xml"}).status_code == 422
@@ -36,6 +36,24 @@ def test_start_post_and_question_flow_smoke():
     assert q.status_code == 200
     js = q.json()
     assert 'question' in js or js.get('finished') is True
+
+
+def test_session_holds_question_ids_only():
+    webapi = _import_app()
+    from array import array
+    from starlette.testclient import TestClient
+    client = TestClient(webapi.app)
+
+    sid = client.post('/api/start').json()['session_id']
+    order = webapi.SESSIONS.get(sid).order
+    assert isinstance(order, array) and order.typecode == 'I'
+
+    q = client.get('/api/question', params={'sid': sid}).json()
+    assert q['question']['id'] == order[0]
+    assert 'answer' not in q['question']
+    r = client.post('/api/answer', params={'sid': sid}, json={'choice': 0}).json()
+    assert r['total'] == len(order)
+    assert webapi.SESSIONS.get(sid).index == 1
 import unittest, os
 from quiz_app.quiz import Quiz, load_questions
 class QuizTests(unittest.TestCase):
@@ -52,4 +70,93 @@ class QuizTests(unittest.TestCase):
         while self.quiz.has_next(): self.quiz.next_question(); count += 1
         self.assertEqual(count, len(self.questions))
         with self.assertRaises(IndexError): self.quiz.next_question()
+
+
+def test_admin_crud_roundtrip():
+    webapi = _import_app()
+    from starlette.testclient import TestClient
+    client = TestClient(webapi.app)
+
+    created = client.post('/api/admin/questions', json={
+        'text': 'CRUD?', 'choices': ['a', 'b'], 'correct_index': 1, 'category': 'PSPO1'})
+    assert created.status_code == 200
+    q = created.json()
+    assert q['category'] == 'PSPO1' and [c['is_correct'] for c in q['choices']] == [False, True]
+    assert all(c['id'] for c in q['choices'])
+
+    updated = client.patch(f"/api/admin/questions/{q['id']}", json={
+        'choices': ['x', 'y', 'z'], 'correct_index': 2}).json()
+    assert [c['text'] for c in updated['choices']] == ['x', 'y', 'z']
+    assert any(item['id'] == q['id'] for item in client.get('/api/admin/questions').json())
+
+    assert client.delete(f"/api/admin/questions/{q['id']}").status_code == 204
+    assert client.delete(f"/api/admin/questions/{q['id']}").status_code == 404
+
+
+def test_async_database_url_maps_drivers():
+    from db import async_database_url
+    assert async_database_url('postgresql://u:p@h/db') == 'postgresql+asyncpg://u:p@h/db'
+    assert async_database_url('postgresql+psycopg2://h/db') == 'postgresql+asyncpg://h/db'
+    assert async_database_url('sqlite:///./quiz.db') == 'sqlite+aiosqlite:///./quiz.db'
+
+
+def test_step_grades_and_returns_next_question():
+    webapi = _import_app()
+    from starlette.testclient import TestClient
+    client = TestClient(webapi.app)
+
+    sid = client.post('/api/start').json()['session_id']
+    first = client.get('/api/question', params={'sid': sid}).json()
+    r = client.post('/api/step', params={'sid': sid}, json={'choice': 0}).json()
+    assert set(r) >= {'correct', 'finished', 'score', 'total', 'correct_answers', 'next'}
+    # "next" is exactly what a following GET /api/question would return
+    assert r['next'] == client.get('/api/question', params={'sid': r['session_id']}).json()
+    if not r['finished']:
+        assert r['next']['index'] == first['index'] + 1
+        assert client.post('/api/step', params={'sid': sid}, json={'choice': 'x'}).status_code == 400
+
+
+def test_question_prefetch_returns_upcoming_without_answers():
+    webapi = _import_app()
+    from starlette.testclient import TestClient
+    client = TestClient(webapi.app)
+
+    sid = client.post('/api/start').json()['session_id']
+    order = list(webapi.SESSIONS.get(sid).order)
+    data = client.get('/api/question', params={'sid': sid, 'prefetch': 2}).json()
+    upcoming = data['upcoming']
+    assert [q['id'] for q in upcoming] == order[1:3]
+    assert [q['index'] for q in upcoming] == list(range(1, len(upcoming) + 1))
+    assert all('correct_answers' not in q and 'answer' not in q for q in upcoming)
+    assert 'upcoming' not in client.get('/api/question', params={'sid': sid}).json()
+    assert client.get('/api/question', params={'sid': sid, 'prefetch': 1000}).status_code == 422
+
+
+def test_admin_listing_is_keyset_paginated_and_streams_ndjson():
+    webapi = _import_app()
+    from starlette.testclient import TestClient
+    client = TestClient(webapi.app)
+
+    ids = [client.post('/api/admin/questions', json={
+        'text': f'Page {i}', 'choices': ['a', 'b'], 'correct_index': 0, 'category': 'PSPO1', 'difficulty': 3,
+    }).json()['id'] for i in range(3)]
+    try:
+        seen, after = [], ids[0] - 1
+        while True:
+            r = client.get('/api/admin/questions', params={'after_id': after, 'limit': 2, 'difficulty': 3, 'category': 'PSPO1'})
+            seen += [q['id'] for q in r.json()]
+            if 'x-next-after-id' not in r.headers:
+                break
+            after = int(r.headers['x-next-after-id'])
+        assert seen[:3] == ids
+
+        r = client.get('/api/admin/questions', params={'format': 'ndjson', 'after_id': ids[0] - 1, 'difficulty': 3})
+        assert r.headers['content-type'].startswith('application/x-ndjson')
+        lines = [json.loads(line) for line in r.text.splitlines()]
+        assert [q['id'] for q in lines][:3] == ids
+    finally:
+        for qid in ids:
+            client.delete(f'/api/admin/questions/{qid}')
+
+
 if __name__ == '__main__': unittest.main()
@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+from learning_stats import LearnerStats
+from personalized_learning import RecommendationCache
+
+
+def test_cache_expires_and_follows_meaningful_changes():
+    stats, now = LearnerStats(), [0.0]
+    cache = RecommendationCache(stats, SimpleNamespace(use_caching=True, cache_ttl_seconds=60), clock=lambda: now[0])
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    for _ in range(20):
+        stats.record("u1", "PSPO1", True)
+    assert cache.get("recommendations", "u1", "PSPO1", compute) == 1
+    assert cache.get("recommendations", "u1", "PSPO1", compute) == 1
+    stats.record("u1", "PSPO1", True)  # 21 of 21 correct: nothing the engine would act on
+    assert cache.get("recommendations", "u1", "PSPO1", compute) == 1
+    for _ in range(5):
+        stats.record("u1", "PSPO1", False)  # recent accuracy drops a band
+    assert cache.get("recommendations", "u1", "PSPO1", compute) == 2
+    now[0] = 61
+    assert cache.get("recommendations", "u1", "PSPO1", compute) == 3
+
+    cache.config.use_caching = False
+    assert cache.get("recommendations", "u1", "PSPO1", compute) == 4
+
+
+def test_recommendation_endpoints_use_answers():
+    import webapi
+    from starlette.testclient import TestClient
+    client = TestClient(webapi.app)
+
+    sid = client.post("/api/start", params={"category": "Verpleegkundig Rekenen", "user_id": "learner-23"}).json()["session_id"]
+    for _ in range(5):
+        client.post("/api/answer", params={"sid": sid}, json={"choice": 0, "latency_ms": 20000})
+
+    body = client.get("/api/ai/recommendations", params={"user_id": "learner-23"}).json()
+    assert [r["category"] for r in body["recommendations"]] == ["Verpleegkundig Rekenen"]
+    assert body["recommendations"][0]["action"] == "practice_more"  # fewer than 20 answers
+
+    params = client.get("/api/ai/next-params", params={"sid": sid}).json()
+    assert (params["user_id"], params["category"]) == ("learner-23", "Verpleegkundig Rekenen")
+    assert 1 <= params["difficulty"] <= 5 and params["estimated_time"] == 22
+
+    assert client.get("/api/ai/recommendations", params={"user_id": "nobody"}).json()["recommendations"] == []
+    client.cookies.clear()
+    assert client.get("/api/ai/next-params").status_code == 400
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.pool import StaticPool
+
+from answer_log import AnswerLog
+from migrations import upgrade
+from review_scheduler import apply_answers, due_ids, grade, review_items, schedule
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_sm2_intervals_grow_and_a_miss_resets_them():
+    state = schedule(None, grade(True), T0)
+    assert (state.interval_days, state.repetitions, state.due_at) == (1.0, 1, T0 + timedelta(days=1))
+    state = schedule(state, grade(True), state.due_at)
+    assert state.interval_days == 6.0
+    state = schedule(state, grade(True, latency_ms=2000), state.due_at)
+    assert state.interval_days == 6.0 * state.ease / 100 and state.ease == 260
+    missed = schedule(state, grade(False), state.due_at)
+    assert (missed.repetitions, missed.lapses, missed.ease) == (0, 1, 206)
+    assert missed.due_at == state.due_at + timedelta(minutes=10)
+
+
+def test_answer_batches_maintain_the_due_index():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    upgrade(engine)
+    log = AnswerLog(engine)
+    log.listeners.append(apply_answers)
+    log.record("s1", 1, "PSPO1", 0, True, user_id="u1", answered_at=T0)
+    log.record("s1", 2, "PSPO1", 0, False, user_id="u1", answered_at=T0)
+    log.record("s1", 3, "PSPO1", 0, True, user_id=None, answered_at=T0)  # anonymous: no review state
+    log.flush()
+    log.record("s2", 1, "PSPO1", 1, True, user_id="u1", answered_at=T0 + timedelta(days=1))
+    log.flush()
+
+    with engine.connect() as conn:
+        rows = {r.question_id: r for r in conn.execute(select(review_items))}
+    assert set(rows) == {1, 2} and (rows[1].repetitions, rows[2].lapses) == (2, 1)
+    assert due_ids(engine, "u1", "PSPO1", now=T0 + timedelta(hours=1)) == [2]
+    assert due_ids(engine, "u1", "PSPO1", now=T0 + timedelta(days=30)) == [2, 1]
+    assert due_ids(engine, "u1", "PSPO1", limit=1, now=T0 + timedelta(days=30)) == [2]
+    assert due_ids(engine, "u1", "general", now=T0 + timedelta(days=30)) == []
+
+
+def test_review_mode_serves_due_questions():
+    import webapi
+    from starlette.testclient import TestClient
+    client = TestClient(webapi.app)
+
+    user = f"review-{uuid4().hex[:8]}"  # quiz.db outlives the test run
+    assert client.post("/api/start", params={"mode": "review"}).status_code == 400
+    sid = client.post("/api/start", params={"category": "Verpleegkundig Rekenen", "user_id": user}).json()["session_id"]
+    missed = client.get("/api/question", params={"sid": sid}).json()["question"]["id"]
+    client.post("/api/answer", params={"sid": sid}, json={"choice": 99})
+    webapi.ANSWER_LOG.flush()
+
+    params = {"category": "Verpleegkundig Rekenen", "user_id": user, "mode": "review"}
+    early = client.post("/api/start", params=params)
+    assert early.status_code == 404 and "next:" in early.json()["detail"]
+
+    with webapi.engine.begin() as conn:
+        conn.execute(update(review_items).where(review_items.c.user_id == user)
+                     .values(due_at=datetime.now(timezone.utc) - timedelta(minutes=1)))
+    review = client.post("/api/start", params=params).json()
+    assert review["mode"] == "review"
+    question = client.get("/api/question", params={"sid": review["session_id"]}).json()
+    assert (question["question"]["id"], question["total"]) == (missed, 1)
@@ -0,0 +1,61 @@
+import pytest
+
+from search_index import matching_choices, tokens
+
+
+def test_query_tokens_drop_operators():
+    assert tokens('owner" OR NEAR(x) *back-log') == ["owner", "OR", "NEAR", "x", "back", "log"]
+    assert tokens("  ") == []
+    assert matching_choices("prod own", ["Scrum Master", "Product Owner", "Team"]) == [1]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Test client whose admin and search endpoints run against a scratch database."""
+    import webapi
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from starlette.testclient import TestClient
+    from db import ThreadedSession, get_async_db
+    from dedup import BankDuplicates
+    from migrations import upgrade
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'quiz.db'}", connect_args={"check_same_thread": False})
+    upgrade(engine)
+    sessions = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async def scratch_db():
+        db = ThreadedSession(sessions())
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    monkeypatch.setattr(webapi, "engine", engine)
+    monkeypatch.setattr(webapi, "DUPLICATES", BankDuplicates(engine))
+    monkeypatch.setitem(webapi.app.dependency_overrides, get_async_db, scratch_db)
+    yield TestClient(webapi.app)
+    engine.dispose()
+
+
+def test_search_endpoint_tracks_admin_changes(client):
+    created = client.post("/api/admin/questions", json={
+        "text": "Who orders the Xylofoonbacklog items?", "choices": ["Developers", "Xylofoonowner"],
+        "correct_index": 1, "category": "PSPO1",
+    }).json()
+    bulk = client.post("/api/admin/questions/bulk", json=[
+        {"text": "Zebraquestion about nothing", "choices": ["Xylofoonowner", "Nobody"], "correct_index": 0},
+    ]).json()
+    hits = client.get("/api/admin/questions/search", params={"q": "xylofoon"}).json()
+    assert [h["id"] for h in hits] == [created["id"], bulk["ids"][0]]  # question text ranks first
+    assert "<mark>" in hits[0]["snippet"]
+    assert hits[1]["matched_choices"] == [0]
+
+    page = client.get("/api/admin/questions/search", params={"q": "xylofoon", "limit": 1})
+    assert page.headers["X-Next-Offset"] == "1"
+    assert client.get("/api/admin/questions/search", params={"q": "xylofoon", "category": "PSPO1"}).json()[0]["id"] == created["id"]
+
+    client.patch(f"/api/admin/questions/{created['id']}", json={"text": "Renamed question"})
+    assert [h["id"] for h in client.get("/api/admin/questions/search", params={"q": "renamed"}).json()] == [created["id"]]
+    client.delete(f"/api/admin/questions/{bulk['ids'][0]}")
+    assert client.get("/api/admin/questions/search", params={"q": "zebraquestion"}).json() == []
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("requests")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+import seed_questions  # noqa: E402
+
+
+def test_read_rows_splits_csv_choices(tmp_path):
+    path = tmp_path / "bank.csv"
+    path.write_text('text,choices,correct_index\n"Wat is 2 + 2?","3|4|5",1\n')
+    assert seed_questions.read_rows(str(path)) == [
+        {"text": "Wat is 2 + 2?", "choices": ["3", "4", "5"], "correct_index": "1"}]
+
+
+def test_checkpoint_resumes_only_for_same_input(tmp_path):
+    path = str(tmp_path / "bank.checkpoint.json")
+    seed_questions.Checkpoint(path, "abc:500").mark(3)
+    assert seed_questions.Checkpoint(path, "abc:500").done == {3}
+    assert seed_questions.Checkpoint(path, "abc:1000").done == set()
+    assert seed_questions.Checkpoint(path, "abc:500", restart=True).done == set()
+
+
+def test_failed_batches_are_retried_on_the_next_run(tmp_path, monkeypatch):
+    path = tmp_path / "bank.json"
+    path.write_text('[' + ','.join('{"text": "q%d", "choices": ["a", "b"]}' % i for i in range(5)) + ']')
+    calls = []
+
+    def flaky(session, rows, timeout, dedup=False):
+        calls.append(rows[0]["text"])
+        if rows[0]["text"] == "q2" and calls.count("q2") == 1:
+            raise seed_questions.requests.ConnectionError("boom")
+        return {"inserted": len(rows), "errors": []}
+
+    monkeypatch.setattr(seed_questions, "upload", flaky)
+    assert seed_questions.main([str(path), "--batch-size", "2", "--concurrency", "1"]) == 1
+    assert seed_questions.main([str(path), "--batch-size", "2", "--concurrency", "1"]) == 0
+    assert sorted(calls) == ["q0", "q2", "q2", "q4"]
+    assert not os.path.exists(str(path) + ".checkpoint.json")
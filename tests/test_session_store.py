@@ -0,0 +1,141 @@
+from array import array
+
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.pool import StaticPool
+
+from session_store import (
+    MemorySessionStore, QuizSession, RedisSessionStore, SQLSessionStore,
+    create_session_store, pack_order, unpack_order,
+)
+
+
+def _sql_store():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    return SQLSessionStore(engine)
+
+
+def _redis_store():
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisSessionStore("redis://unused", client=fakeredis.FakeRedis())
+
+
+@pytest.fixture(params=["memory", "sql", "redis"])
+def store(request):
+    if request.param == "memory":
+        return MemorySessionStore()
+    if request.param == "sql":
+        return _sql_store()
+    return _redis_store()
+
+
+def test_order_roundtrip():
+    order = array("I", [5, 1, 4_000_000_000])
+    assert unpack_order(pack_order(order)) == order
+
+
+def test_create_and_get(store):
+    sid = store.create(QuizSession(category="PSPO1", order=array("I", [3, 1, 2])))
+    s = store.get(sid)
+    assert s.sid == sid
+    assert s.category == "PSPO1"
+    assert list(s.order) == [3, 1, 2]
+    assert (s.index, s.score, s.total) == (0, 0, 3)
+    assert store.get("missing") is None
+
+
+def test_advance_is_compare_and_set(store):
+    sid = store.create(QuizSession(category=None, order=array("I", [1, 2, 3])))
+    s = store.advance(sid, 0, 1, True)
+    assert (s.index, s.score) == (1, 1)
+    # A replayed answer for the same index is rejected
+    assert store.advance(sid, 0, 1, True) is None
+    s = store.advance(sid, 1, 3, False)
+    assert (s.index, s.score) == (3, 1)
+
+
+def test_delete(store):
+    sid = store.create(QuizSession(category=None, order=array("I", [1])))
+    store.delete(sid)
+    assert store.get(sid) is None
+
+
+def test_factory_rejects_unknown_backend():
+    assert isinstance(create_session_store("memory"), MemorySessionStore)
+    with pytest.raises(ValueError):
+        create_session_store("carrier-pigeon")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_memory_store_expires_idle_sessions():
+    clock = _Clock()
+    store = MemorySessionStore(ttl_seconds=60, clock=clock)
+    old = store.create(QuizSession(category=None, order=array("I", [1, 2])))
+    clock.now += 50
+    fresh = store.create(QuizSession(category=None, order=array("I", [1, 2])))
+    clock.now += 20
+    assert store.get(old) is None
+    assert store.get(fresh) is not None
+    clock.now += 61
+    assert store.reap() == 1
+    stats = store.stats()
+    assert stats["live"] == 0 and stats["expired"] == 2 and stats["approx_bytes"] == 0
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemorySessionStore(max_sessions=2)
+    a = store.create(QuizSession(category=None, order=array("I", [1])))
+    b = store.create(QuizSession(category=None, order=array("I", [1])))
+    store.get(a)  # a is now more recent than b
+    c = store.create(QuizSession(category=None, order=array("I", [1])))
+    assert store.get(b) is None
+    assert store.get(a) is not None and store.get(c) is not None
+    assert store.stats()["evicted"] == 1
+
+
+def test_sql_store_reaps_expired_rows():
+    clock = _Clock()
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    store = SQLSessionStore(engine, ttl_seconds=60, clock=clock)
+    # A separate session database gets its own table and nothing else
+    assert inspect(engine).get_table_names() == ["quiz_sessions"]
+    sid = store.create(QuizSession(category=None, order=array("I", [1, 2, 3])))
+    assert store.stats()["live"] == 1
+    clock.now += 61
+    assert store.get(sid) is None
+    assert store.reap() == 1
+    assert store.stats()["live"] == 0
+
+
+def test_redis_store_counts_live_sessions_without_scanning():
+    fakeredis = pytest.importorskip("fakeredis")
+    clock = _Clock()
+    client = fakeredis.FakeRedis()
+    store = RedisSessionStore("redis://unused", client=client, ttl_seconds=60, clock=clock)
+    client.scan_iter = None  # stats() must not walk the keyspace
+    a = store.create(QuizSession(category=None, order=array("I", [1, 2])))
+    b = store.create(QuizSession(category=None, order=array("I", [1, 2])))
+    store.delete(b)
+    assert store.stats()["live"] == 1
+    clock.now += 50
+    store.advance(a, 0, 1, True)  # an answer pushes the expiry back
+    clock.now += 50
+    assert store.stats()["live"] == 1
+    clock.now += 11
+    assert store.stats()["live"] == 0 and store.stats()["approx_bytes"] == 0
+
+
+def test_every_backend_reports_live_sessions_and_size(store):
+    for _ in range(3):
+        store.create(QuizSession(category=None, order=array("I", range(100))))
+    stats = store.stats()
+    assert stats["live"] == 3
+    assert stats["approx_bytes"] >= 3 * 400
+    assert {"expired", "ttl_seconds"} <= set(stats)
@@ -0,0 +1,75 @@
+from array import array
+
+import pytest
+
+from bank_cache import BankCache
+from session_store import QuizSession
+from session_tokens import SeededOrder, TokenSessionStore
+
+
+def _store(ids=range(1, 51)):
+    questions = [{"id": i, "text": f"Q{i}", "choices": ("a", "b"), "answer": 0, "correct_answers": (0,)} for i in ids]
+    return TokenSessionStore(b"test-secret", BankCache(lambda category: questions))
+
+
+def test_seeded_order_is_a_deterministic_permutation():
+    ids = array("I", range(100, 1100))
+    order = SeededOrder(ids, seed=42)
+    assert sorted(order) == list(ids)
+    assert list(order) == list(SeededOrder(ids, seed=42))
+    assert list(order) != list(SeededOrder(ids, seed=43))
+    assert len(SeededOrder(ids, seed=42, length=80)) == 80
+
+
+def test_token_roundtrip_and_advance():
+    store = _store()
+    bank = store.bank_cache.get("PSPO1")
+    sid = store.create(QuizSession(category="PSPO1", order=store.new_order(bank)))
+    s = store.get(sid)
+    assert (s.category, s.index, s.score, s.total) == ("PSPO1", 0, 0, 50)
+
+    s2 = store.advance(sid, 0, 1, True)
+    assert (s2.index, s2.score) == (1, 1)
+    assert s2.sid != sid
+    assert list(s2.order) == list(s.order)
+    # The old token is for index 0; answering it again from index 1 is refused
+    assert store.advance(s2.sid, 0, 1, True) is None
+
+
+def test_tampered_or_foreign_tokens_are_rejected():
+    store = _store()
+    bank = store.bank_cache.get(None)
+    sid = store.create(QuizSession(category=None, order=store.new_order(bank)))
+    tampered = sid[:-2] + ("AA" if sid[-2:] != "AA" else "BB")
+    assert store.get(tampered) is None
+    assert store.get("not-a-token") is None
+    other = TokenSessionStore(b"other-secret", store.bank_cache)
+    assert other.get(sid) is None
+
+
+def test_bank_change_invalidates_token():
+    ids = list(range(1, 11))
+    questions = lambda category: [{"id": i, "text": "", "choices": (), "answer": None, "correct_answers": ()} for i in ids]
+    store = TokenSessionStore(b"s", BankCache(questions))
+    sid = store.create(QuizSession(category=None, order=store.new_order(store.bank_cache.get(None))))
+    ids.append(11)
+    store.bank_cache.invalidate()
+    assert store.get(sid) is None
+
+
+def test_token_sessions_serve_generated_nursing_questions(monkeypatch):
+    import webapi
+    from nursing_generator import is_generated
+    from starlette.testclient import TestClient
+
+    if webapi.NURSING_BANK is None:
+        pytest.skip("NURSING_GENERATOR=0")
+    monkeypatch.setattr(webapi, "SESSIONS", TokenSessionStore(b"s", bank_for=webapi.bank_for))
+    client = TestClient(webapi.app)
+    r = client.post("/api/start", params={"category": "Verpleegkundig Rekenen", "count": 5})
+    assert r.status_code == 200
+    sid = r.json()["session_id"]
+    q = client.get("/api/question", params={"sid": sid}).json()
+    assert is_generated(q["question"]["id"])
+    step = client.post("/api/step", params={"sid": sid}, json={"choice": 0}).json()
+    assert step["total"] == 5 and step["next"]["index"] == 1
@@ -0,0 +1,51 @@
+import gzip
+
+from static_assets import IMMUTABLE, REVALIDATE, StaticAssets
+
+
+def _site(tmp_path):
+    (tmp_path / "app.js").write_text("console.log('quiz');\n" * 100)
+    (tmp_path / "index.html").write_text(
+        '<link href="/static/styles.css?v=1"><script src="/static/app.js?v=20251109L"></script>'
+        "<script>s.src = '/static/missing.js';</script>")
+    (tmp_path / "styles.css").write_text("body{}")
+    return StaticAssets(str(tmp_path)).load()
+
+
+def test_html_references_point_at_fingerprinted_names(tmp_path):
+    assets = _site(tmp_path)
+    html = assets.page("index.html").body.decode()
+    hashed_js = assets.hashed_names["app.js"]
+    assert hashed_js.startswith("app.") and hashed_js.endswith(".js") and hashed_js != "app.js"
+    assert f'src="/static/{hashed_js}"' in html
+    assert f'href="/static/{assets.hashed_names["styles.css"]}"' in html
+    assert "'/static/missing.js'" in html
+    assert assets.page("index.html").cache_control == REVALIDATE
+
+
+def test_hashed_assets_are_immutable_and_precompressed(tmp_path):
+    assets = _site(tmp_path)
+    asset = assets.get(assets.hashed_names["app.js"])
+    assert asset.cache_control == IMMUTABLE
+    assert assets.get("app.js").cache_control == REVALIDATE
+    encoding, body = asset.select("gzip, deflate")
+    assert encoding == "gzip" and gzip.decompress(body) == asset.body
+    assert asset.select("identity") == (None, asset.body)
+    # Too small to be worth compressing
+    assert assets.get("styles.css").encoded == {}
+
+
+def test_app_serves_assets_from_memory_with_revalidation():
+    import webapi
+    from starlette.testclient import TestClient
+    client = TestClient(webapi.app)
+
+    index = client.get("/")
+    assert index.headers["cache-control"] == REVALIDATE
+    assert client.get("/", headers={"If-None-Match": index.headers["etag"]}).status_code == 304
+    hashed = webapi.STATIC.hashed_names["app.js"]
+    assert f"/static/{hashed}" in index.text
+    r = client.get(f"/static/{hashed}")
+    assert r.status_code == 200 and r.headers["cache-control"] == IMMUTABLE
+    assert "application/javascript" in r.headers["content-type"]
+    assert client.get("/static/nope.js").status_code == 404
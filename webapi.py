@@ -1,24 +1,44 @@
 import os
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request, Response, Depends, status, Query
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from starlette.concurrency import run_in_threadpool
 import secrets
-from uuid import uuid4
-from typing import Dict
+from array import array
+from itertools import islice
 from typing import List, Dict
-from sqlalchemy import func, text
-from sqlalchemy.orm import selectinload, Session
-from db import Base, engine, SessionLocal
-from models import Question, Choice
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from db import engine, async_session, get_async_db
+from db import SessionLocal  # noqa: F401  (test_api.py imports it from here)
+from models import Question, Choice, CATEGORIES, GENERAL, NURSING
+from adaptive import ADAPTIVE_SESSION_SIZE
+from answer_log import AnswerLog, latency_from
+import review_scheduler
+from learning_stats import LEARNER_STATS
+from migrations import upgrade as run_migrations
+from bank_cache import BANK_CACHE, bump_generation, category_key
+from nursing_generator import GeneratedBank
+from session_store import QuizSession, create_session_store
+from static_assets import Asset, StaticAssets
+from json_response import FastJSONResponse, dumps
+from question_io import (
+    EXPORT_FORMATS, MAX_BULK_ROWS, BulkFormatError, choice_rows, export_chunks, insert_statements,
+    iter_export_rows, parse_body, question_rows, range_error, validate_rows,
+)
+import search_index
+from dedup import BankDuplicates, check_batch
+from ai_config import get_ai_config
+from personalized_learning import get_adaptive_question_params, get_user_recommendations, recommendation_cache
 from pydantic import BaseModel
 
 # AI imports
 try:
     from ai_config import validate_ai_setup
     from question_generator import generate_questions_for_category, enhance_question_with_ai
-    from personalized_learning import get_user_recommendations, get_adaptive_question_params
     from ai_chatbot import start_chat, chat_with_assistant, get_question_explanation
     AI_AVAILABLE = True
     print("✅ AI features enabled")
@@ -28,7 +48,50 @@ except ImportError as e:
 
 
 
-app = FastAPI(title="Quiz App API")
+SESSION_REAP_INTERVAL = float(os.environ.get("SESSION_REAP_INTERVAL", "60"))
+
+
+async def reap_sessions_forever():
+    """Background task: drop expired sessions every SESSION_REAP_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(SESSION_REAP_INTERVAL)
+        try:
+            await run_in_threadpool(SESSIONS.reap)
+        except Exception as e:
+            print(f"⚠️  Session reaper failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Record the shared bank generations first, so a write landing during the warm-up is noticed
+    try:
+        await run_in_threadpool(BANK_CACHE.sync, engine)
+    except Exception as e:
+        print(f"⚠️  Could not read bank generations: {e}")
+    # Warm the question banks without blocking the event loop or a worker thread
+    for category in (None, *CATEGORIES):
+        try:
+            await BANK_CACHE.aget(category)
+        except Exception as e:
+            print(f"⚠️  Could not preload questions for {category or 'general'}: {e}")
+    # Per-user aggregates for the learning analytics, rebuilt from the answer log
+    try:
+        await run_in_threadpool(LEARNER_STATS.load, engine)
+    except Exception as e:
+        print(f"⚠️  Could not load learner statistics: {e}")
+    reaper = asyncio.create_task(reap_sessions_forever())
+    ANSWER_LOG.start()
+    # Pick up admin writes made through other replicas (see bank_cache.py)
+    BANK_CACHE.start_sync(engine)
+    try:
+        yield
+    finally:
+        reaper.cancel()
+        await run_in_threadpool(BANK_CACHE.stop_sync)
+        await run_in_threadpool(ANSWER_LOG.stop)
+
+
+app = FastAPI(title="Quiz App API", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Basic Auth setup for /admin
 security = HTTPBasic()
@@ -45,8 +108,8 @@ def set_admin_pass(new_pass: str):
     with open(ADMIN_PASS_FILE, "w") as f:
         f.write(new_pass.strip())
 
-# Ensure tables exist (idempotent)
-Base.metadata.create_all(engine)
+# Bring the schema up to date (idempotent; see migrations/)
+run_migrations(engine)
 
 
 # Allow same-origin requests (static files served from same host). Adjust if serving frontend separately.
@@ -59,51 +122,67 @@ app.add_middleware(
 )
 
 
-# In-memory session store: session_id -> {questions, index, score}
-SESSIONS: Dict[str, Dict] = {}
+# 'Verpleegkundig Rekenen' questions are generated from templates (nursing_generator.py);
+# NURSING_GENERATOR=0 serves the stored rows instead
+NURSING_BANK = GeneratedBank() if os.environ.get("NURSING_GENERATOR", "1") != "0" else None
 
 
-# Load questions from the database and adapt to current questionnaire format
-def load_questions_from_db(category=None) -> List[Dict]:
-    db = SessionLocal()
-    try:
-        # Filter by category with strict separation
-        query = db.query(Question).options(selectinload(Question.choices))
-        
-        if category == 'PSPO1':
-            # Only PSPO1 questions
-            query = query.filter(Question.explanation == 'PSPO1')
-        elif category == 'Verpleegkundig Rekenen':
-            # Only nursing questions
-            query = query.filter(Question.explanation == 'Verpleegkundig Rekenen')
-        else:
-            # General quiz: only questions without specific category (explanation IS NULL)
-            query = query.filter(Question.explanation.is_(None))
-        
-        # Get questions in random order using SQLAlchemy func.random()
-        qs = query.order_by(func.random()).all()
-        out = []
-        for q in qs:
-            choices = [c.text for c in q.choices]
-            # Handle multiple correct answers
-            correct_indices = [i for i, c in enumerate(q.choices) if c.is_correct]
-            # For backward compatibility, use first correct answer as "answer"
-            ans_idx = correct_indices[0] if correct_indices else None
-            out.append({"text": q.text, "choices": choices, "answer": ans_idx, "correct_answers": correct_indices})
-        return out
-    finally:
-        db.close()
+def bank_for(category):
+    if NURSING_BANK is not None and category_key(category) == NURSING:
+        return NURSING_BANK
+    return BANK_CACHE.get(category)
 
 
-def make_session(category=None):
-    # Prefer DB questions; if empty, keep compatibility with JSON fallback
-    questions = load_questions_from_db(category)
-    if not questions:
-        from quiz_app import load_questions as _json_loader
-        questions = _json_loader()
-    sid = str(uuid4())
-    SESSIONS[sid] = {"questions": questions, "index": 0, "score": 0, "category": category}
-    return sid
+# Session store: session_id -> QuizSession (question-id permutation, index, score).
+# Backend selected by SESSION_BACKEND (memory, sql, redis, token); see session_store.py.
+SESSIONS = create_session_store(bank_for=bank_for)
+
+# Graded answers, written to the answers table in batches (see answer_log.py)
+ANSWER_LOG = AnswerLog(engine)
+# Spaced-repetition state follows the answers, in the log's write transactions
+ANSWER_LOG.listeners.append(review_scheduler.apply_answers)
+
+
+# Upper bound for ?prefetch=N on /api/question and /api/step
+MAX_PREFETCH = 50
+
+
+def adaptive_pick(bank, user_id, category, order, session_performance=None):
+    """Next question for an adaptive session: the learning engine's target difficulty and topics, unseen ids only."""
+    params = get_adaptive_question_params(user_id or "", category_key(category) or GENERAL, session_performance)
+    return bank.buckets().pick(params["difficulty"], params.get("topics", ()), seen=set(order))
+
+
+def review_order(bank, user_id, category, count):
+    """The user's most overdue review questions that are still in the bank."""
+    if not user_id:
+        raise HTTPException(status_code=400, detail="Review sessions need a user_id")
+    category = category_key(category) or GENERAL
+    ids = review_scheduler.due_ids(engine, user_id, category, count or review_scheduler.REVIEW_SESSION_SIZE)
+    order = array("I", (qid for qid in ids if qid in bank.by_id))
+    if not order:
+        with engine.connect() as conn:
+            next_due = conn.execute(review_scheduler.next_due_query(user_id, category)).scalar()
+        detail = "No questions due for review"
+        raise HTTPException(status_code=404, detail=f"{detail} (next: {next_due:%Y-%m-%d %H:%M} UTC)" if next_due else detail)
+    return order
+
+
+# Questions come from the in-process bank snapshot; a session only holds their order
+def make_session(category=None, count=None, user_id=None, mode=None):
+    bank = bank_for(category)
+    if mode is not None and not SESSIONS.explicit_orders:
+        raise HTTPException(status_code=400, detail=f"mode={mode} needs the memory, sql or redis session backend")
+    if mode == "review":
+        order = review_order(bank, user_id, category, count)
+        return SESSIONS.create(QuizSession(category=category, order=order, user_id=user_id, mode=mode))
+    if mode == "adaptive":
+        first = adaptive_pick(bank, user_id, category, ())
+        order = array("I", [] if first is None else [first])
+        length = min(count or ADAPTIVE_SESSION_SIZE, len(bank))
+        return SESSIONS.create(QuizSession(category=category, order=order, user_id=user_id, mode=mode, length=length))
+    count = count or getattr(bank, "session_size", None)
+    return SESSIONS.create(QuizSession(category=category, order=SESSIONS.new_order(bank, count), user_id=user_id))
 
 
 def get_session(sid: str):
@@ -112,30 +191,51 @@ def get_session(sid: str):
         raise HTTPException(status_code=404, detail="Session not found")
     return s
 
-# --- DB dependency (wrap SessionLocal) ---
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+def questions_from(s: QuizSession, idx: int, bank=None):
+    """Yield (index, question) from position idx on, skipping questions deleted since the session started."""
+    bank = bank or bank_for(s.category)
+    order = s.order
+    while idx < len(order):
+        q = bank.by_id.get(order[idx])
+        if q is not None:
+            yield idx, q
+        idx += 1
+
+
+def current_question(s: QuizSession):
+    """Return (index, question) for the session, or (total, None) when finished."""
+    return next(questions_from(s, s.index), (len(s.order), None))
+
 
 # --- Pydantic schemas for admin CRUD ---
 class QuestionCreate(BaseModel):
     text: str
     choices: List[str]
     correct_index: int
+    category: str | None = None
+    difficulty: int | None = None
 
 class QuestionUpdate(BaseModel):
     text: str | None = None
     choices: List[str] | None = None
     correct_index: int | None = None
+    category: str | None = None
+    difficulty: int | None = None
+
+def apply_category(q: Question, category: str | None):
+    """Set the category column, mirroring it into explanation for the legacy readers."""
+    category = category_key(category) or GENERAL
+    q.category = category
+    q.explanation = None if category == GENERAL else category
 
 # --- Serializer helper ---
 def serialize_question(q: Question) -> Dict:
     return {
         "id": q.id,
         "text": q.text,
+        "category": q.category,
+        "difficulty": q.difficulty,
         "choices": [
             {"id": c.id, "text": c.text, "is_correct": c.is_correct}
             for c in q.choices
@@ -144,97 +244,337 @@ def serialize_question(q: Question) -> Dict:
 
 
 @app.post("/api/start")
-def api_start(response: Response, category: str = Query(None)):
-    """Start a new quiz session with optional category. Returns session id in cookie."""
-    sid = make_session(category)
+def api_start(response: Response, category: str = Query(None), count: int = Query(None, ge=1, le=1000),
+              user_id: str = Query(None, max_length=64), mode: str = Query(None, pattern="^(adaptive|review)$")):
+    """Start a new quiz session with optional category and length. Returns session id in cookie.
+
+    Without `count` the whole category is served; with it, `count` questions
+    are sampled at random (e.g. count=80 for a PSPO1 mock exam). Answers are
+    logged under `user_id` when given.
+
+    mode=adaptive picks every next question after the previous answer, at
+    the difficulty and topics the learning engine recommends for the user
+    (`count` questions, default ADAPTIVE_SESSION_SIZE).
+
+    mode=review serves the user's most overdue spaced-repetition reviews
+    (`count`, default REVIEW_SESSION_SIZE); 404 when nothing is due.
+    """
+    sid = make_session(category, count, user_id, mode)
     # set cookie for client convenience
     response.set_cookie(key="quiz_session", value=sid, httponly=False)
-    return {"session_id": sid, "category": category}
+    return {"session_id": sid, "category": category, "mode": mode}
 
 
-@app.get("/api/question")
-def api_question(sid: str = None, request: Request = None):
-    """Return the next question for the session. Provide sid as query param or cookie 'quiz_session'."""
+def session_id_from(sid: str, request: Request) -> str:
     if sid is None:
         sid = request.cookies.get("quiz_session")
     if not sid:
         raise HTTPException(status_code=400, detail="No session id provided")
-    s = get_session(sid)
-    idx = s["index"]
-    if idx >= len(s["questions"]):
+    return sid
+
+
+def question_response(s: QuizSession, prefetch: int = 0) -> Dict:
+    # Question bodies come pre-encoded from the bank snapshot; return via FastJSONResponse
+    bank = bank_for(s.category)
+    idx, q = next(questions_from(s, s.index, bank), (s.total, None))
+    if q is None:
         return {"finished": True}
-    q = s["questions"][idx].copy()
-    # remove the answer from the payload
-    q.pop("answer", None)
-    return {"finished": False, "question": q, "index": idx, "total": len(s["questions"])}
+    out = {"finished": False, "question": bank.payload_json(q["id"]), "index": idx, "total": s.total}
+    if prefetch:
+        out["upcoming"] = [bank.preview_json(u["id"], i) for i, u in islice(questions_from(s, idx + 1, bank), prefetch)]
+    return out
 
 
-@app.post("/api/answer")
-@app.post("/api/answer")
-def api_answer(payload: Dict, sid: str = None, request: Request = None):
-    """Submit an answer: payload must contain {'choice': int}."""
-    if sid is None:
-        sid = request.cookies.get("quiz_session")
-    if not sid:
-        raise HTTPException(status_code=400, detail="No session id provided")
+def set_session_cookie(response: Response, sid: str, s: QuizSession):
+    if s.sid != sid:
+        # Token sessions: the new position lives in a new token
+        response.set_cookie(key="quiz_session", value=s.sid, httponly=False)
+
+
+def grade_answer(sid: str, payload: Dict):
+    """Grade the current question and advance the session. Returns (result, session) or (None, session) when finished."""
     s = get_session(sid)
-    idx = s["index"]
-    if idx >= len(s["questions"]):
-        return {"finished": True}
+    idx, q = current_question(s)
+    if q is None:
+        return None, s
     try:
         choice = int(payload.get("choice"))
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid choice")
-    q = s["questions"][idx]
     # Support both single and multiple correct answers
-    correct_answers = q.get("correct_answers", [])
+    correct_answers = list(q["correct_answers"])
     if not correct_answers and q.get("answer") is not None:
-        correct_answers = [q.get("answer")]
+        correct_answers = [q["answer"]]
     is_correct = choice in correct_answers
-    if is_correct:
-        s["score"] += 1
-    s["index"] += 1
-    finished = s["index"] >= len(s["questions"])
-    return {"correct": is_correct, "finished": finished, "score": s["score"], "total": len(s["questions"]), "correct_answers": correct_answers}
+    user_id = s.user_id or payload.get("user_id")
+    user_id = str(user_id)[:64] if user_id is not None else None
+    category, latency_ms = category_key(s.category) or GENERAL, latency_from(payload)
+    order = None
+    if s.mode == "adaptive" and idx + 1 < s.total:
+        performance = {"correct": s.score + is_correct, "total": idx + 1}
+        pick = adaptive_pick(bank_for(s.category), user_id, s.category, s.order, performance)
+        if pick is not None:
+            order = array("I", s.order)
+            order.append(pick)
+    advanced = SESSIONS.advance(sid, s.index, idx + 1, is_correct, order)
+    if advanced is None:
+        raise HTTPException(status_code=409, detail="Answer already submitted")
+    ANSWER_LOG.record(sid, q["id"], category, choice, is_correct, user_id=user_id, latency_ms=latency_ms)
+    LEARNER_STATS.record(user_id, category, is_correct, latency_ms)
+    s = advanced
+    # Adaptive sessions end early when no unseen question is left
+    finished = s.index >= len(s.order)
+    return {"correct": is_correct, "finished": finished, "score": s.score, "total": s.total, "correct_answers": correct_answers,
+            "question_id": q["id"], "session_id": s.sid}, s
+
+
+@app.get("/api/question")
+def api_question(sid: str = None, request: Request = None, prefetch: int = Query(0, ge=0, le=MAX_PREFETCH)):
+    """Return the next question for the session. Provide sid as query param or cookie 'quiz_session'.
+
+    With `prefetch=N` the following N questions (without answers) are
+    included under "upcoming", so the client can render them from a buffer.
+    """
+    return FastJSONResponse(question_response(get_session(session_id_from(sid, request)), prefetch))
+
+
+@app.post("/api/answer")
+def api_answer(payload: Dict, response: Response, sid: str = None, request: Request = None):
+    """Submit an answer: payload must contain {'choice': int}.
+
+    Optional: `latency_ms` (time the user took) and `user_id` (when the
+    session was started without one), both stored in the answer log.
+    """
+    sid = session_id_from(sid, request)
+    result, s = grade_answer(sid, payload)
+    if result is None:
+        return {"finished": True}
+    set_session_cookie(response, sid, s)
+    return result
+
+
+@app.post("/api/step")
+def api_step(payload: Dict, sid: str = None, request: Request = None,
+             prefetch: int = Query(0, ge=0, le=MAX_PREFETCH)):
+    """Submit an answer and get the next question in one round trip.
+
+    Returns the /api/answer result with the /api/question response for the
+    following position under "next".
+    """
+    sid = session_id_from(sid, request)
+    result, s = grade_answer(sid, payload)
+    if result is None:
+        return {"finished": True, "next": {"finished": True}}
+    result["next"] = question_response(s, prefetch)
+    out = FastJSONResponse(result)
+    set_session_cookie(out, sid, s)
+    return out
 
 
 @app.get("/api/result")
 def api_result(sid: str = None, request: Request = None):
-    if sid is None:
-        sid = request.cookies.get("quiz_session")
-    if not sid:
-        raise HTTPException(status_code=400, detail="No session id provided")
-    s = get_session(sid)
-    return {"score": s["score"], "total": len(s["questions"])}
+    s = get_session(session_id_from(sid, request))
+    return {"score": s.score, "total": s.total}
 
 # ---------------- Admin CRUD Endpoints -----------------
+def _question_query():
+    return select(Question).options(selectinload(Question.choices))
+
+ADMIN_PAGE_SIZE = 100
+ADMIN_STREAM_BATCH = 500
+
+def admin_page_query(after_id: int, limit: int, category: str | None, difficulty: int | None):
+    """One keyset page: rows with id > after_id, in id order (ix_questions_category_id / the PK)."""
+    query = _question_query().where(Question.id > after_id)
+    if category is not None:
+        query = query.where(Question.category == category)
+    if difficulty is not None:
+        query = query.where(Question.difficulty == difficulty)
+    return query.order_by(Question.id).limit(limit)
+
+async def stream_questions_ndjson(category: str | None, difficulty: int | None, after_id: int, limit: int | None):
+    # Own session: the request-scoped one is closed before a streamed body is sent
+    db = async_session()
+    try:
+        remaining = limit
+        while remaining is None or remaining > 0:
+            batch = ADMIN_STREAM_BATCH if remaining is None else min(ADMIN_STREAM_BATCH, remaining)
+            rows = (await db.execute(admin_page_query(after_id, batch, category, difficulty))).scalars().all()
+            if not rows:
+                break
+            yield b"".join(dumps(serialize_question(q)) + b"\n" for q in rows)
+            after_id = rows[-1].id
+            if remaining is not None:
+                remaining -= len(rows)
+            db.expunge_all()  # keep memory flat over long dumps
+    finally:
+        await db.close()
+
 @app.get("/api/admin/questions")
-def admin_list_questions(db: Session = Depends(get_db)):
-    qs = db.query(Question).options(selectinload(Question.choices)).all()
-    return [serialize_question(q) for q in qs]
+async def admin_list_questions(
+    after_id: int = Query(0, ge=0),
+    limit: int = Query(None, ge=1, le=1000),
+    category: str = Query(None),
+    difficulty: int = Query(None),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db=Depends(get_async_db),
+):
+    """List questions in id order, one keyset page at a time.
+
+    Pass the X-Next-After-Id response header back as ?after_id= to get the
+    next page (absent on the last page). With format=ndjson every matching
+    row is streamed, one JSON object per line, in constant memory.
+    """
+    if format == "ndjson":
+        return StreamingResponse(stream_questions_ndjson(category, difficulty, after_id, limit),
+                                 media_type="application/x-ndjson")
+    limit = limit or ADMIN_PAGE_SIZE
+    rows = (await db.execute(admin_page_query(after_id, limit + 1, category, difficulty))).scalars().all()
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-After-Id"] = str(rows[-1].id)
+    return FastJSONResponse([serialize_question(q) for q in rows], headers=headers)
+
+# MinHash/LSH index of the bank for ?dedup=true bulk imports, built on first use
+DUPLICATES = BankDuplicates(engine)
+
+async def reindex_questions(db, rows):
+    """Bring the search index in line with (id, text, choice texts) rows, in the caller's transaction."""
+    for statement, params in search_index.upsert_statements(engine.dialect.name, rows):
+        await db.execute(statement, params)
+
+@app.get("/api/admin/questions/search")
+async def admin_search_questions(
+    q: str = Query(..., min_length=1, max_length=200),
+    category: str = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db=Depends(get_async_db),
+):
+    """Full-text search over question and choice texts, best match first.
+
+    Every word must match (as a prefix, after stemming). Each hit carries
+    its "rank", a "snippet" of the question text with <mark> highlights
+    and "matched_choices" (indexes of the choices that matched). Pass the
+    X-Next-Offset response header back as ?offset= for the next page.
+    """
+    found = search_index.search_statement(engine.dialect.name, q, category, limit + 1, offset)
+    if found is None:
+        return FastJSONResponse([])
+    statement, params = found
+    hits = (await db.execute(statement, params)).all()
+    headers = {}
+    if len(hits) > limit:
+        hits = hits[:limit]
+        headers["X-Next-Offset"] = str(offset + limit)
+    rows = (await db.execute(_question_query().where(Question.id.in_([h[0] for h in hits])))).scalars().all()
+    by_id = {row.id: row for row in rows}
+    results = []
+    for qid, rank, snippet in hits:
+        question = by_id.get(qid)
+        if question is None:
+            continue
+        item = serialize_question(question)
+        item.update(rank=float(rank), snippet=snippet,
+                    matched_choices=search_index.matching_choices(q, [c.text for c in question.choices]))
+        results.append(item)
+    return FastJSONResponse(results, headers=headers)
 
 @app.post("/api/admin/questions")
-def admin_create_question(payload: QuestionCreate, db: Session = Depends(get_db)):
+async def admin_create_question(payload: QuestionCreate, db=Depends(get_async_db)):
     if not payload.text.strip():
         raise HTTPException(status_code=400, detail="Question text is required")
     if payload.choices is None or len(payload.choices) < 2:
         raise HTTPException(status_code=400, detail="Provide at least 2 choices")
     if payload.correct_index < 0 or payload.correct_index >= len(payload.choices):
         raise HTTPException(status_code=400, detail="correct_index out of range")
-
-    q = Question(text=payload.text.strip())
+    error = range_error(payload.choices, payload.difficulty)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    q = Question(
+        text=payload.text.strip(),
+        choices=[Choice(text=txt, is_correct=(i == payload.correct_index)) for i, txt in enumerate(payload.choices)],
+    )
+    apply_category(q, payload.category)
+    if payload.difficulty is not None:
+        q.difficulty = payload.difficulty
     db.add(q)
-    db.flush()  # assign id
-    for i, txt in enumerate(payload.choices):
-        db.add(Choice(text=txt, is_correct=(i == payload.correct_index), question_id=q.id))
-    db.commit()
-    db.refresh(q)
-    _ = q.choices  # ensure loaded
+    await db.flush()  # assigns the id the search index is keyed on
+    await reindex_questions(db, [(q.id, q.text, [c.text for c in q.choices])])
+    await db.execute(bump_generation(q.category))
+    await db.commit()  # sessions keep attributes loaded after commit, ids included
+    BANK_CACHE.invalidate(q.category)
+    await run_in_threadpool(DUPLICATES.add, [q.id], [(q.text, [c.text for c in q.choices])])
     return serialize_question(q)
 
+@app.post("/api/admin/questions/bulk")
+async def admin_bulk_import(request: Request, strict: bool = Query(False), dedup: bool = Query(False),
+                            db=Depends(get_async_db)):
+    """Import many questions in one transaction.
+
+    Accepts a JSON array, NDJSON (application/x-ndjson) or CSV (text/csv)
+    body; see question_io.py for the row format. Every row is validated
+    before anything is written. Invalid rows are reported in "errors" by
+    0-based row number and skipped, or with ?strict=true the whole batch
+    is rejected with 422. With ?dedup=true rows that nearly duplicate a
+    question in the bank or an earlier row count as invalid (see dedup.py).
+    """
+    body = await request.body()
+    try:
+        raw_rows, errors = parse_body(body, request.headers.get("content-type"))
+    except BulkFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if len(raw_rows) > MAX_BULK_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ROWS} questions per request")
+    valid, row_errors = validate_rows(raw_rows)
+    signatures = None
+    if dedup and valid:
+        index = await run_in_threadpool(DUPLICATES.get)
+        signatures, reasons = await run_in_threadpool(
+            check_batch, index, [(row["text"], row["choices"]) for _, row in valid], [i for i, _ in valid])
+        row_errors += [{"row": i, "error": reason} for (i, _), reason in zip(valid, reasons) if reason]
+        keep = [k for k, reason in enumerate(reasons) if reason is None]
+        valid, signatures = [valid[k] for k in keep], signatures[keep]
+    errors = sorted(errors + row_errors, key=lambda e: e["row"])
+    if errors and strict:
+        raise HTTPException(status_code=422, detail={"errors": errors})
+
+    rows = [row for _, row in valid]
+    ids = []
+    if rows:
+        insert_questions, insert_choices = insert_statements()
+        ids = list((await db.execute(insert_questions, question_rows(rows))).scalars())
+        await db.execute(insert_choices, choice_rows(rows, ids))
+        await reindex_questions(db, [(qid, row["text"], row["choices"]) for qid, row in zip(ids, rows)])
+        categories = {row["category"] for row in rows}
+        for category in categories:
+            await db.execute(bump_generation(category))
+        await db.commit()
+        for category in categories:
+            BANK_CACHE.invalidate(category)
+        await run_in_threadpool(DUPLICATES.add, ids, [(row["text"], row["choices"]) for row in rows], signatures)
+    return {"inserted": len(ids), "ids": ids, "errors": errors}
+
+@app.get("/api/admin/export")
+def admin_export(format: str = Query("ndjson", pattern="^(ndjson|csv|bin)$"), category: str = Query(None)):
+    """Stream the whole bank (or one category) as NDJSON, CSV or compact binary.
+
+    Rows are read through a streaming cursor and encoded in batches, so the
+    export runs in constant memory. NDJSON and CSV use the bulk import row
+    format; question_io.read_binary() decodes the bin format.
+    """
+    filename = f"questions-{category or 'all'}.{format}".replace(" ", "_")
+    return StreamingResponse(
+        export_chunks(iter_export_rows(engine, category), format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 @app.patch("/api/admin/questions/{qid}")
-def admin_update_question(qid: int, payload: QuestionUpdate, db: Session = Depends(get_db)):
-    q = db.query(Question).options(selectinload(Question.choices)).filter(Question.id == qid).first()
+async def admin_update_question(qid: int, payload: QuestionUpdate, db=Depends(get_async_db)):
+    q = (await db.execute(_question_query().where(Question.id == qid))).scalars().first()
     if not q:
         raise HTTPException(status_code=404, detail="Question not found")
 
@@ -242,6 +582,15 @@ def admin_update_question(qid: int, payload: QuestionUpdate, db: Session = Depen
         if not payload.text.strip():
             raise HTTPException(status_code=400, detail="Question text cannot be empty")
         q.text = payload.text.strip()
+    error = range_error(payload.choices, payload.difficulty)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    previous_category = q.category
+    if payload.category is not None:
+        apply_category(q, payload.category)
+    if payload.difficulty is not None:
+        q.difficulty = payload.difficulty
 
     if payload.choices is not None:
         if len(payload.choices) < 2:
@@ -250,56 +599,75 @@ def admin_update_question(qid: int, payload: QuestionUpdate, db: Session = Depen
             raise HTTPException(status_code=400, detail="Provide correct_index when replacing choices")
         if payload.correct_index < 0 or payload.correct_index >= len(payload.choices):
             raise HTTPException(status_code=400, detail="correct_index out of range")
-        # replace whole choice set
-        for c in list(q.choices):
-            db.delete(c)
-        db.flush()
-        for i, txt in enumerate(payload.choices):
-            db.add(Choice(text=txt, is_correct=(i == payload.correct_index), question_id=q.id))
+        # replace whole choice set; delete-orphan removes the old rows
+        q.choices = [Choice(text=txt, is_correct=(i == payload.correct_index)) for i, txt in enumerate(payload.choices)]
     elif payload.correct_index is not None:
         if payload.correct_index < 0 or payload.correct_index >= len(q.choices):
             raise HTTPException(status_code=400, detail="correct_index out of range")
         for i, c in enumerate(q.choices):
             c.is_correct = (i == payload.correct_index)
 
-    db.commit()
-    db.refresh(q)
-    _ = q.choices
+    await reindex_questions(db, [(q.id, q.text, [c.text for c in q.choices])])
+    await db.execute(bump_generation(q.category))
+    if previous_category != q.category:
+        await db.execute(bump_generation(previous_category))
+    await db.commit()
+    BANK_CACHE.invalidate(q.category)
+    if previous_category != q.category:
+        BANK_CACHE.invalidate(previous_category)
+    DUPLICATES.invalidate()
     return serialize_question(q)
 
 @app.delete("/api/admin/questions/{qid}", status_code=204)
-def admin_delete_question(qid: int, db: Session = Depends(get_db)):
-    q = db.query(Question).filter(Question.id == qid).first()
+async def admin_delete_question(qid: int, db=Depends(get_async_db)):
+    q = await db.get(Question, qid, options=[selectinload(Question.choices)])
     if not q:
         raise HTTPException(status_code=404, detail="Question not found")
-    db.delete(q)
-    db.commit()
+    category = q.category
+    await db.delete(q)
+    for statement, params in search_index.delete_statements(engine.dialect.name, qid):
+        await db.execute(statement, params)
+    await db.execute(bump_generation(category))
+    await db.commit()
+    BANK_CACHE.invalidate(category)
+    DUPLICATES.invalidate()
     return Response(status_code=204)
 
+@app.get("/api/admin/stats")
+def admin_stats():
+    """Runtime counters for the in-process caches."""
+    return {"bank_cache": BANK_CACHE.stats(), "sessions": SESSIONS.stats(), "answer_log": ANSWER_LOG.stats(),
+            "learner_stats": LEARNER_STATS.stats(), "recommendations": recommendation_cache.stats_summary()}
+
+
+# Static files are fingerprinted and held in memory (see static_assets.py);
+# hashed URLs are cached forever, HTML entry points are revalidated.
+STATIC = StaticAssets("static").load()
+
+
+def asset_response(asset: Asset, request: Request, headers: Dict = None) -> Response:
+    headers = {"Cache-Control": asset.cache_control, "ETag": asset.etag, "Vary": "Accept-Encoding", **(headers or {})}
+    if request.headers.get("if-none-match") == asset.etag:
+        return Response(status_code=304, headers=headers)
+    encoding, body = asset.select(request.headers.get("accept-encoding", ""))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type=asset.content_type, headers=headers)
 
-# Serve static assets under /static, and index with no-cache at root
-app.mount("/static", StaticFiles(directory="static"), name="static")
 
 @app.get("/static/{rest_of_path:path}")
-async def serve_static_nocache(rest_of_path: str):
-    """Override to add no-cache headers for static JS/CSS."""
-    from pathlib import Path
-    file_path = Path("static") / rest_of_path
-    if not file_path.exists():
+def serve_static(rest_of_path: str, request: Request):
+    asset = STATIC.get(rest_of_path)
+    if asset is None:
         raise HTTPException(404, "File not found")
-    headers = {"Cache-Control": "no-store, no-cache, must-revalidate, max-age=0"}
-    # Force correct Content-Type for .js files
-    if rest_of_path.endswith('.js'):
-        return FileResponse(file_path, headers=headers, media_type="application/javascript")
-    return FileResponse(file_path, headers=headers)
+    return asset_response(asset, request)
 
 @app.get("/")
-def serve_index():
-    headers = {"Cache-Control": "no-store, no-cache, must-revalidate, max-age=0"}
-    return FileResponse("static/index.html", headers=headers)
+def serve_index(request: Request):
+    return asset_response(STATIC.page("index.html"), request)
 
 @app.get("/admin")
-def serve_admin(credentials: HTTPBasicCredentials = Depends(security)):
+def serve_admin(request: Request, credentials: HTTPBasicCredentials = Depends(security)):
     correct_user = secrets.compare_digest(credentials.username, ADMIN_USER)
     correct_pass = secrets.compare_digest(credentials.password, get_admin_pass())
     if not (correct_user and correct_pass):
@@ -308,8 +676,7 @@ def serve_admin(credentials: HTTPBasicCredentials = Depends(security)):
             detail="Unauthorized",
             headers={"WWW-Authenticate": "Basic"},
         )
-    headers = {"Cache-Control": "no-store, no-cache, must-revalidate, max-age=0", "Pragma": "no-cache"}
-    return FileResponse("static/admin.html", headers=headers)
+    return asset_response(STATIC.page("admin.html"), request, {"Pragma": "no-cache"})
 # --- Admin password change endpoint ---
 from pydantic import BaseModel
 class PasswordChangeRequest(BaseModel):
@@ -333,6 +700,41 @@ def change_admin_password(payload: PasswordChangeRequest, credentials: HTTPBasic
     return {"success": True}
 
 
+# Personalized learning: computed from the learner statistics, no AI provider needed
+def personalized_learning_enabled():
+    if not get_ai_config().enable_personalized_learning:
+        raise HTTPException(status_code=404, detail="Personalized learning is disabled")
+
+
+@app.get("/api/ai/recommendations", dependencies=[Depends(personalized_learning_enabled)])
+def api_recommendations(user_id: str = Query(..., max_length=64), category: str = Query(None)):
+    """Study recommendations per category the user has answered (or only `category`)."""
+    category = (category_key(category) or GENERAL) if category else None
+    return {"user_id": user_id, "recommendations": get_user_recommendations(user_id, category)}
+
+
+@app.get("/api/ai/next-params", dependencies=[Depends(personalized_learning_enabled)])
+def api_next_params(user_id: str = Query(None, max_length=64), category: str = Query(None),
+                    sid: str = None, request: Request = None):
+    """Target difficulty and topics for the user's next question.
+
+    With a session (sid or cookie) its category, user and score so far are
+    taken into account.
+    """
+    session_performance = None
+    sid = sid or request.cookies.get("quiz_session")
+    s = SESSIONS.get(sid) if sid else None
+    if s is not None:
+        user_id = user_id or s.user_id
+        category = category or s.category
+        session_performance = {"correct": s.score, "total": s.index}
+    if not user_id:
+        raise HTTPException(status_code=400, detail="No user_id provided")
+    category = category_key(category) or GENERAL
+    params = get_adaptive_question_params(user_id, category, session_performance)
+    return {"user_id": user_id, "category": category, **params}
+
+
 # AI Endpoints
 if AI_AVAILABLE:
     @app.post("/api/ai/generate-questions")